@@ -0,0 +1,56 @@
+﻿using System.IO;
+
+namespace iText.IO.Source
+{
+    /// <summary>Object, which does the actual I/O for a <see cref="PyBufferedStream"/>.</summary>
+    /// <remarks>
+    /// Object, which does the actual I/O for a <see cref="PyBufferedStream"/>.
+    /// <para />
+    /// This interface is meant to be implemented in Python. Methods are only
+    /// called for the operations, which were declared as supported, when the
+    /// stream was created.
+    /// </remarks>
+    public interface IPyStreamBackend
+    {
+        /// <summary>Reads up to the specified number of bytes into memory at the specified address.</summary>
+        /// <param name="address">address of the memory to read data into</param>
+        /// <param name="count">maximum number of bytes to read</param>
+        /// <returns>number of bytes read, 0 at the end of the stream</returns>
+        int ReadChunk(long address, int count);
+
+        /// <summary>Writes up to the specified number of bytes from memory at the specified address.</summary>
+        /// <remarks>
+        /// Writes up to the specified number of bytes from memory at the specified address.
+        /// <para />
+        /// Partial writes are allowed, the rest is then written with another
+        /// call. Writing nothing is treated as an error, so non-blocking
+        /// objects, which cannot accept any data at the moment, are not
+        /// supported.
+        /// </remarks>
+        /// <param name="address">address of the memory to write data from</param>
+        /// <param name="count">maximum number of bytes to write</param>
+        /// <returns>number of bytes written</returns>
+        int WriteChunk(long address, int count);
+
+        /// <summary>Changes the position in the underlying object.</summary>
+        /// <param name="offset">byte offset relative to the origin</param>
+        /// <param name="origin">reference point for the offset</param>
+        /// <returns>new absolute position</returns>
+        long Seek(long offset, SeekOrigin origin);
+
+        /// <summary>Returns the length of the underlying object in bytes.</summary>
+        /// <returns>length of the underlying object</returns>
+        long GetLength();
+
+        /// <summary>Truncates or extends the underlying object to the specified length.</summary>
+        /// <param name="length">new length in bytes</param>
+        void SetLength(long length);
+
+        /// <summary>Flushes the underlying object.</summary>
+        void Flush();
+
+        /// <summary>Releases the underlying object.</summary>
+        /// <remarks>Called once, when the stream gets disposed. All buffered data is flushed at this point.</remarks>
+        void Close();
+    }
+}
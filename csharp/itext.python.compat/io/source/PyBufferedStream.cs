@@ -0,0 +1,345 @@
+﻿using System;
+using System.IO;
+using System.Runtime.InteropServices;
+
+namespace iText.IO.Source
+{
+    /// <summary>Stream, which is backed by a Python object.</summary>
+    /// <remarks>
+    /// Stream, which is backed by a Python object.
+    /// <para />
+    /// Every call from .NET into Python has a considerable overhead, and
+    /// <see cref="System.IO.Stream"/> consumers tend to read and write in
+    /// small portions. So this stream keeps a buffer of a configurable size
+    /// and only calls the <see cref="IPyStreamBackend"/> once per buffer-sized
+    /// chunk.
+    /// <para>
+    /// Chunks are transferred by memory address, so that the Python side can
+    /// read into and write from .NET memory directly without any intermediate
+    /// copies. Such memory is only pinned for the duration of the call.
+    /// </para>
+    /// <para>
+    /// This class is not meant to be subclassed under Python.NET. Python.NET
+    /// cannot override <see cref="System.IO.Stream"/> methods, which use
+    /// <c>Span</c> arguments, so implement <see cref="IPyStreamBackend"/>
+    /// instead.
+    /// </para>
+    /// </remarks>
+    public sealed class PyBufferedStream : Stream
+    {
+        /// <summary>Default size of the internal buffer in bytes.</summary>
+        public const int DEFAULT_BUFFER_SIZE = 64 * 1024;
+
+        private readonly IPyStreamBackend backend;
+
+        private readonly bool canRead;
+
+        private readonly bool canWrite;
+
+        private readonly bool canSeek;
+
+        private readonly byte[] buffer;
+
+        private int readPos;
+
+        private int readLen;
+
+        private int writeLen;
+
+        private bool disposed;
+
+        /// <summary>Creates a stream over the backend with the specified capabilities.</summary>
+        /// <param name="backend">object, which does the actual I/O</param>
+        /// <param name="canRead">whether the backend supports reading</param>
+        /// <param name="canWrite">whether the backend supports writing</param>
+        /// <param name="canSeek">whether the backend supports seeking</param>
+        /// <param name="bufferSize">size of the internal buffer in bytes</param>
+        public PyBufferedStream(IPyStreamBackend backend, bool canRead, bool canWrite, bool canSeek, int bufferSize)
+        {
+            if (bufferSize <= 0)
+            {
+                throw new ArgumentOutOfRangeException(nameof(bufferSize), "Buffer size must be positive.");
+            }
+            this.backend = backend ?? throw new ArgumentNullException(nameof(backend));
+            this.canRead = canRead;
+            this.canWrite = canWrite;
+            this.canSeek = canSeek;
+            buffer = new byte[bufferSize];
+        }
+
+        public override bool CanRead => canRead && !disposed;
+
+        public override bool CanWrite => canWrite && !disposed;
+
+        public override bool CanSeek => canSeek && !disposed;
+
+        public override long Length
+        {
+            get
+            {
+                EnsureSeekable();
+                FlushWriteBuffer();
+                return backend.GetLength();
+            }
+        }
+
+        public override long Position
+        {
+            get
+            {
+                EnsureSeekable();
+                return backend.Seek(0, SeekOrigin.Current) + writeLen - (readLen - readPos);
+            }
+            set => Seek(value, SeekOrigin.Begin);
+        }
+
+        public override int Read(byte[] array, int offset, int count)
+        {
+            CheckBufferArguments(array, offset, count);
+            EnsureReadable();
+            FlushWriteBuffer();
+            if (count == 0)
+            {
+                return 0;
+            }
+            if (readPos == readLen)
+            {
+                if (count >= buffer.Length)
+                {
+                    // No point in double buffering big reads
+                    return ReadChunk(array, offset, count);
+                }
+                readPos = 0;
+                readLen = ReadChunk(buffer, 0, buffer.Length);
+                if (readLen == 0)
+                {
+                    return 0;
+                }
+            }
+            int length = Math.Min(count, readLen - readPos);
+            Buffer.BlockCopy(buffer, readPos, array, offset, length);
+            readPos += length;
+            return length;
+        }
+
+        public override int ReadByte()
+        {
+            EnsureReadable();
+            FlushWriteBuffer();
+            if (readPos == readLen)
+            {
+                readPos = 0;
+                readLen = ReadChunk(buffer, 0, buffer.Length);
+                if (readLen == 0)
+                {
+                    return -1;
+                }
+            }
+            return buffer[readPos++];
+        }
+
+        public override void Write(byte[] array, int offset, int count)
+        {
+            CheckBufferArguments(array, offset, count);
+            EnsureWritable();
+            DiscardReadBuffer();
+            if (writeLen + count > buffer.Length)
+            {
+                FlushWriteBuffer();
+            }
+            if (count >= buffer.Length)
+            {
+                // No point in double buffering big writes
+                WriteChunk(array, offset, count);
+                return;
+            }
+            Buffer.BlockCopy(array, offset, buffer, writeLen, count);
+            writeLen += count;
+        }
+
+        public override void WriteByte(byte value)
+        {
+            EnsureWritable();
+            DiscardReadBuffer();
+            if (writeLen == buffer.Length)
+            {
+                FlushWriteBuffer();
+            }
+            buffer[writeLen++] = value;
+        }
+
+        public override long Seek(long offset, SeekOrigin origin)
+        {
+            EnsureSeekable();
+            FlushWriteBuffer();
+            if (origin == SeekOrigin.Current)
+            {
+                // Underlying object is ahead of us by the unread part of the buffer
+                offset -= readLen - readPos;
+            }
+            readPos = 0;
+            readLen = 0;
+            return backend.Seek(offset, origin);
+        }
+
+        public override void SetLength(long value)
+        {
+            EnsureSeekable();
+            EnsureWritable();
+            FlushWriteBuffer();
+            DiscardReadBuffer();
+            backend.SetLength(value);
+        }
+
+        public override void Flush()
+        {
+            EnsureNotDisposed();
+            if (canWrite)
+            {
+                FlushWriteBuffer();
+                backend.Flush();
+            }
+        }
+
+        protected override void Dispose(bool disposing)
+        {
+            if (disposed)
+            {
+                return;
+            }
+            try
+            {
+                if (disposing)
+                {
+                    if (canWrite)
+                    {
+                        FlushWriteBuffer();
+                        backend.Flush();
+                    }
+                    backend.Close();
+                }
+            }
+            finally
+            {
+                disposed = true;
+                base.Dispose(disposing);
+            }
+        }
+
+        private int ReadChunk(byte[] array, int offset, int count)
+        {
+            GCHandle handle = GCHandle.Alloc(array, GCHandleType.Pinned);
+            try
+            {
+                return backend.ReadChunk(handle.AddrOfPinnedObject().ToInt64() + offset, count);
+            }
+            finally
+            {
+                handle.Free();
+            }
+        }
+
+        private void WriteChunk(byte[] array, int offset, int count)
+        {
+            GCHandle handle = GCHandle.Alloc(array, GCHandleType.Pinned);
+            try
+            {
+                long address = handle.AddrOfPinnedObject().ToInt64() + offset;
+                while (count > 0)
+                {
+                    int written = backend.WriteChunk(address, count);
+                    // Otherwise this would spin forever on a non-blocking
+                    // object, which doesn't accept data
+                    if (written <= 0)
+                    {
+                        throw new IOException("Python object did not accept any data.");
+                    }
+                    address += written;
+                    count -= written;
+                }
+            }
+            finally
+            {
+                handle.Free();
+            }
+        }
+
+        private void FlushWriteBuffer()
+        {
+            if (writeLen > 0)
+            {
+                int length = writeLen;
+                writeLen = 0;
+                WriteChunk(buffer, 0, length);
+            }
+        }
+
+        private void DiscardReadBuffer()
+        {
+            if (readPos == readLen)
+            {
+                return;
+            }
+            // Read-ahead cannot be undone for non-seekable objects, but for
+            // those reading and writing are usually independent anyway (like
+            // with sockets), so buffered data is kept in such case
+            if (canSeek)
+            {
+                backend.Seek(readPos - readLen, SeekOrigin.Current);
+                readPos = 0;
+                readLen = 0;
+            }
+        }
+
+        private void EnsureNotDisposed()
+        {
+            if (disposed)
+            {
+                throw new ObjectDisposedException(GetType().Name);
+            }
+        }
+
+        private void EnsureReadable()
+        {
+            EnsureNotDisposed();
+            if (!canRead)
+            {
+                throw new NotSupportedException("Stream does not support reading.");
+            }
+        }
+
+        private void EnsureWritable()
+        {
+            EnsureNotDisposed();
+            if (!canWrite)
+            {
+                throw new NotSupportedException("Stream does not support writing.");
+            }
+        }
+
+        private void EnsureSeekable()
+        {
+            EnsureNotDisposed();
+            if (!canSeek)
+            {
+                throw new NotSupportedException("Stream does not support seeking.");
+            }
+        }
+
+        private static void CheckBufferArguments(byte[] array, int offset, int count)
+        {
+            if (array == null)
+            {
+                throw new ArgumentNullException(nameof(array));
+            }
+            if (offset < 0)
+            {
+                throw new ArgumentOutOfRangeException(nameof(offset));
+            }
+            if (count < 0 || offset > array.Length - count)
+            {
+                throw new ArgumentOutOfRangeException(nameof(count));
+            }
+        }
+    }
+}
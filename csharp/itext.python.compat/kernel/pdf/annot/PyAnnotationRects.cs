@@ -0,0 +1,199 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+
+namespace iText.Kernel.Pdf.Annot
+{
+    /// <summary>Bulk access to the rectangles of annotations.</summary>
+    /// <remarks>
+    /// Bulk access to the rectangles of annotations.
+    /// <para />
+    /// Reading a single rectangle from Python takes several calls into .NET,
+    /// which adds up quickly for documents with many annotations. These
+    /// methods process all the matching annotations in a single call instead
+    /// and exchange data through plain memory, which is provided by the
+    /// caller, e.g. by NumPy arrays.
+    /// <para>
+    /// Annotations are identified by the page number and by the index in the
+    /// <c>/Annots</c> array of that page. Only annotations, which are
+    /// dictionaries with a <c>/Rect</c> of at least four numbers, are
+    /// considered.
+    /// </para>
+    /// </remarks>
+    public static class PyAnnotationRects
+    {
+        /// <summary>Returns the number of matching annotations on the pages.</summary>
+        /// <param name="document">document to look for annotations in</param>
+        /// <param name="firstPage">number of the first page, starting from 1</param>
+        /// <param name="lastPage">number of the last page, inclusive</param>
+        /// <param name="subtypes">annotation subtypes to match, or <c>null</c> to match all</param>
+        /// <returns>number of matching annotations</returns>
+        public static int Count(PdfDocument document, int firstPage, int lastPage, PdfName[] subtypes)
+        {
+            int count = 0;
+            ForEach(document, firstPage, lastPage, subtypes, (pageNumber, index, rect) => ++count);
+            return count;
+        }
+
+        /// <summary>Copies locations and rectangles of matching annotations to memory.</summary>
+        /// <remarks>
+        /// Copies locations and rectangles of matching annotations to memory.
+        /// <para />
+        /// Page numbers and indices are written as 32-bit integers, one per
+        /// annotation. Rectangles are written as four 64-bit floats per
+        /// annotation: lower left x and y, then upper right x and y, even if
+        /// the corners are stored in a different order in the document.
+        /// </remarks>
+        /// <param name="document">document to read annotations from</param>
+        /// <param name="firstPage">number of the first page, starting from 1</param>
+        /// <param name="lastPage">number of the last page, inclusive</param>
+        /// <param name="subtypes">annotation subtypes to match, or <c>null</c> to match all</param>
+        /// <param name="capacity">maximum number of annotations to write</param>
+        /// <param name="pagesAddress">address of memory for page numbers</param>
+        /// <param name="indicesAddress">address of memory for indices in <c>/Annots</c></param>
+        /// <param name="rectsAddress">address of memory for rectangles</param>
+        /// <returns>number of annotations written</returns>
+        public static int Read(PdfDocument document, int firstPage, int lastPage, PdfName[] subtypes, int capacity,
+            long pagesAddress, long indicesAddress, long rectsAddress)
+        {
+            int[] pages = new int[capacity];
+            int[] indices = new int[capacity];
+            double[] rects = new double[capacity * 4];
+            int count = 0;
+            ForEach(document, firstPage, lastPage, subtypes, (pageNumber, index, rect) =>
+            {
+                if (count >= capacity)
+                {
+                    return;
+                }
+                double x1 = rect.GetAsNumber(0).DoubleValue();
+                double y1 = rect.GetAsNumber(1).DoubleValue();
+                double x2 = rect.GetAsNumber(2).DoubleValue();
+                double y2 = rect.GetAsNumber(3).DoubleValue();
+                pages[count] = pageNumber;
+                indices[count] = index;
+                rects[count * 4] = Math.Min(x1, x2);
+                rects[count * 4 + 1] = Math.Min(y1, y2);
+                rects[count * 4 + 2] = Math.Max(x1, x2);
+                rects[count * 4 + 3] = Math.Max(y1, y2);
+                ++count;
+            });
+            if (count > 0)
+            {
+                Marshal.Copy(pages, 0, new IntPtr(pagesAddress), count);
+                Marshal.Copy(indices, 0, new IntPtr(indicesAddress), count);
+                Marshal.Copy(rects, 0, new IntPtr(rectsAddress), count * 4);
+            }
+            return count;
+        }
+
+        /// <summary>Replaces rectangles of annotations with the ones from memory.</summary>
+        /// <remarks>
+        /// Replaces rectangles of annotations with the ones from memory.
+        /// <para />
+        /// Memory has the same layout, as written by
+        /// <see cref="Read(PdfDocument, int, int, PdfName[], int, long, long, long)"/>.
+        /// Annotations, which don't exist, are ignored.
+        /// </remarks>
+        /// <param name="document">document to write annotations to</param>
+        /// <param name="count">number of annotations</param>
+        /// <param name="pagesAddress">address of memory with page numbers</param>
+        /// <param name="indicesAddress">address of memory with indices in <c>/Annots</c></param>
+        /// <param name="rectsAddress">address of memory with rectangles</param>
+        /// <returns>number of annotations, which were updated</returns>
+        public static int Write(PdfDocument document, int count, long pagesAddress, long indicesAddress,
+            long rectsAddress)
+        {
+            if (count <= 0)
+            {
+                return 0;
+            }
+            int[] pages = new int[count];
+            int[] indices = new int[count];
+            double[] rects = new double[count * 4];
+            Marshal.Copy(new IntPtr(pagesAddress), pages, 0, count);
+            Marshal.Copy(new IntPtr(indicesAddress), indices, 0, count);
+            Marshal.Copy(new IntPtr(rectsAddress), rects, 0, count * 4);
+
+            int pageCount = document.GetNumberOfPages();
+            int updated = 0;
+            PdfArray annots = null;
+            int annotsPage = 0;
+            for (int i = 0; i < count; ++i)
+            {
+                if (pages[i] < 1 || pages[i] > pageCount)
+                {
+                    continue;
+                }
+                // Annotations are usually sorted by page, so the array is
+                // only looked up once per page
+                if (pages[i] != annotsPage)
+                {
+                    annotsPage = pages[i];
+                    annots = document.GetPage(annotsPage).GetPdfObject().GetAsArray(PdfName.Annots);
+                }
+                if (annots == null || indices[i] < 0 || indices[i] >= annots.Size())
+                {
+                    continue;
+                }
+                PdfDictionary annot = annots.GetAsDictionary(indices[i]);
+                if (annot == null)
+                {
+                    continue;
+                }
+                annot.Put(PdfName.Rect, new PdfArray(new double[]
+                {
+                    rects[i * 4], rects[i * 4 + 1], rects[i * 4 + 2], rects[i * 4 + 3]
+                }));
+                annot.SetModified();
+                ++updated;
+            }
+            return updated;
+        }
+
+        private static void ForEach(PdfDocument document, int firstPage, int lastPage, PdfName[] subtypes,
+            Action<int, int, PdfArray> action)
+        {
+            ISet<PdfName> subtypeSet = subtypes == null ? null : new HashSet<PdfName>(subtypes);
+            lastPage = Math.Min(lastPage, document.GetNumberOfPages());
+            for (int pageNumber = Math.Max(firstPage, 1); pageNumber <= lastPage; ++pageNumber)
+            {
+                PdfArray annots = document.GetPage(pageNumber).GetPdfObject().GetAsArray(PdfName.Annots);
+                if (annots == null)
+                {
+                    continue;
+                }
+                for (int index = 0; index < annots.Size(); ++index)
+                {
+                    PdfDictionary annot = annots.GetAsDictionary(index);
+                    if (annot == null)
+                    {
+                        continue;
+                    }
+                    if (subtypeSet != null && !subtypeSet.Contains(annot.GetAsName(PdfName.Subtype)))
+                    {
+                        continue;
+                    }
+                    PdfArray rect = annot.GetAsArray(PdfName.Rect);
+                    if (rect == null || rect.Size() < 4 || !IsNumbers(rect))
+                    {
+                        continue;
+                    }
+                    action(pageNumber, index, rect);
+                }
+            }
+        }
+
+        private static bool IsNumbers(PdfArray rect)
+        {
+            for (int i = 0; i < 4; ++i)
+            {
+                if (rect.GetAsNumber(i) == null)
+                {
+                    return false;
+                }
+            }
+            return true;
+        }
+    }
+}
@@ -0,0 +1,116 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+using iText.Kernel.Geom;
+using iText.Kernel.Pdf.Action;
+using iText.Kernel.Pdf.Navigation;
+
+namespace iText.Kernel.Pdf.Annot
+{
+    /// <summary>Bulk creation of link annotations.</summary>
+    /// <remarks>
+    /// Bulk creation of link annotations.
+    /// <para />
+    /// Creating a link from Python takes several calls into .NET for the
+    /// rectangle, the action, the annotation and the page. These methods
+    /// create all the links from a table in a single call instead, with the
+    /// table passed through plain memory, which is provided by the caller.
+    /// <para>
+    /// Links to the same target share a single indirect action dictionary,
+    /// and all the links share a single indirect border array, so each link
+    /// only adds its annotation dictionary to the output.
+    /// </para>
+    /// </remarks>
+    public static class PyLinkAnnotations
+    {
+        /// <summary>Adds link annotations described by a table in memory.</summary>
+        /// <remarks>
+        /// Adds link annotations described by a table in memory.
+        /// <para />
+        /// Page numbers and target page numbers are read as 32-bit integers,
+        /// one per link. Rectangles are read as four 64-bit floats per link:
+        /// lower left x and y, then upper right x and y. A link goes to the
+        /// URI from <paramref name="uris"/>, if it is not <c>null</c>, or to
+        /// the target page otherwise, which is then fitted to the window.
+        /// </remarks>
+        /// <param name="document">document to add the links to</param>
+        /// <param name="count">number of links</param>
+        /// <param name="pagesAddress">address of memory with numbers of pages to add the links to</param>
+        /// <param name="rectsAddress">address of memory with rectangles of the links</param>
+        /// <param name="targetPagesAddress">address of memory with numbers of target pages</param>
+        /// <param name="uris">target URIs, or <c>null</c> if all the links go to pages</param>
+        /// <param name="border">border for all the links, or <c>null</c> to use the default one</param>
+        /// <param name="highlightMode">highlight mode for all the links, or <c>null</c> to use the default one</param>
+        /// <returns>number of distinct targets, one action is created for each of them</returns>
+        public static int Add(PdfDocument document, int count, long pagesAddress, long rectsAddress,
+            long targetPagesAddress, string[] uris, PdfArray border, PdfName highlightMode)
+        {
+            if (count <= 0)
+            {
+                return 0;
+            }
+            int[] pages = new int[count];
+            double[] rects = new double[count * 4];
+            int[] targetPages = new int[count];
+            Marshal.Copy(new IntPtr(pagesAddress), pages, 0, count);
+            Marshal.Copy(new IntPtr(rectsAddress), rects, 0, count * 4);
+            Marshal.Copy(new IntPtr(targetPagesAddress), targetPages, 0, count);
+
+            if (border != null)
+            {
+                border.MakeIndirect(document);
+            }
+            IDictionary<int, PdfAction> pageActions = new Dictionary<int, PdfAction>();
+            IDictionary<string, PdfAction> uriActions = new Dictionary<string, PdfAction>();
+            PdfPage page = null;
+            int pageNumber = 0;
+            for (int i = 0; i < count; ++i)
+            {
+                string uri = uris == null ? null : uris[i];
+                PdfAction action;
+                if (uri != null)
+                {
+                    if (!uriActions.TryGetValue(uri, out action))
+                    {
+                        action = PdfAction.CreateURI(uri);
+                        action.MakeIndirect(document);
+                        uriActions[uri] = action;
+                    }
+                }
+                else if (!pageActions.TryGetValue(targetPages[i], out action))
+                {
+                    PdfPage targetPage = document.GetPage(targetPages[i]);
+                    action = PdfAction.CreateGoTo(PdfExplicitDestination.CreateFit(targetPage));
+                    action.MakeIndirect(document);
+                    pageActions[targetPages[i]] = action;
+                }
+
+                double x1 = rects[i * 4];
+                double y1 = rects[i * 4 + 1];
+                double x2 = rects[i * 4 + 2];
+                double y2 = rects[i * 4 + 3];
+                Rectangle rect = new Rectangle((float) x1, (float) y1, (float) (x2 - x1), (float) (y2 - y1));
+                PdfLinkAnnotation annotation = new PdfLinkAnnotation(rect);
+                annotation.SetAction(action);
+                if (border != null)
+                {
+                    annotation.SetBorder(border);
+                }
+                if (highlightMode != null)
+                {
+                    annotation.SetHighlightMode(highlightMode);
+                }
+
+                // Links are usually sorted by page, so the page is only
+                // looked up once per page
+                if (pages[i] != pageNumber)
+                {
+                    pageNumber = pages[i];
+                    page = document.GetPage(pageNumber);
+                }
+                page.AddAnnotation(annotation);
+            }
+            return pageActions.Count + uriActions.Count;
+        }
+    }
+}
@@ -0,0 +1,121 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Threading;
+using iText.Kernel.Validation;
+
+namespace iText.Pdfa
+{
+    /// <summary>Thread-safe statistics of PDF/A conformance checks, grouped by rule.</summary>
+    /// <remarks>
+    /// Thread-safe statistics of PDF/A conformance checks, grouped by rule.
+    /// <para />
+    /// Rules are named after the validation contexts of the checks without
+    /// the <c>ValidationContext</c> suffix, like <c>Font</c>. Statistics are
+    /// collected on the .NET side, so recording them doesn't call into
+    /// Python.
+    /// </remarks>
+    public sealed class PyConformanceProfile
+    {
+        private const string CONTEXT_SUFFIX = "ValidationContext";
+
+        private static readonly ConcurrentDictionary<Type, string> ruleNames =
+            new ConcurrentDictionary<Type, string>();
+
+        private readonly ConcurrentDictionary<string, Totals> totals = new ConcurrentDictionary<string, Totals>();
+
+        /// <summary>Returns the name of the rule, which checks the validation context.</summary>
+        /// <param name="validationContext">validation context of the check</param>
+        /// <returns>name of the rule</returns>
+        public static string GetRuleName(IValidationContext validationContext)
+        {
+            return ruleNames.GetOrAdd(validationContext.GetType(), type =>
+            {
+                string name = type.Name;
+                return name.EndsWith(CONTEXT_SUFFIX, StringComparison.Ordinal)
+                    ? name.Substring(0, name.Length - CONTEXT_SUFFIX.Length)
+                    : name;
+            });
+        }
+
+        /// <summary>Adds a check, which was run.</summary>
+        /// <param name="rule">name of the rule</param>
+        /// <param name="ticks">duration of the check in <see cref="Stopwatch"/> ticks</param>
+        public void Record(string rule, long ticks)
+        {
+            Totals ruleTotals = totals.GetOrAdd(rule, _ => new Totals());
+            Interlocked.Increment(ref ruleTotals.checks);
+            Interlocked.Add(ref ruleTotals.ticks, ticks);
+        }
+
+        /// <summary>Adds a check, which was run.</summary>
+        /// <param name="rule">name of the rule</param>
+        /// <param name="seconds">duration of the check in seconds</param>
+        public void RecordSeconds(string rule, double seconds)
+        {
+            Record(rule, (long) (seconds * Stopwatch.Frequency));
+        }
+
+        /// <summary>Adds a check, which was skipped.</summary>
+        /// <param name="rule">name of the rule</param>
+        public void RecordSkipped(string rule)
+        {
+            Totals ruleTotals = totals.GetOrAdd(rule, _ => new Totals());
+            Interlocked.Increment(ref ruleTotals.skipped);
+        }
+
+        /// <summary>Returns the statistics for each rule.</summary>
+        /// <returns>statistics in no particular order</returns>
+        public IList<RuleTiming> GetTimings()
+        {
+            List<RuleTiming> result = new List<RuleTiming>();
+            foreach (KeyValuePair<string, Totals> entry in totals)
+            {
+                result.Add(new RuleTiming(entry.Key, Interlocked.Read(ref entry.Value.checks),
+                    Interlocked.Read(ref entry.Value.skipped),
+                    (double) Interlocked.Read(ref entry.Value.ticks) / Stopwatch.Frequency));
+            }
+            return result;
+        }
+
+        /// <summary>Forgets all the statistics.</summary>
+        public void Clear()
+        {
+            totals.Clear();
+        }
+
+        /// <summary>Statistics of a single rule.</summary>
+        public sealed class RuleTiming
+        {
+            internal RuleTiming(string rule, long checks, long skipped, double seconds)
+            {
+                Rule = rule;
+                Checks = checks;
+                Skipped = skipped;
+                Seconds = seconds;
+            }
+
+            /// <summary>Name of the rule.</summary>
+            public string Rule { get; }
+
+            /// <summary>Number of checks, which were actually run.</summary>
+            public long Checks { get; }
+
+            /// <summary>Number of checks, which were skipped.</summary>
+            public long Skipped { get; }
+
+            /// <summary>Total time in seconds, which the checks took.</summary>
+            public double Seconds { get; }
+        }
+
+        private sealed class Totals
+        {
+            internal long checks;
+
+            internal long skipped;
+
+            internal long ticks;
+        }
+    }
+}
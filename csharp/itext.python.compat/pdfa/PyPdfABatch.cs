@@ -0,0 +1,91 @@
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using iText.Kernel.Validation;
+using iText.Kernel.Validation.Context;
+
+namespace iText.Pdfa
+{
+    /// <summary>Conformance check settings and results, which are shared by documents of a batch.</summary>
+    /// <remarks>
+    /// Conformance check settings and results, which are shared by documents of a batch.
+    /// <para />
+    /// Decides, which checks of a <see cref="PyPdfABatchDocument"/> are run.
+    /// Documents, which are verified, run all the checks. Other documents
+    /// skip:
+    /// <list type="bullet">
+    /// <item><description>all the checks, if the batch trusts unverified documents;</description></item>
+    /// <item><description>checks of the rules, which the batch skips;</description></item>
+    /// <item><description>font checks, which already passed for the same font and text in the batch.</description></item>
+    /// </list>
+    /// <para>
+    /// Everything is decided on the .NET side, so checks, which are run or
+    /// skipped, don't call into Python.
+    /// </para>
+    /// </remarks>
+    public sealed class PyPdfABatch
+    {
+        private readonly HashSet<string> skippedRules;
+
+        private readonly ConcurrentDictionary<string, bool> passed = new ConcurrentDictionary<string, bool>();
+
+        /// <summary>Creates batch settings.</summary>
+        /// <param name="profile">profile to record the statistics of the checks into</param>
+        /// <param name="trustUnverified">whether documents, which are not verified, skip all the checks</param>
+        /// <param name="skippedRules">names of the rules, which documents, which are not verified, skip</param>
+        public PyPdfABatch(PyConformanceProfile profile, bool trustUnverified, string[] skippedRules)
+        {
+            Profile = profile;
+            TrustUnverified = trustUnverified;
+            this.skippedRules = skippedRules == null ? new HashSet<string>() : new HashSet<string>(skippedRules);
+        }
+
+        /// <summary>Profile, which the statistics of the checks are recorded into.</summary>
+        public PyConformanceProfile Profile { get; }
+
+        /// <summary>Whether documents, which are not verified, skip all the checks.</summary>
+        public bool TrustUnverified { get; }
+
+        /// <summary>Forgets all the checks, which passed.</summary>
+        public void ClearPassed()
+        {
+            passed.Clear();
+        }
+
+        internal void Check(PyPdfABatchDocument document, IValidationContext validationContext)
+        {
+            string rule = PyConformanceProfile.GetRuleName(validationContext);
+            string key = GetCacheKey(validationContext);
+            if (!document.Verified && (TrustUnverified || skippedRules.Contains(rule)
+                                                       || (key != null && passed.ContainsKey(key))))
+            {
+                Profile.RecordSkipped(rule);
+                return;
+            }
+            long start = Stopwatch.GetTimestamp();
+            document.CheckAllConformance(validationContext);
+            Profile.Record(rule, Stopwatch.GetTimestamp() - start);
+            // Only checks, which didn't throw, get here
+            if (key != null)
+            {
+                passed.TryAdd(key, true);
+            }
+        }
+
+        private static string GetCacheKey(IValidationContext validationContext)
+        {
+            // Only checks, which depend on nothing else, than what is in the
+            // key, can be skipped. Other checks look at document-wide state,
+            // like the output intents or the graphics state.
+            FontValidationContext fontContext = validationContext as FontValidationContext;
+            if (fontContext == null)
+            {
+                return null;
+            }
+            iText.Kernel.Font.PdfFont font = fontContext.GetFont();
+            return string.Join("\u0000", font.GetType().Name,
+                font.GetFontProgram().GetFontNames().GetFontName(), font.IsEmbedded().ToString(),
+                fontContext.GetText());
+        }
+    }
+}
@@ -0,0 +1,65 @@
+using iText.Kernel.Pdf;
+using iText.Kernel.Validation;
+
+namespace iText.Pdfa
+{
+    /// <summary>PDF/A document, which runs its conformance checks as its batch decides.</summary>
+    /// <remarks>
+    /// PDF/A document, which runs its conformance checks as its batch decides.
+    /// <para />
+    /// Checks are run inline for every written object, so they are decided
+    /// here, instead of overriding
+    /// <see cref="PdfDocument.CheckIsoConformance(IValidationContext)"/>
+    /// under Python.NET, which would call into Python for every check.
+    /// <para>
+    /// Until <see cref="Batch"/> is set, all the checks are run, including
+    /// the ones from the constructor.
+    /// </para>
+    /// </remarks>
+    public class PyPdfABatchDocument : PdfADocument
+    {
+        /// <summary>Creates a new PDF/A document, see <see cref="PdfADocument"/>.</summary>
+        /// <param name="writer">writer to write the document into</param>
+        /// <param name="aConformance">PDF/A conformance of the document</param>
+        /// <param name="outputIntent">output intent of the document</param>
+        public PyPdfABatchDocument(PdfWriter writer, PdfAConformance aConformance, PdfOutputIntent outputIntent)
+            : base(writer, aConformance, outputIntent)
+        {
+        }
+
+        /// <summary>Creates a new PDF/A document, see <see cref="PdfADocument"/>.</summary>
+        /// <param name="writer">writer to write the document into</param>
+        /// <param name="aConformance">PDF/A conformance of the document</param>
+        /// <param name="outputIntent">output intent of the document</param>
+        /// <param name="properties">properties of the document</param>
+        public PyPdfABatchDocument(PdfWriter writer, PdfAConformance aConformance, PdfOutputIntent outputIntent,
+            DocumentProperties properties)
+            : base(writer, aConformance, outputIntent, properties)
+        {
+        }
+
+        /// <summary>Batch, which decides, which checks are run.</summary>
+        public PyPdfABatch Batch { get; set; }
+
+        /// <summary>Whether all the checks are run for this document.</summary>
+        public bool Verified { get; set; } = true;
+
+        public override void CheckIsoConformance(IValidationContext validationContext)
+        {
+            PyPdfABatch batch = Batch;
+            if (batch == null)
+            {
+                base.CheckIsoConformance(validationContext);
+            }
+            else
+            {
+                batch.Check(this, validationContext);
+            }
+        }
+
+        internal void CheckAllConformance(IValidationContext validationContext)
+        {
+            base.CheckIsoConformance(validationContext);
+        }
+    }
+}
@@ -0,0 +1,149 @@
+"""
+This module contains helpers for processing annotations in bulk.
+
+Rectangles of existing annotations are exchanged as NumPy arrays, so
+``numpy`` needs to be installed to use :func:`read_rects` and
+:func:`write_rects`.
+"""
+import array as _array
+from typing import Any as _Any, Iterable as _Iterable, NamedTuple as _NamedTuple, Sequence as _Sequence
+
+from System import Array as _Array
+from iText.Kernel.Geom import Rectangle as _Rectangle
+from iText.Kernel.Pdf import PdfArray as _PdfArray, PdfDocument as _PdfDocument, PdfName as _PdfName
+from iText.Kernel.Pdf.Annot import PyAnnotationRects as _PyAnnotationRects, \
+    PyLinkAnnotations as _PyLinkAnnotations
+
+
+def _import_numpy() -> _Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError('itextpy.annotations requires numpy package') from e
+    return numpy
+
+
+class AnnotationRects(_NamedTuple):
+    """Rectangles of annotations together with their locations in a document.
+
+    All arrays have the same length, one entry per annotation. Rows of
+    ``rects`` can be changed in place and then written back with
+    :func:`write_rects`.
+    """
+    pages: _Any
+    """Page numbers, starting from 1, as an ``int32`` array."""
+    indices: _Any
+    """Indices in the ``/Annots`` array of the page as an ``int32`` array."""
+    rects: _Any
+    """Rectangles as a ``float64`` array of ``(llx, lly, urx, ury)`` rows."""
+
+
+def _to_clr_subtypes(subtypes: _Iterable[str | _PdfName] | None) -> _Any:
+    if subtypes is None:
+        return None
+    if isinstance(subtypes, (str, _PdfName)):
+        subtypes = (subtypes,)
+    names = [s if isinstance(s, _PdfName) else _PdfName(s.removeprefix('/')) for s in subtypes]
+    return _Array[_PdfName](names)
+
+
+def read_rects(pdf_doc: _PdfDocument,
+               first_page: int = 1,
+               last_page: int | None = None,
+               subtypes: _Iterable[str | _PdfName] | str | _PdfName | None = None) -> AnnotationRects:
+    """Return rectangles of all the annotations on the pages.
+
+    Pages are from ``first_page`` to ``last_page`` inclusive, the last page
+    of the document by default. ``subtypes`` limits the annotations to the
+    ones with these subtypes, like ``"Link"`` or ``PdfName.Popup``.
+
+    Everything is read with just two calls into .NET, no matter how many
+    annotations there are. Rectangles are normalized, so the lower left
+    corner always comes first.
+    """
+    np = _import_numpy()
+    if last_page is None:
+        last_page = pdf_doc.GetNumberOfPages()
+    clr_subtypes = _to_clr_subtypes(subtypes)
+    capacity = _PyAnnotationRects.Count(pdf_doc, first_page, last_page, clr_subtypes)
+    pages = np.empty(capacity, dtype=np.int32)
+    indices = np.empty(capacity, dtype=np.int32)
+    rects = np.empty((capacity, 4), dtype=np.float64)
+    count = _PyAnnotationRects.Read(pdf_doc, first_page, last_page, clr_subtypes, capacity,
+                                    pages.ctypes.data, indices.ctypes.data, rects.ctypes.data)
+    return AnnotationRects(pages[:count], indices[:count], rects[:count])
+
+
+def write_rects(pdf_doc: _PdfDocument, rects: AnnotationRects) -> int:
+    """Replace rectangles of annotations in the document and return how many were replaced.
+
+    ``rects`` would usually come from :func:`read_rects`, but any arrays
+    with matching shapes are accepted. Annotations are written with a
+    single call into .NET. Entries, which point to no annotation, are
+    skipped.
+    """
+    np = _import_numpy()
+    pages = np.ascontiguousarray(rects.pages, dtype=np.int32)
+    indices = np.ascontiguousarray(rects.indices, dtype=np.int32)
+    values = np.ascontiguousarray(rects.rects, dtype=np.float64)
+    count = len(pages)
+    if pages.shape != (count,) or indices.shape != (count,) or values.shape != (count, 4):
+        raise ValueError(f'Expected arrays of shapes ({count},), ({count},) and ({count}, 4), '
+                         f'got {pages.shape}, {indices.shape} and {values.shape}')
+    return _PyAnnotationRects.Write(pdf_doc, count, pages.ctypes.data, indices.ctypes.data, values.ctypes.data)
+
+
+class Link(_NamedTuple):
+    """Link annotation to be added with :func:`add_links`."""
+    page: int
+    """Number of the page to add the link to, starting from 1."""
+    rect: _Sequence[float] | _Rectangle
+    """Area of the link as ``(llx, lly, urx, ury)`` or as a ``Rectangle``."""
+    target: int | str
+    """Number of the page to go to or a URI to open."""
+
+
+def add_links(pdf_doc: _PdfDocument,
+              links: _Iterable[Link | tuple[int, _Sequence[float] | _Rectangle, int | str]],
+              border: _Sequence[float] | None = (0, 0, 0),
+              highlight_mode: _PdfName | None = None) -> int:
+    """Add link annotations from a table of ``(page, rect, target)`` rows.
+
+    Links to pages fit the target page to the window. All the links are
+    created with a single call into .NET. Links with the same target share
+    a single action dictionary, and all the links share a single border
+    array, which keeps the output small. ``border`` is no border by default,
+    like for links from layout, and None leaves it to the viewer.
+    ``highlight_mode`` is one of the ``PdfAnnotation.HIGHLIGHT_*`` names.
+
+    Return the number of distinct targets.
+    """
+    page_count = pdf_doc.GetNumberOfPages()
+    pages = _array.array('i')
+    rects = _array.array('d')
+    target_pages = _array.array('i')
+    uris = []
+    for page, rect, target in links:
+        if not 1 <= page <= page_count:
+            raise ValueError(f'Page {page} is out of range 1-{page_count}')
+        if isinstance(rect, _Rectangle):
+            rect = (rect.GetLeft(), rect.GetBottom(), rect.GetRight(), rect.GetTop())
+        elif len(rect) != 4:
+            raise ValueError(f'Rectangle must have 4 coordinates, got {len(rect)}')
+        pages.append(page)
+        rects.extend(rect)
+        if isinstance(target, str):
+            target_pages.append(0)
+            uris.append(target)
+        else:
+            if not 1 <= target <= page_count:
+                raise ValueError(f'Target page {target} is out of range 1-{page_count}')
+            target_pages.append(target)
+            uris.append(None)
+    count = len(pages)
+    if count == 0:
+        return 0
+    clr_uris = _Array[str](uris) if any(uri is not None for uri in uris) else None
+    clr_border = _PdfArray(_Array[float](list(border))) if border is not None else None
+    return _PyLinkAnnotations.Add(pdf_doc, count, pages.buffer_info()[0], rects.buffer_info()[0],
+                                  target_pages.buffer_info()[0], clr_uris, clr_border, highlight_mode)
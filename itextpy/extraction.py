@@ -0,0 +1,73 @@
+"""
+This module contains helpers for extracting content from PDF documents.
+"""
+import os as _os
+import threading as _threading
+from typing import Any as _Any, Callable as _Callable, Iterator as _Iterator
+
+from iText.IO.Source import RandomAccessSourceFactory as _RandomAccessSourceFactory
+from iText.Kernel.Pdf import PdfDocument as _PdfDocument, PdfReader as _PdfReader, \
+    ReaderProperties as _ReaderProperties
+from iText.Kernel.Pdf.Canvas.Parser import PdfTextExtractor as _PdfTextExtractor
+from iText.Kernel.Pdf.Canvas.Parser.Listener import ITextExtractionStrategy as _ITextExtractionStrategy, \
+    LocationTextExtractionStrategy as _LocationTextExtractionStrategy
+
+from .util import _ordered_parallel_map, _per_thread, bytes_to_clr as _bytes_to_clr, disposing as _disposing
+
+
+def _reader_factory(source: _Any, properties: _ReaderProperties | None) -> _Callable[[], _PdfReader]:
+    """Return a function, which opens a new independent reader for the source on each call."""
+    if properties is None:
+        properties = _ReaderProperties()
+    if isinstance(source, (str, _os.PathLike)):
+        path = _os.fspath(source)
+        return lambda: _PdfReader(path, properties)
+    # All the readers share the same immutable .NET copy of the data
+    data = _bytes_to_clr(source)
+    return lambda: _PdfReader(_RandomAccessSourceFactory().CreateSource(data), properties)
+
+
+def iter_pages_text(source: _Any,
+                    strategy_factory: _Callable[[], _ITextExtractionStrategy] = _LocationTextExtractionStrategy,
+                    max_workers: int | None = None,
+                    properties: _ReaderProperties | None = None) -> _Iterator[str]:
+    """Yield text of each page of a PDF document in page order, extracting pages in parallel.
+
+    ``source`` is either a path to the PDF file or a buffer-protocol object
+    with its contents. Every worker thread opens its own ``PdfDocument`` over
+    the source, as a document cannot be shared between threads. Text
+    extraction itself runs in .NET with the GIL released, so pages are
+    actually processed concurrently.
+
+    A new strategy is created with ``strategy_factory`` for every page. Note,
+    that strategies accumulate text, so reusing one instance for several
+    pages would return the text of all the previous pages as well.
+
+    Only a limited number of pages is extracted ahead of the consumer, so
+    memory usage stays bounded even for huge documents, and the first pages
+    are available long before the whole document is processed.
+    """
+    open_reader = _reader_factory(source, properties)
+    with _disposing(_PdfDocument(open_reader())) as doc:
+        page_count = doc.GetNumberOfPages()
+
+    docs_lock = _threading.Lock()
+    docs = []
+
+    def open_doc() -> _PdfDocument:
+        doc = _PdfDocument(open_reader())
+        with docs_lock:
+            docs.append(doc)
+        return doc
+
+    thread_doc = _per_thread(open_doc)
+
+    def extract(page_num: int) -> str:
+        return _PdfTextExtractor.GetTextFromPage(thread_doc().GetPage(page_num), strategy_factory())
+
+    try:
+        # Workers are shut down, when this is closed, before the documents
+        yield from _ordered_parallel_map(extract, range(1, page_count + 1), max_workers, 'extraction')
+    finally:
+        for doc in docs:
+            doc.Close()
@@ -0,0 +1,336 @@
+"""
+This module contains helpers for filling the same AcroForm template with
+many records and for sharing identical form field appearances.
+"""
+import hashlib as _hashlib
+import os as _os
+import time as _time
+from typing import Any as _Any, Callable as _Callable, Iterator as _Iterator, \
+    Mapping as _Mapping, NamedTuple as _NamedTuple
+
+from iText.Forms.Fields import PdfFormCreator as _PdfFormCreator, PdfFormField as _PdfFormField
+from iText.IO.Source import RandomAccessSourceFactory as _RandomAccessSourceFactory
+from iText.Kernel.Pdf import PdfDictionary as _PdfDictionary, PdfDocument as _PdfDocument, \
+    PdfIndirectReference as _PdfIndirectReference, PdfName as _PdfName, PdfPage as _PdfPage, \
+    PdfReader as _PdfReader, PdfStream as _PdfStream, PdfWriter as _PdfWriter, ReaderProperties as _ReaderProperties
+from iText.Kernel.Pdf.Event import AbstractPdfDocumentEvent as _AbstractPdfDocumentEvent, \
+    PdfDocumentEvent as _PdfDocumentEvent, PyAbstractPdfDocumentEventHandler as _PyAbstractPdfDocumentEventHandler
+
+from .io import render_to_bytes as _render_to_bytes
+from .util import _ordered_parallel_map, bytes_to_clr as _bytes_to_clr, clr_bytes_view as _clr_bytes_view, \
+    clr_cast as _clr_cast, disposing as _disposing
+
+
+class FormFieldInfo(_NamedTuple):
+    """Field of a form template, as it was found when the template was parsed."""
+    name: str
+    """Fully qualified name of the field."""
+    obj_number: int | None
+    """Number of the indirect object of the field dictionary, if it is indirect."""
+    form_type: str | None
+    """Field type, like ``"Tx"`` or ``"Btn"``, or None for fields without one."""
+    states: tuple[str, ...]
+    """Appearance states of the widgets, like the on states of check boxes."""
+
+
+class FillResult(_NamedTuple):
+    """Result of filling a form template with a single record."""
+    index: int
+    """Position of the record in the filled sequence."""
+    dest: str | None
+    """Path to the PDF file, which was written for the record, if any."""
+    data: bytes | None
+    """Contents of the PDF document, if it was not written to a file."""
+    elapsed: float
+    """Time in seconds, which filling took."""
+    error: str | None
+    """Error, which prevented filling, if any."""
+
+
+class FormTemplate:
+    """AcroForm document, which is parsed once and then filled many times.
+
+    Getting the fields with ``PdfAcroForm`` walks the whole field tree of the
+    document and wraps every field, every time a copy of the form is filled.
+    A template does this once and remembers, which object each field name
+    refers to, so filling a copy only touches the fields, which get values.
+
+    Every copy is read from the same in-memory template bytes, which are
+    never modified, so templates can be filled from many threads at once.
+    """
+
+    def __init__(self, data: _Any, properties: _ReaderProperties | None = None):
+        self._data = _bytes_to_clr(data)
+        self._properties = properties
+        self.fields: dict[str, FormFieldInfo] = {}
+        with _disposing(_PdfDocument(self._open_reader())) as pdf_doc:
+            form = _PdfFormCreator.GetAcroForm(pdf_doc, False)
+            if form is None:
+                raise ValueError('Template has no AcroForm')
+            for entry in form.GetAllFormFields():
+                field = entry.Value
+                reference = field.GetPdfObject().GetIndirectReference()
+                form_type = field.GetFormType()
+                states = field.GetAppearanceStates()
+                self.fields[entry.Key] = FormFieldInfo(
+                    entry.Key,
+                    reference.GetObjNumber() if reference is not None else None,
+                    form_type.GetValue() if form_type is not None else None,
+                    tuple(states) if states is not None else (),
+                )
+
+    @classmethod
+    def from_file(cls, path: str | _os.PathLike, properties: _ReaderProperties | None = None) -> 'FormTemplate':
+        """Return a template for a PDF file with an AcroForm."""
+        with open(path, 'rb') as file:
+            return cls(file.read(), properties)
+
+    def _open_reader(self) -> _PdfReader:
+        # The source reads the shared array directly without copying it
+        source = _RandomAccessSourceFactory().CreateSource(self._data)
+        return _PdfReader(source, self._properties if self._properties is not None else _ReaderProperties())
+
+    def fill(self, values: _Mapping[str, _Any], dest: _Any = None, flatten: bool = False) -> bytes | None:
+        """Fill a copy of the template with the values and write it.
+
+        ``values`` maps field names to values. None and NaN values are left
+        out, so that missing cells of data frames are empty fields. ``True``
+        and ``False`` check and uncheck check boxes, anything else is set as
+        text. ``KeyError`` is raised for names, which are not in the form.
+
+        ``dest`` is a path or a .NET stream. If it is None, then the document
+        is returned as bytes instead. ``flatten`` turns the fields into
+        regular page content. Names are checked before anything is written,
+        and if filling fails anyway, then no file is left at the ``dest``
+        path. Streams cannot be taken back, so they may get a partially
+        filled document in that case.
+        """
+        fields = self._get_fields(values)
+        if dest is None:
+            return _render_to_bytes(lambda stream: self._fill(fields, stream, flatten))
+        if not isinstance(dest, (str, _os.PathLike)):
+            self._fill(fields, dest, flatten)
+            return None
+        dest = _os.fspath(dest)
+        try:
+            self._fill(fields, dest, flatten)
+        except BaseException:
+            # Disposing the document still writes it, even after a failure
+            try:
+                _os.remove(dest)
+            except OSError:
+                pass
+            raise
+        return None
+
+    def _get_fields(self, values: _Mapping[str, _Any]) -> list[tuple[FormFieldInfo, _Any]]:
+        fields = []
+        for name, value in values.items():
+            # NaN is the only value, which is not equal to itself
+            if value is None or value != value:
+                continue
+            info = self.fields.get(name)
+            if info is None:
+                raise KeyError(f'Form has no field {name!r}')
+            fields.append((info, value))
+        return fields
+
+    def _fill(self, fields: list[tuple[FormFieldInfo, _Any]], dest: _Any, flatten: bool) -> None:
+        with _disposing(_PdfDocument(self._open_reader(), _PdfWriter(dest))) as pdf_doc:
+            form = None
+            for info, value in fields:
+                if info.obj_number is not None:
+                    field = _PdfFormField.MakeFormField(pdf_doc.GetPdfObject(info.obj_number), pdf_doc)
+                else:
+                    if form is None:
+                        form = _PdfFormCreator.GetAcroForm(pdf_doc, False)
+                    field = form.GetField(info.name)
+                    if field is None:
+                        raise KeyError(f'Form has no field {info.name!r}')
+                field.SetValue(self._to_value(info, value))
+            if flatten:
+                if form is None:
+                    form = _PdfFormCreator.GetAcroForm(pdf_doc, False)
+                form.FlattenFields()
+
+    @staticmethod
+    def _to_value(info: FormFieldInfo, value: _Any) -> str:
+        if isinstance(value, bool) and info.form_type == _PdfName.Btn.GetValue():
+            if not value:
+                return 'Off'
+            on_states = [s for s in info.states if s != 'Off']
+            return on_states[0] if on_states else 'Yes'
+        return str(value)
+
+
+def _iter_records(records: _Any) -> _Iterator[_Mapping[str, _Any]]:
+    columns = getattr(records, 'columns', None)
+    if columns is not None and hasattr(records, 'itertuples'):
+        # Data frames are iterated by rows without converting the whole
+        # frame to dictionaries up front
+        columns = list(columns)
+        return (dict(zip(columns, row)) for row in records.itertuples(index=False, name=None))
+    return (record if isinstance(record, _Mapping) else record._asdict() for record in records)
+
+
+def fill_many(template: FormTemplate,
+              records: _Any,
+              dest: str | _Callable[[int, _Mapping[str, _Any]], str] | None = None,
+              flatten: bool = False,
+              max_workers: int | None = None) -> _Iterator[FillResult]:
+    """Fill the template with each record in parallel and yield results in order.
+
+    ``records`` is an iterable of mappings or named tuples, or a data frame
+    like object with ``columns`` and ``itertuples``, which is read by rows.
+    ``dest`` is a pattern of the output path, which is formatted with the
+    ``index`` of the record and with its values, like ``"out/{index}.pdf"``,
+    or a callable, which returns the path. If it is None, then documents are
+    returned in the results as bytes. Errors are reported in the results
+    instead of being raised.
+
+    Filling runs in .NET with the GIL released, so records are actually
+    processed concurrently. Only a limited number of records is scheduled
+    ahead of the consumer, so that records can come from a stream of any
+    length.
+    """
+    def fill(job: tuple[int, _Mapping[str, _Any]]) -> FillResult:
+        index, record = job
+        path = None
+        start = _time.perf_counter()
+        try:
+            if dest is not None:
+                path = dest(index, record) if callable(dest) else dest.format_map({**record, 'index': index})
+            data = template.fill(record, path, flatten)
+            return FillResult(index, path, data, _time.perf_counter() - start, None)
+        except Exception as e:
+            return FillResult(index, path, None, _time.perf_counter() - start, f'{type(e).__name__}: {e}')
+
+    return _ordered_parallel_map(fill, enumerate(_iter_records(records)), max_workers, 'forms')
+
+
+def _form_type(widget: _PdfDictionary) -> str | None:
+    # Widgets of fields with a single widget are merged with the field,
+    # otherwise the type is in the parent field
+    form_type = widget.GetAsName(_PdfName.FT)
+    if form_type is None:
+        parent = widget.GetAsDictionary(_PdfName.Parent)
+        if parent is not None:
+            form_type = parent.GetAsName(_PdfName.FT)
+    return form_type.GetValue() if form_type is not None else None
+
+
+class _EndPageHandler(_PyAbstractPdfDocumentEventHandler):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Forms"
+
+    def __init__(self, cache: 'AppearanceCache'):
+        super().__init__()
+        self.cache = cache
+
+    def _OnAcceptedEvent(self, event: _AbstractPdfDocumentEvent) -> None:
+        self.cache.share_page(_clr_cast(event, _PdfDocumentEvent).GetPage())
+
+
+class AppearanceCache:
+    """Shares identical appearance streams of form fields within a document.
+
+    Interactive ``InputField``, ``TextArea``, ``Radio`` and other form
+    elements get their own appearance streams from layout, even when many
+    of them look exactly the same, like the states of radio groups and
+    check box grids. The cache looks at the widgets of every finished page
+    and makes all the normal and down appearances with the same field type,
+    size, content and resources point to a single stream, so each distinct
+    appearance is compressed and written only once.
+
+    Appearances are compared by what was generated, so the style of the
+    elements, their size and their values all count, including properties,
+    which are not stored in the field, like padding. Call :meth:`close`
+    before closing the document, so that the last page is processed too.
+
+    Duplicates are released from the document, so that they are not written
+    at all. This is only safe, when each of them is used by a single widget,
+    as generated by layout. Set ``release_duplicates`` to False for
+    documents, which could already share appearances.
+    """
+
+    def __init__(self, pdf_doc: _PdfDocument, release_duplicates: bool = True):
+        self.pdf_doc = pdf_doc
+        self.release_duplicates = release_duplicates
+        # Number of distinct appearances and of the ones replaced with them
+        self.unique = 0
+        self.shared = 0
+        # (form type, width, height, digest) -> reference to the shared stream
+        self._streams: dict[tuple, _PdfIndirectReference] = {}
+        self._processed_pages: set[int] = set()
+        self._handler = _EndPageHandler(self)
+        pdf_doc.AddEventHandler(_PdfDocumentEvent.END_PAGE, self._handler)
+
+    def share_page(self, page: _PdfPage) -> None:
+        """Share the appearances of the widgets on the page, unless it was done already."""
+        reference = page.GetPdfObject().GetIndirectReference()
+        if page.IsFlushed() or reference is None or reference.GetObjNumber() in self._processed_pages:
+            return
+        self._processed_pages.add(reference.GetObjNumber())
+        for annotation in page.GetAnnotations():
+            if annotation.GetSubtype() != _PdfName.Widget:
+                continue
+            appearances = annotation.GetAppearanceDictionary()
+            if appearances is None:
+                continue
+            form_type = _form_type(annotation.GetPdfObject())
+            for kind in (_PdfName.N, _PdfName.D):
+                appearance = appearances.Get(kind)
+                if appearance is None:
+                    continue
+                if appearance.IsStream():
+                    self._share_in(appearances, kind, form_type, _clr_cast(appearance, _PdfStream))
+                elif appearance.IsDictionary():
+                    # Check boxes and radio buttons have a stream per state
+                    states = _clr_cast(appearance, _PdfDictionary)
+                    for state in list(states.KeySet()):
+                        stream = states.GetAsStream(state)
+                        if stream is not None:
+                            self._share_in(states, state, form_type, stream)
+
+    def close(self) -> None:
+        """Process the pages, which are still in memory, and stop processing new ones."""
+        self.pdf_doc.RemoveEventHandler(_PdfDocumentEvent.END_PAGE, self._handler)
+        for number in range(1, self.pdf_doc.GetNumberOfPages() + 1):
+            page = self.pdf_doc.GetPage(number)
+            if not page.IsFlushed():
+                self.share_page(page)
+
+    def _share_in(self, container: _PdfDictionary, key: _PdfName, form_type: str | None,
+                  stream: _PdfStream) -> None:
+        if stream.IsFlushed():
+            return
+        bbox = stream.GetAsArray(_PdfName.BBox)
+        if bbox is None:
+            return
+        rect = bbox.ToRectangle()
+        digest = _hashlib.sha256()
+        with _clr_bytes_view(stream.GetBytes(False)) as view:
+            digest.update(view)
+        for name in (_PdfName.BBox, _PdfName.Matrix, _PdfName.Resources):
+            value = stream.Get(name)
+            # Indirect objects are written as references, so resources like
+            # fonts only match, when they are the same objects
+            digest.update(b'\0' + (value.ToString() if value is not None else '').encode())
+        cache_key = (form_type, round(rect.GetWidth(), 3), round(rect.GetHeight(), 3), digest.digest())
+
+        reference = stream.GetIndirectReference()
+        shared = self._streams.get(cache_key)
+        if shared is None:
+            if reference is None:
+                stream.MakeIndirect(self.pdf_doc)
+                reference = stream.GetIndirectReference()
+            self._streams[cache_key] = reference
+            self.unique += 1
+            return
+        if reference is not None and reference.GetObjNumber() == shared.GetObjNumber():
+            return
+        container.Put(key, shared)
+        if reference is not None and self.release_duplicates:
+            reference.SetFree()
+        self.shared += 1
@@ -0,0 +1,180 @@
+"""
+This module contains helpers to connect Python I/O objects with .NET streams.
+"""
+import ctypes as _ctypes
+import io as _io
+import os as _os
+from typing import Any as _Any, Callable as _Callable
+
+from System.IO import SeekOrigin as _SeekOrigin, Stream as _Stream
+from iText.IO.Source import IPyStreamBackend as _IPyStreamBackend, PyBufferedStream as _PyBufferedStream, \
+    RandomAccessSourceFactory as _RandomAccessSourceFactory
+from iText.Kernel.Pdf import PdfReader as _PdfReader, ReaderProperties as _ReaderProperties
+
+from .util import bytes_to_clr as _bytes_to_clr, disposing as _disposing
+
+DEFAULT_BUFFER_SIZE: int = _PyBufferedStream.DEFAULT_BUFFER_SIZE
+"""Default size of the buffer between .NET and the Python file object."""
+
+_WHENCE = {
+    _SeekOrigin.Begin: 0,
+    _SeekOrigin.Current: 1,
+    _SeekOrigin.End: 2,
+}
+
+
+def _chunk_view(address: int, count: int) -> memoryview:
+    return memoryview((_ctypes.c_ubyte * count).from_address(address)).cast('B')
+
+
+def _has_capability(file: _Any, check_name: str, fallback_attr_name: str) -> bool:
+    check = getattr(file, check_name, None)
+    if check is not None:
+        return bool(check())
+    return hasattr(file, fallback_attr_name)
+
+
+class _FileObjectBackend(_IPyStreamBackend):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.IO"
+
+    def __init__(self, file: _Any, close_file: bool):
+        self.file = file
+        self.close_file = close_file
+        self.readinto = getattr(file, 'readinto', None)
+
+    def ReadChunk(self, address: int, count: int) -> int:
+        view = _chunk_view(address, count)
+        if self.readinto is not None:
+            read = self.readinto(view)
+        else:
+            data = self.file.read(count)
+            read = None if data is None else len(data)
+            if read:
+                view[:read] = data
+        # None is returned by non-blocking objects without data available.
+        # .NET streams are blocking and treat an empty read as the end of the
+        # stream, so this has to be an error instead of silent truncation
+        if read is None:
+            raise BlockingIOError('Python object has no data available without blocking')
+        return read
+
+    def WriteChunk(self, address: int, count: int) -> int:
+        written = self.file.write(_chunk_view(address, count))
+        # Buffered objects always write everything, but raw ones could do a
+        # partial write, which is then continued from .NET. Non-blocking raw
+        # objects return None, when they would block, which becomes an
+        # error. Other file-like objects can return None instead of the
+        # count, though, and those are assumed to write everything
+        if written is None:
+            return 0 if isinstance(self.file, _io.RawIOBase) else count
+        return written
+
+    def Seek(self, offset: int, origin: _SeekOrigin) -> int:
+        return self.file.seek(offset, _WHENCE[origin])
+
+    def GetLength(self) -> int:
+        position = self.file.tell()
+        length = self.file.seek(0, 2)
+        self.file.seek(position)
+        return length
+
+    def SetLength(self, length: int) -> None:
+        position = self.file.tell()
+        self.file.truncate(length)
+        # truncate doesn't change position in Python, but in .NET it is
+        # expected to stay within the stream bounds
+        if position > length:
+            self.file.seek(length)
+
+    def Flush(self) -> None:
+        flush = getattr(self.file, 'flush', None)
+        if flush is not None:
+            flush()
+
+    def Close(self) -> None:
+        if self.close_file:
+            self.file.close()
+
+
+def file_to_clr_stream(file: _Any,
+                       buffer_size: int = DEFAULT_BUFFER_SIZE,
+                       close_file: bool = False) -> _PyBufferedStream:
+    """Return a .NET ``Stream`` backed by a Python binary file-like object.
+
+    This allows passing objects like ``io.BytesIO``, sockets (via
+    ``socket.makefile('rwb')``) or ``tempfile.SpooledTemporaryFile`` directly
+    to iText, e.g. to ``PdfReader``, ``PdfWriter`` or ``HtmlConverter``.
+
+    Calls to Python are buffered, so the file object is only accessed in
+    chunks of up to ``buffer_size`` bytes. If the file object has a
+    ``readinto`` method, then data is read directly into .NET memory.
+    Writes, which don't accept any data, like those to non-blocking sockets,
+    which would block, raise ``IOException`` in .NET. Reads from such
+    objects, which have no data available, raise ``BlockingIOError``
+    instead of ending the stream early.
+
+    Whether the stream can read, write or seek is determined from the
+    ``readable``, ``writable`` and ``seekable`` methods of the file object, if
+    present, or from the presence of ``read``, ``write`` and ``seek`` methods
+    otherwise.
+
+    The file object is not closed, when the stream is disposed, unless
+    ``close_file`` is set. This is handy, as iText closes the streams it was
+    given, but you might still want to use the data afterward.
+    """
+    return _PyBufferedStream(
+        _FileObjectBackend(file, close_file),
+        _has_capability(file, 'readable', 'read'),
+        _has_capability(file, 'writable', 'write'),
+        _has_capability(file, 'seekable', 'seek'),
+        buffer_size,
+    )
+
+
+def render_to_bytes(render: _Callable[[_Stream], None], buffer_size: int = DEFAULT_BUFFER_SIZE) -> bytes:
+    """Return everything the callable writes into the provided .NET stream as bytes.
+
+    Output goes straight into a growable Python buffer in chunks, so there is
+    no ``MemoryStream`` holding a second full copy of the data and no
+    ``ToArray()`` call at the end. The callable can freely close the stream,
+    as iText usually does::
+
+        def render(stream):
+            with disposing(PdfDocument(PdfWriter(stream))) as pdf_doc:
+                ...
+
+        pdf_bytes = render_to_bytes(render)
+
+    This works the same way for incremental updates and signing, just pass
+    the stream as the output to ``PdfSigner`` together with a reader from
+    :func:`open_bytes`.
+    """
+    output = _io.BytesIO()
+    with _disposing(file_to_clr_stream(output, buffer_size)) as stream:
+        render(stream)
+    # BytesIO returns its internal buffer here without copying
+    return output.getvalue()
+
+
+def open_bytes(data: _Any, properties: _ReaderProperties | None = None) -> _PdfReader:
+    """Return a ``PdfReader`` for a PDF document stored in a buffer-protocol object.
+
+    The data is copied into .NET memory in one go and the reader works on that
+    copy directly. Passing a stream instead would make iText read it into yet
+    another array.
+    """
+    source = _RandomAccessSourceFactory().CreateSource(_bytes_to_clr(data))
+    return _PdfReader(source, properties if properties is not None else _ReaderProperties())
+
+
+def open_reader(source: _Any, properties: _ReaderProperties | None = None) -> _PdfReader:
+    """Return a ``PdfReader`` for a path to a PDF document or for its contents.
+
+    Paths are opened as files, anything else is treated as a buffer-protocol
+    object and opened with :func:`open_bytes`.
+    """
+    if isinstance(source, (str, _os.PathLike)):
+        return _PdfReader(_os.fspath(source), properties if properties is not None else _ReaderProperties())
+    return open_bytes(source, properties)
@@ -0,0 +1,107 @@
+"""
+This module contains helpers for loading certificates and keys, which parse
+each source only once.
+"""
+import hashlib as _hashlib
+import os as _os
+import threading as _threading
+from typing import Any as _Any, Callable as _Callable, NamedTuple as _NamedTuple
+
+from System.IO import File as _File, FileAccess as _FileAccess, FileMode as _FileMode, FileStream as _FileStream
+from iText.Bouncycastle.Crypto import PrivateKeyBC as _PrivateKeyBC
+from iText.Bouncycastle.X509 import X509CertificateBC as _X509CertificateBC
+from iText.Bouncycastleconnector import BouncyCastleFactoryCreator as _BouncyCastleFactoryCreator
+from iText.Commons.Bouncycastle.Cert import IX509Certificate as _IX509Certificate
+from iText.Commons.Bouncycastle.Crypto import IPrivateKey as _IPrivateKey
+from Org.BouncyCastle.Pkcs import Pkcs12StoreBuilder as _Pkcs12StoreBuilder
+
+from .util import clr_isinstance as _clr_isinstance, clr_try_cast as _clr_try_cast, disposing as _disposing
+
+_FACTORY = _BouncyCastleFactoryCreator.GetFactory()
+
+_lock = _threading.Lock()
+# (kind, path, password hash) -> ((mtime, size), value)
+_cache: dict[tuple[str, str, bytes], tuple[tuple[int, int], _Any]] = {}
+
+
+class Pkcs12Entry(_NamedTuple):
+    """Private key together with its certificate chain."""
+    private_key: _IPrivateKey
+    chain: tuple[_IX509Certificate, ...]
+
+
+def _cached(kind: str, path: str | _os.PathLike, password: str | None, load: _Callable[[str], _Any]) -> _Any:
+    path = _os.path.abspath(_os.fspath(path))
+    stat = _os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    # Passwords are only kept as hashes
+    key = (kind, path, _hashlib.sha256((password or '').encode('utf-8')).digest())
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    value = load(path)
+    with _lock:
+        _cache[key] = (stamp, value)
+    return value
+
+
+def read_pem_chain(path: str | _os.PathLike) -> tuple[_IX509Certificate, ...]:
+    """Return all the certificates from a PEM file in the order they appear there.
+
+    The file is only parsed again, if its modification time or size changes.
+    """
+    def load(file_path: str) -> tuple[_IX509Certificate, ...]:
+        with _disposing(_File.OpenText(file_path)) as file:
+            parser = _FACTORY.CreatePEMParser(file, None)
+            certificates = []
+            obj = parser.ReadObject()
+            while obj is not None:
+                if _clr_try_cast(obj, _IX509Certificate) is not None:
+                    certificates.append(obj)
+                obj = parser.ReadObject()
+            return tuple(certificates)
+
+    return _cached('pem-chain', path, None, load)
+
+
+def read_pem_key(path: str | _os.PathLike, password: str | None) -> _IPrivateKey | None:
+    """Return the first private key from a PEM file or None, if there is none.
+
+    The key is decrypted only once and then reused, until the modification
+    time or size of the file changes.
+    """
+    def load(file_path: str) -> _IPrivateKey | None:
+        with _disposing(_File.OpenText(file_path)) as file:
+            parser = _FACTORY.CreatePEMParser(file, password)
+            obj = parser.ReadObject()
+            while (obj is not None) and (not _clr_isinstance(obj, _IPrivateKey)):
+                obj = parser.ReadObject()
+            return _clr_try_cast(obj, _IPrivateKey)
+
+    return _cached('pem-key', path, password, load)
+
+
+def read_pkcs12(path: str | _os.PathLike, password: str) -> Pkcs12Entry:
+    """Return the first private key together with its chain from a PKCS#12 file.
+
+    The file is only parsed again, if its modification time or size changes.
+    """
+    def load(file_path: str) -> Pkcs12Entry:
+        pk12 = _Pkcs12StoreBuilder().Build()
+        with _disposing(_FileStream(file_path, _FileMode.Open, _FileAccess.Read)) as stream:
+            pk12.Load(stream, password)
+        alias = next((a for a in pk12.Aliases if pk12.IsKeyEntry(a)), None)
+        if alias is None:
+            raise ValueError(f'no private key in {file_path}')
+        private_key = _PrivateKeyBC(pk12.GetKey(alias).Key)
+        chain = tuple(_X509CertificateBC(e.Certificate) for e in pk12.GetCertificateChain(alias))
+        return Pkcs12Entry(private_key, chain)
+
+    return _cached('pkcs12', path, password, load)
+
+
+def clear_cache() -> None:
+    """Forget all the parsed sources."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,194 @@
+"""
+This module contains helpers for producing many PDF/A documents.
+"""
+import itertools as _itertools
+import os as _os
+import threading as _threading
+from typing import Iterable as _Iterable, NamedTuple as _NamedTuple
+
+from System import Array as _Array, String as _String
+
+from iText.IO.Colors import IccProfile as _IccProfile
+from iText.Kernel.Pdf import DocumentProperties as _DocumentProperties, PdfAConformance as _PdfAConformance, \
+    PdfName as _PdfName, PdfOutputIntent as _PdfOutputIntent, PdfWriter as _PdfWriter
+from iText.Kernel.Pdf.Colorspace import PdfCieBasedCs as _PdfCieBasedCs
+from iText.Pdfa import PyConformanceProfile as _PyConformanceProfile, PyPdfABatch as _PyPdfABatch, \
+    PyPdfABatchDocument as _PyPdfABatchDocument
+
+from .util import bytes_to_clr as _bytes_to_clr
+
+# Only these device classes are allowed in PDF/A output intents
+_OUTPUT_DEVICE_CLASSES = ('mntr', 'prtr')
+
+_lock = _threading.Lock()
+# path -> ((mtime, size), profile)
+_cache: dict[str, tuple[tuple[int, int], _IccProfile]] = {}
+
+
+def parse_icc_profile(data: bytes) -> _IccProfile:
+    """Return the parsed ICC profile, checking that it can be used in an output intent.
+
+    ``ValueError`` is raised for profiles of devices other than monitors and
+    printers, which PDF/A doesn't allow as output intents.
+    """
+    data = _bytes_to_clr(data)
+    device_class = _IccProfile.GetIccDeviceClass(data)
+    if device_class not in _OUTPUT_DEVICE_CLASSES:
+        raise ValueError(f'ICC profile device class must be one of {_OUTPUT_DEVICE_CLASSES}, not {device_class!r}')
+    # Fails for broken profiles and unsupported color spaces
+    return _IccProfile.GetInstance(data)
+
+
+def read_icc_profile(path: str | _os.PathLike) -> _IccProfile:
+    """Return the parsed ICC profile from a file, see :func:`parse_icc_profile`.
+
+    The file is only read and parsed again, if its modification time or size
+    changes.
+    """
+    path = _os.path.abspath(_os.fspath(path))
+    stat = _os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        entry = _cache.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    with open(path, 'rb') as file:
+        profile = parse_icc_profile(file.read())
+    with _lock:
+        _cache[path] = (stamp, profile)
+    return profile
+
+
+def clear_cache() -> None:
+    """Forget all the parsed ICC profiles."""
+    with _lock:
+        _cache.clear()
+
+
+def create_output_intent(icc_profile: str | _os.PathLike | _IccProfile,
+                         output_condition_identifier: str = "Custom",
+                         output_condition: str = "",
+                         registry_name: str | None = None,
+                         info: str | None = None) -> _PdfOutputIntent:
+    """Return a new output intent for a single document.
+
+    This is the same, as constructing ``PdfOutputIntent`` with a stream over
+    the ICC profile, but the profile is either already parsed or comes from a
+    path, which is read only once with :func:`read_icc_profile`. Creating an
+    intent then only copies the profile bytes into a new PDF stream.
+
+    Intents become part of the document they are used in, so each document
+    needs its own one.
+    """
+    if isinstance(icc_profile, (str, _os.PathLike)):
+        icc_profile = read_icc_profile(icc_profile)
+    intent = _PdfOutputIntent(output_condition_identifier, output_condition, registry_name, info, None)
+    intent.GetPdfObject().Put(_PdfName.DestOutputProfile, _PdfCieBasedCs.IccBased.GetIccProfileStream(icc_profile))
+    return intent
+
+
+class CheckTiming(_NamedTuple):
+    """Time spent in a single kind of conformance checks."""
+    rule: str
+    """Kind of the checks, named after the validation context, like ``"Font"``."""
+    checks: int
+    """Number of checks, which were actually run."""
+    skipped: int
+    """Number of checks, which were skipped in documents, which were not verified fully."""
+    seconds: float
+    """Total time in seconds, which the checks took."""
+
+
+class ConformanceProfile:
+    """Thread-safe statistics of PDF/A conformance checks, grouped by rule.
+
+    Statistics are collected by the underlying .NET object, so checks of
+    batch documents don't call into Python to record them.
+    """
+
+    def __init__(self):
+        self.clr_profile = _PyConformanceProfile()
+
+    def record(self, rule: str, seconds: float | None) -> None:
+        """Add a single check. None for ``seconds`` means, that the check was skipped."""
+        if seconds is None:
+            self.clr_profile.RecordSkipped(rule)
+        else:
+            self.clr_profile.RecordSeconds(rule, seconds)
+
+    def timings(self) -> list[CheckTiming]:
+        """Return the statistics for each rule, the most expensive ones first."""
+        timings = [CheckTiming(t.Rule, t.Checks, t.Skipped, t.Seconds) for t in self.clr_profile.GetTimings()]
+        timings.sort(key=lambda t: t.seconds, reverse=True)
+        return timings
+
+    def clear(self) -> None:
+        """Forget all the statistics."""
+        self.clr_profile.Clear()
+
+
+class PdfABatch:
+    """Factory of PDF/A documents, which share the same structure and resources.
+
+    ``PdfADocument`` runs its conformance checks inline on every write. When
+    all the documents of a batch come from the same trusted template, most of
+    these checks repeat the same work over and over again. Documents from a
+    batch still do the checks, but:
+
+    * Only one in ``verify_every`` documents is checked fully, starting with
+      the first one. 0 means, that no document is checked fully.
+    * Other documents skip font checks, which already passed for the same
+      font and text in the batch, and all the checks of ``skipped_rules``,
+      like ``"Canvas"``. If ``trust_unverified`` is set, then they skip all
+      the checks instead, which is only safe for documents, which differ
+      from the verified ones in text content alone.
+
+    Checks are decided by ``PyPdfABatchDocument`` on the .NET side, this
+    class only configures it. Time spent in the checks, which were run, is
+    recorded into ``profile`` per rule, so it is easy to see what the checks
+    actually cost.
+
+    Output intents are created with :func:`create_output_intent`, so the ICC
+    profile is parsed only once for the whole batch.
+    """
+
+    def __init__(self,
+                 conformance: _PdfAConformance,
+                 icc_profile: str | _os.PathLike | _IccProfile,
+                 output_condition_identifier: str = "Custom",
+                 output_condition: str = "",
+                 registry_name: str | None = None,
+                 info: str | None = None,
+                 verify_every: int = 1,
+                 trust_unverified: bool = False,
+                 profile: ConformanceProfile | None = None,
+                 skipped_rules: _Iterable[str] = ()):
+        if isinstance(icc_profile, (str, _os.PathLike)):
+            icc_profile = read_icc_profile(icc_profile)
+        self.conformance = conformance
+        self.icc_profile = icc_profile
+        self.output_intent_args = (output_condition_identifier, output_condition, registry_name, info)
+        self.verify_every = verify_every
+        self.trust_unverified = trust_unverified
+        self.skipped_rules = frozenset(skipped_rules)
+        self.profile = profile if profile is not None else ConformanceProfile()
+        self._counter = _itertools.count()
+        self._clr_batch = _PyPdfABatch(self.profile.clr_profile, trust_unverified,
+                                       _Array[_String](sorted(self.skipped_rules)))
+
+    def create_document(self, writer: _PdfWriter,
+                        properties: _DocumentProperties | None = None) -> _PyPdfABatchDocument:
+        """Return a new PDF/A document, which writes into the writer."""
+        index = next(self._counter)
+        intent = create_output_intent(self.icc_profile, *self.output_intent_args)
+        if properties is None:
+            pdf_doc = _PyPdfABatchDocument(writer, self.conformance, intent)
+        else:
+            pdf_doc = _PyPdfABatchDocument(writer, self.conformance, intent, properties)
+        pdf_doc.Verified = self.verify_every > 0 and index % self.verify_every == 0
+        pdf_doc.Batch = self._clr_batch
+        return pdf_doc
+
+    def clear_passed(self) -> None:
+        """Forget all the font checks, which passed, so they are run again."""
+        self._clr_batch.ClearPassed()
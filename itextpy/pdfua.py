@@ -0,0 +1,164 @@
+"""
+This module contains helpers for producing large PDF/UA documents.
+"""
+import os as _os
+from typing import Any as _Any, NamedTuple as _NamedTuple
+
+from iText.Kernel.Pdf import DocumentProperties as _DocumentProperties, PdfArray as _PdfArray, \
+    PdfDictionary as _PdfDictionary, PdfDocument as _PdfDocument, PdfName as _PdfName, PdfString as _PdfString, \
+    PdfUAConformance as _PdfUAConformance, PdfVersion as _PdfVersion, PdfViewerPreferences as _PdfViewerPreferences, \
+    PdfWriter as _PdfWriter, WriterProperties as _WriterProperties
+from iText.Kernel.Pdf.Event import AbstractPdfDocumentEvent as _AbstractPdfDocumentEvent, \
+    PdfDocumentEvent as _PdfDocumentEvent, PyAbstractPdfDocumentEventHandler as _PyAbstractPdfDocumentEventHandler
+from iText.Pdfua import PdfUAConfig as _PdfUAConfig
+
+from .util import clr_cast as _clr_cast
+
+
+def create_streaming_ua_document(dest: _Any,
+                                 config: _PdfUAConfig,
+                                 writer_properties: _WriterProperties | None = None,
+                                 document_properties: _DocumentProperties | None = None,
+                                 add_identification: bool = False) -> _PdfDocument:
+    """Return a tagged document set up like for PDF/UA, which can flush pages and tags early.
+
+    ``PdfUADocument`` keeps all the pages and the whole structure tree in
+    memory until the document is closed, so that its checks can see them.
+    This document gets the language, the title and the document title
+    display from ``config``, as ``PdfUADocument`` does, but it is a regular
+    ``PdfDocument`` without the checks. Finished pages are flushed together
+    with their marked content and with all the structure elements, which
+    have no more content to come, so memory stays bounded for documents of
+    any length. Layout ``Document`` does this automatically, unless it is
+    created with ``immediateFlush`` off.
+
+    Nothing is checked, so the document doesn't claim PDF/UA conformance in
+    its XMP metadata, unless ``add_identification`` is set. Only set it for
+    documents, which are produced the same way, as ones, which pass the
+    ``PdfUADocument`` checks or an external validator.
+    ``dest`` is a path or a .NET stream.
+    """
+    if writer_properties is None:
+        writer_properties = _WriterProperties()
+    conformance = config.GetConformance()
+    if add_identification:
+        writer_properties.AddPdfUaXmpMetadata(conformance)
+    if conformance == _PdfUAConformance.PDF_UA_2:
+        writer_properties.SetPdfVersion(_PdfVersion.PDF_2_0)
+    if isinstance(dest, _os.PathLike):
+        dest = _os.fspath(dest)
+    writer = _PdfWriter(dest, writer_properties)
+    if document_properties is None:
+        pdf_doc = _PdfDocument(writer)
+    else:
+        pdf_doc = _PdfDocument(writer, document_properties)
+    pdf_doc.SetTagged()
+    pdf_doc.GetCatalog().SetViewerPreferences(_PdfViewerPreferences().SetDisplayDocTitle(True))
+    pdf_doc.GetCatalog().SetLang(_PdfString(config.GetLanguage()))
+    pdf_doc.GetDocumentInfo().SetTitle(config.GetTitle())
+    return pdf_doc
+
+
+class StructureTreeStats(_NamedTuple):
+    """Amount of tagged content of a document, which is still in memory."""
+    page_count: int
+    """Number of pages in the document at the time."""
+    pages_in_memory: int
+    """Number of pages, which were not flushed yet."""
+    elements_in_memory: int
+    """Number of structure elements, which were not flushed yet."""
+    marked_contents_in_memory: int
+    """Number of references to marked content from the elements in memory."""
+
+
+def _count_structure_in_memory(pdf_doc: _PdfDocument) -> tuple[int, int]:
+    root = pdf_doc.GetStructTreeRoot()
+    if root is None or root.GetPdfObject().IsFlushed():
+        return 0, 0
+    elements = 0
+    marked_contents = 0
+    # Flushed objects are not loaded back, so this only walks what is in memory
+    stack = [root.GetPdfObject()]
+    while stack:
+        kids = stack.pop().Get(_PdfName.K, False)
+        if kids is None:
+            continue
+        if kids.IsArray():
+            kids = _clr_cast(kids, _PdfArray)
+            kids = [kids.Get(i, False) for i in range(kids.Size())]
+        else:
+            kids = [kids]
+        for kid in kids:
+            if kid is None or kid.IsFlushed():
+                continue
+            if kid.IsIndirectReference():
+                kid = kid.GetRefersTo()
+            if kid.IsNumber():
+                marked_contents += 1
+            elif kid.IsDictionary():
+                kid = _clr_cast(kid, _PdfDictionary)
+                if kid.ContainsKey(_PdfName.S):
+                    elements += 1
+                    stack.append(kid)
+                else:
+                    # Marked content and object references
+                    marked_contents += 1
+    return elements, marked_contents
+
+
+class _StartPageHandler(_PyAbstractPdfDocumentEventHandler):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.PdfUa"
+
+    def __init__(self, monitor: 'StructureTreeMonitor'):
+        super().__init__()
+        self.monitor = monitor
+
+    def _OnAcceptedEvent(self, event: _AbstractPdfDocumentEvent) -> None:
+        self.monitor._on_start_page()
+
+
+class StructureTreeMonitor:
+    """Records how much of the structure tree of a document stays in memory.
+
+    Statistics are taken every ``every`` pages, when a new page is started,
+    so they show the state right after the previous page was done. Counting
+    walks the part of the structure tree, which is in memory, so it costs
+    as much, as the memory it measures. Call :meth:`sample` for the final
+    numbers before closing the document.
+    """
+
+    def __init__(self, pdf_doc: _PdfDocument, every: int = 1):
+        self.pdf_doc = pdf_doc
+        self.every = every
+        self.history: list[StructureTreeStats] = []
+        self.peak: StructureTreeStats | None = None
+        self._first_unflushed_page = 1
+        self._handler = _StartPageHandler(self)
+        pdf_doc.AddEventHandler(_PdfDocumentEvent.START_PAGE, self._handler)
+
+    def sample(self) -> StructureTreeStats:
+        """Take the statistics now and return them."""
+        pdf_doc = self.pdf_doc
+        page_count = pdf_doc.GetNumberOfPages()
+        # Pages are mostly flushed in order, so there is no need to look at
+        # the flushed ones at the start again and again
+        first = self._first_unflushed_page
+        while first <= page_count and pdf_doc.GetPage(first).IsFlushed():
+            first += 1
+        self._first_unflushed_page = first
+        pages_in_memory = sum(1 for i in range(first, page_count + 1) if not pdf_doc.GetPage(i).IsFlushed())
+        stats = StructureTreeStats(page_count, pages_in_memory, *_count_structure_in_memory(pdf_doc))
+        self.history.append(stats)
+        if self.peak is None or stats.elements_in_memory > self.peak.elements_in_memory:
+            self.peak = stats
+        return stats
+
+    def close(self) -> None:
+        """Stop taking the statistics on new pages."""
+        self.pdf_doc.RemoveEventHandler(_PdfDocumentEvent.START_PAGE, self._handler)
+
+    def _on_start_page(self) -> None:
+        if self.every > 0 and self.pdf_doc.GetNumberOfPages() % self.every == 0:
+            self.sample()
@@ -0,0 +1,281 @@
+"""
+This module contains helpers to avoid repeating the same revocation work.
+"""
+import hashlib as _hashlib
+import os as _os
+import struct as _struct
+import tempfile as _tempfile
+import threading as _threading
+import time as _time
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import Future as _Future
+from typing import Any as _Any, Callable as _Callable
+
+from System import Array as _Array, ArgumentException as _ArgumentException, Byte as _Byte, \
+    DateTime as _DateTime, DateTimeKind as _DateTimeKind, FormatException as _FormatException, \
+    InvalidCastException as _InvalidCastException, InvalidOperationException as _InvalidOperationException
+from System.Collections.Generic import List as _List
+from System.IO import IOException as _IOException
+from iText.Bouncycastleconnector import BouncyCastleFactoryCreator as _BouncyCastleFactoryCreator
+from iText.Commons.Bouncycastle.Cert import IX509Certificate as _IX509Certificate
+from iText.Signatures import CertificateUtil as _CertificateUtil, ICrlClient as _ICrlClient, \
+    IOcspClient as _IOcspClient
+from Org.BouncyCastle.Security import GeneralSecurityException as _GeneralSecurityException
+
+from .util import bytes_to_clr as _bytes_to_clr, clr_to_bytes as _clr_to_bytes
+
+_FACTORY = _BouncyCastleFactoryCreator.GetFactory()
+_EPOCH = _DateTime(1970, 1, 1, 0, 0, 0, _DateTimeKind.Utc)
+# Responses, which claim to be valid for longer, than this, are considered to
+# have no next update time at all
+_MAX_VALIDITY = 10 * 365 * 24 * 3600
+# Errors, which parsers raise for data, which is not a valid response or CRL:
+# malformed ASN.1, unexpected structures and broken CRLs
+_PARSE_ERRORS = (_IOException, _ArgumentException, _FormatException, _InvalidCastException,
+                 _InvalidOperationException, _GeneralSecurityException)
+
+DEFAULT_MAX_AGE: float = 3600.0
+"""Default time in seconds, for which revocation data is cached at most."""
+
+
+def _to_timestamp(date_time: _DateTime) -> float:
+    return (date_time.ToUniversalTime() - _EPOCH).TotalSeconds
+
+
+def _expiry(this_updates: list[_DateTime], next_updates: list[_DateTime], max_age: float) -> float:
+    now = _time.time()
+    expires_at = now + max_age
+    for this_update, next_update in zip(this_updates, next_updates):
+        this_update = _to_timestamp(this_update)
+        next_update = _to_timestamp(next_update)
+        if next_update <= this_update or next_update - this_update > _MAX_VALIDITY:
+            # No next update, so only the max age applies
+            continue
+        expires_at = min(expires_at, next_update)
+    return expires_at
+
+
+class RevocationCache:
+    """Thread-safe cache for revocation data, which expires together with that data.
+
+    Every entry expires at the earliest of the next update times of the
+    cached responses, but no later than ``max_age`` seconds after it was
+    added. Data, which is already stale, is not cached at all.
+
+    Entries are kept in memory and the least recently used ones are evicted,
+    when there are more than ``max_entries`` of them. If ``directory`` is
+    provided, then entries are also stored there as files, so they survive
+    process restarts and can be shared between processes.
+
+    Concurrent requests for the same key are coalesced: only the first one
+    actually loads the data, and the rest wait for its result.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 directory: str | _os.PathLike | None = None,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.max_entries = max_entries
+        self.directory = _os.fspath(directory) if directory is not None else None
+        self.max_age = max_age
+        self._lock = _threading.Lock()
+        self._entries: _OrderedDict[str, tuple[float, list[bytes]]] = _OrderedDict()
+        self._loading: dict[str, _Future] = {}
+        if self.directory is not None:
+            _os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str, load: _Callable[[], tuple[list[bytes], float] | None]) -> list[bytes] | None:
+        """Return the cached data for the key or load it, if there is none.
+
+        ``load`` returns the data together with the time, when it expires, as
+        a timestamp, or None, if there is no data. None is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > _time.time():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+            future = self._loading.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = _Future()
+                self._loading[key] = future
+        if not is_owner:
+            return future.result()
+
+        try:
+            entry = self._read_file(key)
+            if entry is None:
+                loaded = load()
+                if loaded is not None:
+                    data, expires_at = loaded
+                    entry = (min(expires_at, _time.time() + self.max_age), data)
+                    self._write_file(key, entry)
+            if entry is not None and entry[0] > _time.time():
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            result = entry[1] if entry is not None else None
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    def clear(self) -> None:
+        """Remove all the entries from memory. Files are left in place."""
+        with self._lock:
+            self._entries.clear()
+
+    def _file_path(self, key: str) -> str:
+        return _os.path.join(self.directory, _hashlib.sha256(key.encode('utf-8')).hexdigest() + '.bin')
+
+    def _read_file(self, key: str) -> tuple[float, list[bytes]] | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._file_path(key), 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        # Format is the expiry timestamp followed by length-prefixed items
+        try:
+            (expires_at,) = _struct.unpack_from('<d', content)
+            data = []
+            pos = 8
+            while pos < len(content):
+                (length,) = _struct.unpack_from('<I', content, pos)
+                pos += 4
+                if pos + length > len(content):
+                    return None
+                data.append(content[pos:pos + length])
+                pos += length
+        except _struct.error:
+            # Broken files are just reloaded
+            return None
+        if expires_at <= _time.time():
+            return None
+        return expires_at, data
+
+    def _write_file(self, key: str, entry: tuple[float, list[bytes]]) -> None:
+        if self.directory is None or entry[0] <= _time.time():
+            return
+        expires_at, data = entry
+        parts = [_struct.pack('<d', expires_at)]
+        for item in data:
+            parts.append(_struct.pack('<I', len(item)))
+            parts.append(item)
+        # Write and rename, so that other processes never see partial files
+        fd, temp_path = _tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with _os.fdopen(fd, 'wb') as file:
+                file.write(b''.join(parts))
+            _os.replace(temp_path, self._file_path(key))
+        except BaseException:
+            _os.unlink(temp_path)
+            raise
+
+
+def _ocsp_expiry(response: bytes, max_age: float) -> float:
+    basic_response = _FACTORY.CreateBasicOCSPResponse(_FACTORY.CreateASN1Primitive(_bytes_to_clr(response)))
+    single_responses = list(basic_response.GetResponses())
+    if not single_responses:
+        return _time.time()
+    return _expiry([r.GetThisUpdate() for r in single_responses],
+                   [r.GetNextUpdate() for r in single_responses],
+                   max_age)
+
+
+def _crl_expiry(crls: list[bytes], max_age: float) -> float:
+    parsed = [_CertificateUtil.ParseCrlFromBytes(_bytes_to_clr(crl)) for crl in crls]
+    return _expiry([crl.GetThisUpdate() for crl in parsed],
+                   [crl.GetNextUpdate() for crl in parsed],
+                   max_age)
+
+
+class CachingOcspClient(_IOcspClient):
+    """OCSP client, which caches responses of another client.
+
+    Responses are cached per issuer and serial number of the checked
+    certificate, until their next update time. Since a cached response is
+    returned for many requests, nonces cannot be verified for them.
+    """
+
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Revocation"
+
+    def __init__(self, client: _IOcspClient, cache: RevocationCache | None = None):
+        self.client = client
+        self.cache = cache if cache is not None else RevocationCache()
+
+    def GetEncoded(self, check_cert: _IX509Certificate, issuer_cert: _IX509Certificate, url: str | None) -> _Any:
+        key = f'ocsp:{check_cert.GetIssuerDN()}:{check_cert.GetSerialNumber()}'
+
+        def load() -> tuple[list[bytes], float] | None:
+            encoded = self.client.GetEncoded(check_cert, issuer_cert, url)
+            if encoded is None:
+                return None
+            response = _clr_to_bytes(encoded)
+            try:
+                expires_at = _ocsp_expiry(response, self.cache.max_age)
+            except _PARSE_ERRORS:
+                # Unknown data is returned as is, but never cached
+                expires_at = 0.0
+            return [response], expires_at
+
+        data = self.cache.get(key, load)
+        return _bytes_to_clr(data[0]) if data else None
+
+
+class CachingCrlClient(_ICrlClient):
+    """CRL client, which caches CRLs of another client.
+
+    CRLs are cached per URL, until the earliest next update time of them.
+    If no URL is provided, then the distribution points of the checked
+    certificate are used instead.
+    """
+
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Revocation"
+
+    def __init__(self, client: _ICrlClient, cache: RevocationCache | None = None):
+        self.client = client
+        self.cache = cache if cache is not None else RevocationCache()
+
+    def GetEncoded(self, check_cert: _IX509Certificate, url: str | None) -> _Any:
+        if url:
+            key = f'crl:{url}'
+        else:
+            urls = sorted(_CertificateUtil.GetCRLURLs(check_cert))
+            key = f'crl:{" ".join(urls)}' if urls else f'crl-issuer:{check_cert.GetIssuerDN()}'
+
+        def load() -> tuple[list[bytes], float] | None:
+            encoded = self.client.GetEncoded(check_cert, url)
+            if encoded is None:
+                return None
+            crls = [_clr_to_bytes(crl) for crl in encoded]
+            if not crls:
+                return None
+            try:
+                expires_at = _crl_expiry(crls, self.cache.max_age)
+            except _PARSE_ERRORS:
+                # Unknown data is returned as is, but never cached
+                expires_at = 0.0
+            return crls, expires_at
+
+        data = self.cache.get(key, load)
+        if not data:
+            return None
+        result = _List[_Array[_Byte]]()
+        for crl in data:
+            result.Add(_bytes_to_clr(crl))
+        return result
@@ -0,0 +1,477 @@
+"""
+This module contains helpers for signing PDF documents in bulk.
+"""
+import asyncio as _asyncio
+import os as _os
+from concurrent.futures import Future as _Future, ThreadPoolExecutor as _ThreadPoolExecutor
+from typing import Any as _Any, Callable as _Callable, Iterable as _Iterable, Iterator as _Iterator, \
+    NamedTuple as _NamedTuple, Sequence as _Sequence
+
+from System import Array as _Array, Byte as _Byte
+from System.Collections.Generic import List as _List
+from System.IO import FileMode as _FileMode, FileStream as _FileStream, Stream as _Stream
+from iText.Bouncycastleconnector import BouncyCastleFactoryCreator as _BouncyCastleFactoryCreator
+from iText.Commons.Bouncycastle.Cert import IX509Certificate as _IX509Certificate
+from iText.Kernel.Crypto import DigestAlgorithms as _DigestAlgorithms
+from iText.Kernel.Pdf import PdfDictionary as _PdfDictionary, PdfDocument as _PdfDocument, PdfName as _PdfName, \
+    StampingProperties as _StampingProperties
+from iText.Signatures import ICrlClient as _ICrlClient, IExternalSignature as _IExternalSignature, \
+    IExternalSignatureContainer as _IExternalSignatureContainer, IOcspClient as _IOcspClient, \
+    ITSAClient as _ITSAClient, OcspClientBouncyCastle as _OcspClientBouncyCastle, PdfPKCS7 as _PdfPKCS7, \
+    PdfSigner as _PdfSigner, PrivateKeySignature as _PrivateKeySignature, SignerProperties as _SignerProperties
+
+from .io import open_reader as _open_reader, render_to_bytes as _render_to_bytes
+from .keystore import read_pkcs12 as _read_pkcs12
+from .util import _ordered_parallel_map, bytes_to_clr as _bytes_to_clr, clr_to_bytes as _clr_to_bytes, \
+    disposing as _disposing
+
+
+def _render_to(dest: str | _os.PathLike | None, render: _Callable[[_Stream], None]) -> bytes | None:
+    if dest is None:
+        return _render_to_bytes(render)
+    with _disposing(_FileStream(_os.fspath(dest), _FileMode.Create)) as out_stream:
+        render(out_stream)
+    return None
+
+
+def _load_pkcs12(path: str | _os.PathLike, password: str,
+                 digest_algorithm: str) -> tuple[_PrivateKeySignature, list[_IX509Certificate]]:
+    entry = _read_pkcs12(path, password)
+    return _PrivateKeySignature(entry.private_key, digest_algorithm), list(entry.chain)
+
+
+def _estimate_size(crl_bytes_size: int, ocsp_client: _IOcspClient | None, tsa_client: _ITSAClient | None) -> int:
+    # This is the same estimation, which PdfSigner does for each document,
+    # when no size is provided
+    estimated_size = 8192 + crl_bytes_size
+    if ocsp_client is not None:
+        estimated_size += 4192
+    if tsa_client is not None:
+        estimated_size += tsa_client.GetTokenSizeEstimate() + 96
+    return estimated_size
+
+
+def _get_crls(chain: _Sequence[_IX509Certificate], crl_clients: _Iterable[_ICrlClient]) -> tuple[_Any, int]:
+    """Return a .NET list with the CRLs and their size, as PdfSigner accounts for it in the signature size.
+
+    Same as PdfSigner does, the CRLs are taken from all the clients for the
+    first certificate of the chain, for which any of them returns some.
+    """
+    crl_clients = list(crl_clients)
+    for cert in chain:
+        result = _List[_Array[_Byte]]()
+        for crl_client in crl_clients:
+            if crl_client is None:
+                continue
+            crls = crl_client.GetEncoded(cert, None)
+            if crls is not None:
+                for crl in crls:
+                    result.Add(crl)
+        if result.Count > 0:
+            return result, sum(crl.Length + 10 for crl in result)
+    return None, 0
+
+
+class _SigningSetup:
+    """Key material and revocation data, which are the same for all the documents of a batch."""
+
+    def __init__(self,
+                 chain: _Iterable[_IX509Certificate],
+                 crl_clients: _Iterable[_ICrlClient] | None,
+                 ocsp_client: _IOcspClient | None,
+                 tsa_client: _ITSAClient | None,
+                 estimated_size: int):
+        chain = list(chain)
+        self.chain = _Array[_IX509Certificate](chain)
+        self.crls = None
+        crl_bytes_size = 0
+        if crl_clients is not None:
+            self.crls, crl_bytes_size = _get_crls(chain, crl_clients)
+        self.ocsp_client = ocsp_client
+        self.tsa_client = tsa_client
+        self.estimated_size = estimated_size or _estimate_size(crl_bytes_size, ocsp_client, tsa_client)
+
+    def get_ocsp_responses(self) -> _Any:
+        """Return a .NET list with the OCSP responses for a single document, or None if there are none.
+
+        Same as PdfSigner does, every certificate of the chain is checked
+        against its issuer and only the good responses are kept. Responses
+        are requested from the client every time, so that they don't go
+        stale in long-running signers.
+        """
+        if self.ocsp_client is None or self.chain.Length < 2:
+            return None
+        good = _BouncyCastleFactoryCreator.GetFactory().CreateCertificateStatus().GetGood()
+        result = _List[_Array[_Byte]]()
+        for i in range(self.chain.Length - 1):
+            response = self.ocsp_client.GetEncoded(self.chain[i], self.chain[i + 1], None)
+            if response is not None and good.Equals(_OcspClientBouncyCastle.GetCertificateStatus(response)):
+                result.Add(response)
+        return result if result.Count > 0 else None
+
+    def create_pkcs7(self, digest_algorithm: str, digest: _Any,
+                     crypto_standard: _PdfSigner.CryptoStandard) -> tuple[_PdfPKCS7, _Any, _Any]:
+        """Return a new container for the document digest together with the attributes to sign and OCSP responses.
+
+        The same OCSP responses must be passed to :meth:`encode_pkcs7`, as
+        the attributes cover them.
+        """
+        pkcs7 = _PdfPKCS7(None, self.chain, digest_algorithm, False)
+        ocsp = self.get_ocsp_responses()
+        return pkcs7, pkcs7.GetAuthenticatedAttributeBytes(digest, crypto_standard, ocsp, self.crls), ocsp
+
+    def encode_pkcs7(self, pkcs7: _PdfPKCS7, digest: _Any, ocsp: _Any, signature_value: _Any,
+                     signature_algorithm: str, crypto_standard: _PdfSigner.CryptoStandard,
+                     mechanism_parameters: _Any = None) -> _Any:
+        """Return the encoded container with the signature of the attributes."""
+        pkcs7.SetExternalSignatureValue(signature_value, None, signature_algorithm, mechanism_parameters)
+        return pkcs7.GetEncodedPKCS7(digest, crypto_standard, self.tsa_client, ocsp, self.crls)
+
+
+class _BatchSignatureContainer(_IExternalSignatureContainer):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Signing"
+
+    def __init__(self, signer: 'BatchSigner'):
+        self.signer = signer
+
+    def Sign(self, data: _Stream) -> _Any:
+        signer = self.signer
+        signature = signer.signature
+        digest = _DigestAlgorithms.Digest(data, signer.digest_algorithm)
+        pkcs7, attributes, ocsp = signer.setup.create_pkcs7(signer.digest_algorithm, digest,
+                                                            signer.crypto_standard)
+        return signer.setup.encode_pkcs7(pkcs7, digest, ocsp, signature.Sign(attributes),
+                                         signature.GetSignatureAlgorithmName(), signer.crypto_standard,
+                                         signature.GetSignatureMechanismParameters())
+
+    def ModifySigningDictionary(self, signature_dictionary: _PdfDictionary) -> None:
+        signature_dictionary.Put(_PdfName.Filter, _PdfName.Adobe_PPKLite)
+        if self.signer.crypto_standard == _PdfSigner.CryptoStandard.CADES:
+            signature_dictionary.Put(_PdfName.SubFilter, _PdfName.ETSI_CAdES_DETACHED)
+        else:
+            signature_dictionary.Put(_PdfName.SubFilter, _PdfName.Adbe_pkcs7_detached)
+
+
+class BatchSigner:
+    """Signer, which signs many documents with the same key material.
+
+    Everything, which is the same for all the documents, is prepared only
+    once: the certificate chain is converted to a .NET array, CRLs are
+    fetched and the size of the signature container is estimated. Documents are then signed through an external
+    signature container, which builds the CMS signer info from these, so
+    for each document only the document digest, the signed attributes over
+    it and the private key operation remain. Signed attributes include the
+    document digest, so they cannot be shared between documents.
+
+    Documents are signed in a thread pool. Digesting and signing run in .NET
+    with the GIL released, so documents are actually processed in parallel.
+
+    CRLs are a snapshot taken, when the signer is created. For long-running
+    services recreate the signer periodically. OCSP responses expire much
+    sooner, so the OCSP client is queried for each document, as PdfSigner
+    does. Use :class:`itextpy.revocation.CachingOcspClient` to reuse the
+    responses until they expire. The TSA client is queried for each
+    document as well, as time stamps cover the signature of the document.
+    """
+
+    def __init__(self,
+                 signature: _IExternalSignature,
+                 chain: _Iterable[_IX509Certificate],
+                 crl_clients: _Iterable[_ICrlClient] | None = None,
+                 ocsp_client: _IOcspClient | None = None,
+                 tsa_client: _ITSAClient | None = None,
+                 estimated_size: int = 0,
+                 crypto_standard: _PdfSigner.CryptoStandard = _PdfSigner.CryptoStandard.CMS,
+                 properties_factory: _Callable[[], _SignerProperties] = _SignerProperties,
+                 max_workers: int | None = None):
+        """Create a signer. Arguments are the same as for ``PdfSigner.SignDetached``.
+
+        ``properties_factory`` is called for each document, which is signed
+        without explicit signer properties. A new instance is needed every
+        time, as ``PdfSigner`` modifies it.
+        """
+        self.signature = signature
+        self.digest_algorithm = signature.GetDigestAlgorithmName()
+        self.setup = _SigningSetup(chain, crl_clients, ocsp_client, tsa_client, estimated_size)
+        self.crypto_standard = crypto_standard
+        self.properties_factory = properties_factory
+        self.max_workers = max_workers if max_workers is not None else (_os.cpu_count() or 1)
+        # Container is stateless, so all the documents share it
+        self._container = _BatchSignatureContainer(self)
+        self._executor = _ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='itextpy-signing')
+
+    @classmethod
+    def from_pkcs12(cls,
+                    path: str | _os.PathLike,
+                    password: str,
+                    digest_algorithm: str = _DigestAlgorithms.SHA512,
+                    **kwargs: _Any) -> 'BatchSigner':
+        """Create a signer with the first private key and its chain from a PKCS#12 file.
+
+        The file is parsed only once per process, see
+        :func:`itextpy.keystore.read_pkcs12`. ``ValueError`` is raised, if
+        it has no private key. The rest of the arguments are passed to the
+        constructor as is.
+        """
+        signature, chain = _load_pkcs12(path, password, digest_algorithm)
+        return cls(signature, chain, **kwargs)
+
+    def sign_to_stream(self, source: _Any, out_stream: _Stream,
+                       signer_properties: _SignerProperties | None = None) -> None:
+        """Sign the document and write the result into the .NET stream in the calling thread.
+
+        ``source`` is either a path to the PDF document or a buffer-protocol
+        object with its contents. The stream is closed afterward, as
+        ``PdfSigner`` does that.
+        """
+        with _disposing(_open_reader(source)) as reader:
+            pdf_signer = _PdfSigner(reader, out_stream, _StampingProperties())
+            pdf_signer.SetSignerProperties(
+                signer_properties if signer_properties is not None else self.properties_factory())
+            pdf_signer.SignExternalContainer(self._container, self.setup.estimated_size)
+
+    def sign(self, source: _Any, dest: str | _os.PathLike | None = None,
+             signer_properties: _SignerProperties | None = None) -> bytes | None:
+        """Sign the document in the calling thread.
+
+        If ``dest`` is None, then the signed document is returned as bytes.
+        Otherwise, it is written to the file at the ``dest`` path.
+        """
+        return _render_to(dest, lambda stream: self.sign_to_stream(source, stream, signer_properties))
+
+    def submit(self, source: _Any, dest: str | _os.PathLike | None = None,
+               signer_properties: _SignerProperties | None = None) -> _Future:
+        """Schedule the document for signing in the thread pool and return its future.
+
+        The future result is the same, as the result of :meth:`sign`.
+        """
+        return self._executor.submit(self.sign, source, dest, signer_properties)
+
+    async def sign_async(self, source: _Any, dest: str | _os.PathLike | None = None,
+                         signer_properties: _SignerProperties | None = None) -> bytes | None:
+        """Sign the document in the thread pool without blocking the event loop."""
+        return await _asyncio.wrap_future(self.submit(source, dest, signer_properties))
+
+    def sign_many(self, jobs: _Iterable[tuple[_Any, str | _os.PathLike | None]]) -> _Iterator[bytes | None]:
+        """Sign documents in parallel and yield results in the order of the jobs.
+
+        Each job is a ``(source, dest)`` pair with the same meaning, as in
+        :meth:`sign`. Only a limited number of documents is scheduled ahead of
+        the consumer, so that huge batches don't end up in memory all at once.
+        """
+        return _ordered_parallel_map(lambda job: self.sign(*job), jobs, self.max_workers, 'signing',
+                                     self._executor)
+
+    def close(self) -> None:
+        """Wait for the scheduled documents to be signed and release the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'BatchSigner':
+        return self
+
+    def __exit__(self, *args: _Any) -> None:
+        self.close()
+
+
+class PreparedDocument(_NamedTuple):
+    """Document with an empty signature container, which awaits its deferred signature.
+
+    Everything here is plain Python data, so it can be stored and the second
+    phase of signing can happen later or in a different process.
+    """
+    data: _Any
+    """Path to the prepared document or bytes with its contents."""
+    field_name: str
+    """Name of the signature field, which awaits the signature."""
+    digest: bytes
+    """Digest of the signed byte range of the document."""
+
+
+class _DigestCapturingContainer(_IExternalSignatureContainer):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Signing"
+
+    def __init__(self, digest_algorithm: str):
+        self.digest_algorithm = digest_algorithm
+        self.digest = None
+
+    def Sign(self, data: _Stream) -> _Any:
+        self.digest = _DigestAlgorithms.Digest(data, self.digest_algorithm)
+        # Space is reserved, but the container stays empty for now
+        return _bytes_to_clr(b'')
+
+    def ModifySigningDictionary(self, signature_dictionary: _PdfDictionary) -> None:
+        signature_dictionary.Put(_PdfName.Filter, _PdfName.Adobe_PPKLite)
+        signature_dictionary.Put(_PdfName.SubFilter, _PdfName.Adbe_pkcs7_detached)
+
+
+class _EncodedContainer(_IExternalSignatureContainer):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "ItextPy.Signing"
+
+    def __init__(self, encoded: _Any):
+        self.encoded = encoded
+
+    def Sign(self, data: _Stream) -> _Any:
+        return self.encoded
+
+    def ModifySigningDictionary(self, signature_dictionary: _PdfDictionary) -> None:
+        pass
+
+
+class ExternalSignatureBatch:
+    """Batch signature, which signs messages one by one with an ``IExternalSignature``.
+
+    A batch signature for :class:`DeferredSigner` is any object with
+    ``digest_algorithm`` and ``signature_algorithm`` attributes, named the
+    same way as in ``IExternalSignature``, and with a ``sign_batch`` method,
+    which takes a list of messages as bytes and returns a list of their
+    signatures in the same order. Implement your own to sign the whole batch
+    in a single round-trip to an HSM or a remote signing service.
+
+    This one is the simplest implementation, which wraps anything, that
+    already works with ``PdfSigner``, like ``PrivateKeySignature``.
+    """
+
+    def __init__(self, signature: _IExternalSignature):
+        self.signature = signature
+        self.digest_algorithm = signature.GetDigestAlgorithmName()
+        self.signature_algorithm = signature.GetSignatureAlgorithmName()
+
+    def sign_batch(self, messages: list[bytes]) -> list[bytes]:
+        return [_clr_to_bytes(self.signature.Sign(_bytes_to_clr(message))) for message in messages]
+
+
+class DeferredSigner:
+    """Signer, which signs documents in two phases to sign many documents at once.
+
+    In the first phase, :meth:`prepare` writes each document with an empty
+    signature container and remembers the digest of its byte range. In the
+    second phase, :meth:`finish` creates the signed attributes for all the
+    prepared documents, signs them all with a single ``sign_batch`` call and
+    injects the resulting CMS containers into the documents.
+
+    CRLs are only collected once per batch, as they are the same for all the
+    documents. OCSP responses and time stamps, if the clients are provided,
+    are still requested for each document. Both phases process documents in
+    a thread pool, in the same way :class:`BatchSigner` does.
+    """
+
+    def __init__(self,
+                 batch_signature: _Any,
+                 chain: _Iterable[_IX509Certificate],
+                 crl_clients: _Iterable[_ICrlClient] | None = None,
+                 ocsp_client: _IOcspClient | None = None,
+                 tsa_client: _ITSAClient | None = None,
+                 estimated_size: int = 0,
+                 properties_factory: _Callable[[], _SignerProperties] = _SignerProperties,
+                 max_workers: int | None = None):
+        """Create a signer. See :class:`ExternalSignatureBatch` for what ``batch_signature`` is.
+
+        The rest of the arguments have the same meaning, as for
+        :class:`BatchSigner`.
+        """
+        self.batch_signature = batch_signature
+        self.setup = _SigningSetup(chain, crl_clients, ocsp_client, tsa_client, estimated_size)
+        self.properties_factory = properties_factory
+        self.max_workers = max_workers if max_workers is not None else (_os.cpu_count() or 1)
+        self._executor = _ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='itextpy-signing')
+
+    @classmethod
+    def from_pkcs12(cls,
+                    path: str | _os.PathLike,
+                    password: str,
+                    digest_algorithm: str = _DigestAlgorithms.SHA512,
+                    **kwargs: _Any) -> 'DeferredSigner':
+        """Create a signer with the first private key and its chain from a PKCS#12 file.
+
+        This is mostly useful as a stand-in for an HSM. ``ValueError`` is
+        raised, if the file has no private key. The rest of the arguments are
+        passed to the constructor as is.
+        """
+        signature, chain = _load_pkcs12(path, password, digest_algorithm)
+        return cls(ExternalSignatureBatch(signature), chain, **kwargs)
+
+    def prepare(self, source: _Any, dest: str | _os.PathLike | None = None,
+                signer_properties: _SignerProperties | None = None) -> PreparedDocument:
+        """Prepare the document for signing with an empty signature container.
+
+        ``source`` is either a path to the PDF document or a buffer-protocol
+        object with its contents. If ``dest`` is None, then the prepared
+        document is kept in memory. Otherwise, it is written to the file at
+        the ``dest`` path.
+        """
+        container = _DigestCapturingContainer(self.batch_signature.digest_algorithm)
+        field_names = []
+
+        def render(out_stream: _Stream) -> None:
+            with _disposing(_open_reader(source)) as reader:
+                pdf_signer = _PdfSigner(reader, out_stream, _StampingProperties())
+                pdf_signer.SetSignerProperties(
+                    signer_properties if signer_properties is not None else self.properties_factory())
+                pdf_signer.SignExternalContainer(container, self.setup.estimated_size)
+                field_names.append(pdf_signer.GetFieldName())
+
+        data = _render_to(dest, render)
+        return PreparedDocument(data if dest is None else _os.fspath(dest),
+                                field_names[0], _clr_to_bytes(container.digest))
+
+    def prepare_many(self, jobs: _Iterable[tuple[_Any, str | _os.PathLike | None]]) -> list[PreparedDocument]:
+        """Prepare documents in parallel. Each job is a ``(source, dest)`` pair, as in :meth:`prepare`."""
+        return list(self._executor.map(lambda job: self.prepare(*job), jobs))
+
+    def finish(self, prepared: _Sequence[PreparedDocument],
+               dests: _Sequence[str | _os.PathLike | None] | None = None) -> list[bytes | None]:
+        """Sign all the prepared documents at once and return the results in the same order.
+
+        If ``dests`` is omitted or the destination for a document is None,
+        then the signed document is returned as bytes. Otherwise, it is
+        written to the file at the destination path.
+        """
+        if dests is None:
+            dests = [None] * len(prepared)
+        if len(dests) != len(prepared):
+            raise ValueError('number of destinations does not match number of documents')
+        setup = self.setup
+
+        def create_pkcs7(document: PreparedDocument) -> tuple[_PdfPKCS7, _Any, _Any, bytes]:
+            digest = _bytes_to_clr(document.digest)
+            pkcs7, attributes, ocsp = setup.create_pkcs7(self.batch_signature.digest_algorithm, digest,
+                                                         _PdfSigner.CryptoStandard.CMS)
+            return pkcs7, digest, ocsp, _clr_to_bytes(attributes)
+
+        signing_data = list(self._executor.map(create_pkcs7, prepared))
+        signatures = self.batch_signature.sign_batch([attributes for _, _, _, attributes in signing_data])
+        if len(signatures) != len(prepared):
+            raise ValueError('number of signatures does not match number of documents')
+
+        def inject(document: PreparedDocument, dest: str | _os.PathLike | None,
+                   pkcs7: _PdfPKCS7, digest: _Any, ocsp: _Any, signature: bytes) -> bytes | None:
+            encoded = setup.encode_pkcs7(pkcs7, digest, ocsp, _bytes_to_clr(signature),
+                                         self.batch_signature.signature_algorithm, _PdfSigner.CryptoStandard.CMS)
+
+            def render(out_stream: _Stream) -> None:
+                with _disposing(_PdfDocument(_open_reader(document.data))) as pdf_doc:
+                    _PdfSigner.SignDeferred(pdf_doc, document.field_name, out_stream, _EncodedContainer(encoded))
+
+            return _render_to(dest, render)
+
+        return list(self._executor.map(
+            lambda args: inject(*args),
+            ((document, dest, pkcs7, digest, ocsp, signature)
+             for document, dest, (pkcs7, digest, ocsp, _), signature in zip(prepared, dests, signing_data, signatures))
+        ))
+
+    def close(self) -> None:
+        """Wait for the scheduled work to complete and release the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'DeferredSigner':
+        return self
+
+    def __exit__(self, *args: _Any) -> None:
+        self.close()
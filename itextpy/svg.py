@@ -0,0 +1,355 @@
+"""
+This module contains helpers for converting SVG images in bulk and drawing
+the same SVG images many times.
+"""
+import hashlib as _hashlib
+import os as _os
+import threading as _threading
+import time as _time
+from collections import OrderedDict as _OrderedDict
+from typing import Any as _Any, Callable as _Callable, Iterable as _Iterable, Iterator as _Iterator, \
+    NamedTuple as _NamedTuple
+
+from System.IO import FileAccess as _FileAccess, FileMode as _FileMode, FileStream as _FileStream
+from iText.Kernel.Geom import Rectangle as _Rectangle
+from iText.Kernel.Pdf import PdfDocument as _PdfDocument, PdfPage as _PdfPage, PdfWriter as _PdfWriter, \
+    WriterProperties as _WriterProperties
+from iText.Kernel.Pdf.Canvas import PdfCanvas as _PdfCanvas
+from iText.Kernel.Pdf.Xobject import PdfFormXObject as _PdfFormXObject
+from iText.Layout.Element import Image as _Image
+from iText.StyledXmlParser.Resolver.Resource import ResourceResolver as _ResourceResolver
+from iText.Svg.Converter import SvgConverter as _SvgConverter
+from iText.Svg.Processors import ISvgConverterProperties as _ISvgConverterProperties, \
+    ISvgProcessorResult as _ISvgProcessorResult
+from iText.Svg.Processors.Impl import SvgConverterProperties as _SvgConverterProperties, \
+    SvgProcessorResult as _SvgProcessorResult
+from iText.Svg.Renderers import SvgDrawContext as _SvgDrawContext
+
+from .io import open_bytes as _open_bytes, render_to_bytes as _render_to_bytes
+from .util import _ordered_parallel_map, _per_thread, bytes_to_clr_stream as _bytes_to_clr_stream, \
+    clr_try_cast as _clr_try_cast, disposing as _disposing
+
+
+def _read_source(source: _Any) -> _Any:
+    if isinstance(source, (str, _os.PathLike)):
+        with open(source, 'rb') as file:
+            return file.read()
+    return source
+
+
+class SvgTemplate:
+    """SVG image, which is parsed and processed once and can be drawn into any document.
+
+    ``SvgConverter`` methods parse the SVG, resolve styles and build the
+    renderer tree on every call. A template keeps the processed renderer
+    tree instead, so drawing it again only costs the drawing itself.
+
+    Templates can be shared between threads. Renderers are not meant to be
+    drawn concurrently, so drawing is done one document at a time.
+    """
+
+    def __init__(self, key: str, result: _ISvgProcessorResult, properties: _ISvgConverterProperties):
+        self.key = key
+        self.result = result
+        self.properties = properties
+        processor_result = _clr_try_cast(result, _SvgProcessorResult)
+        if processor_result is not None:
+            # Same as SvgConverter does, resources and styles are resolved
+            # with the state collected during processing
+            processor_context = processor_result.GetContext()
+            self._resource_resolver = processor_context.GetResourceResolver()
+            self._css_context = processor_context.GetCssContext()
+        else:
+            self._resource_resolver = _ResourceResolver(properties.GetBaseUri(), properties.GetResourceRetriever())
+            self._css_context = None
+        self._lock = _threading.Lock()
+
+    @classmethod
+    def from_bytes(cls, data: _Any, properties: _ISvgConverterProperties | None = None) -> 'SvgTemplate':
+        """Return a template for SVG contents stored in a buffer-protocol object."""
+        if properties is None:
+            properties = _SvgConverterProperties()
+        key = _hashlib.sha256(data).hexdigest()
+        with _disposing(_bytes_to_clr_stream(data)) as stream:
+            node = _SvgConverter.Parse(stream, properties)
+        return cls(key, _SvgConverter.Process(node, properties), properties)
+
+    @classmethod
+    def from_file(cls, path: str | _os.PathLike, properties: _ISvgConverterProperties | None = None) -> 'SvgTemplate':
+        """Return a template for an SVG file."""
+        return cls.from_bytes(_read_source(path), properties)
+
+    def create_xobject(self, pdf_doc: _PdfDocument) -> _PdfFormXObject:
+        """Return a new form XObject with the image for the document.
+
+        This is the same, as ``SvgConverter.ConvertToXObject`` returns, but
+        without parsing and processing the SVG again. Use
+        :class:`SvgDocumentCache` to get a single XObject per document.
+        """
+        context = _SvgDrawContext(self._resource_resolver, self.result.GetFontProvider())
+        if self._css_context is not None:
+            context.SetCssContext(self._css_context)
+        context.AddNamedObjects(self.result.GetNamedObjects())
+        with self._lock:
+            # Renderers keep some state after drawing, so every document gets
+            # a fresh copy of the tree, which is much cheaper than processing
+            root = self.result.GetRootRenderer().CreateDeepCopy()
+            return _SvgConverter.ConvertToXObject(root, pdf_doc, context)
+
+
+class SvgTemplateCache:
+    """Thread-safe cache of SVG templates keyed by the hash of the SVG contents.
+
+    Sources are either paths to SVG files or buffer-protocol objects with
+    the contents. Files are read on every lookup, so changed files are picked
+    up, but the same contents are only processed once, even under different
+    names. All the templates are processed with the same ``properties``.
+
+    The least recently used templates are evicted, when there are more than
+    ``max_entries`` of them.
+    """
+
+    def __init__(self, properties: _ISvgConverterProperties | None = None, max_entries: int = 256):
+        self.properties = properties if properties is not None else _SvgConverterProperties()
+        self.max_entries = max_entries
+        self._lock = _threading.Lock()
+        self._entries: _OrderedDict[str, SvgTemplate] = _OrderedDict()
+
+    def get(self, source: _Any) -> SvgTemplate:
+        """Return the template for the source, processing it on the first use."""
+        data = _read_source(source)
+        key = _hashlib.sha256(data).hexdigest()
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None:
+                self._entries.move_to_end(key)
+                return template
+        # Processing the same contents twice in a race is harmless
+        template = SvgTemplate.from_bytes(data, self.properties)
+        with self._lock:
+            template = self._entries.setdefault(key, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return template
+
+    def for_document(self, pdf_doc: _PdfDocument) -> 'SvgDocumentCache':
+        """Return a cache of XObjects for the document, which uses these templates."""
+        return SvgDocumentCache(pdf_doc, self)
+
+    def clear(self) -> None:
+        """Forget all the templates."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SvgDocumentCache:
+    """Form XObjects of SVG images for a single document, each created only once.
+
+    Placing the same SVG many times then only adds a reference to the same
+    XObject, both to the content streams and to the output file. Like the
+    document itself, this object is not meant to be shared between threads.
+    """
+
+    def __init__(self, pdf_doc: _PdfDocument, templates: SvgTemplateCache | None = None):
+        self.pdf_doc = pdf_doc
+        self.templates = templates if templates is not None else SvgTemplateCache()
+        self._xobjects: dict[str, _PdfFormXObject] = {}
+
+    def get_xobject(self, source: _Any) -> _PdfFormXObject:
+        """Return the form XObject for the SVG source or template in this document.
+
+        Passing a template from :meth:`SvgTemplateCache.get` skips reading and
+        hashing the source on every call.
+        """
+        template = source if isinstance(source, SvgTemplate) else self.templates.get(source)
+        xobject = self._xobjects.get(template.key)
+        if xobject is None:
+            xobject = template.create_xobject(self.pdf_doc)
+            self._xobjects[template.key] = xobject
+        return xobject
+
+    def create_image(self, source: _Any) -> _Image:
+        """Return a new layout image, like ``SvgConverter.ConvertToImage``, but over the shared XObject."""
+        return _Image(self.get_xobject(source))
+
+    def draw_on_page(self, source: _Any, page: _PdfPage, x: float = 0.0, y: float = 0.0) -> _PdfFormXObject:
+        """Draw the SVG on top of the page content at the given position and return its XObject."""
+        xobject = self.get_xobject(source)
+        _PdfCanvas(page).AddXObjectAt(xobject, x, y)
+        return xobject
+
+    def draw_in_rectangle(self, source: _Any, page: _PdfPage, rect: _Rectangle) -> _PdfFormXObject:
+        """Draw the SVG on top of the page content scaled to fit the rectangle and return its XObject."""
+        xobject = self.get_xobject(source)
+        _PdfCanvas(page).AddXObjectFittedIntoRectangle(xobject, rect)
+        return xobject
+
+
+class SvgConversionResult(_NamedTuple):
+    """Result of converting a single SVG file to PDF."""
+    index: int
+    """Position of the file in the converted sequence."""
+    source: str
+    """Path to the SVG file."""
+    dest: str | None
+    """Path to the PDF file, which was written for the SVG, if any."""
+    page: int | None
+    """Page number in the combined PDF document, if the SVG was added to one."""
+    elapsed: float
+    """Time in seconds, which the conversion took."""
+    error: str | None
+    """Error, which prevented the conversion, if any."""
+
+
+class SvgBatchReport(_NamedTuple):
+    """Summary of a batch conversion."""
+    converted: int
+    """Number of files, which were converted successfully."""
+    failures: tuple[SvgConversionResult, ...]
+    """Results of the files, which could not be converted."""
+    elapsed: float
+    """Time in seconds, which the whole batch took."""
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of files processed per second."""
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.converted + len(self.failures)) / self.elapsed
+
+
+def collect_report(results: _Iterable[SvgConversionResult]) -> SvgBatchReport:
+    """Consume the results of a batch conversion and return its summary."""
+    start = _time.perf_counter()
+    converted = 0
+    failures = []
+    for result in results:
+        if result.error is None:
+            converted += 1
+        else:
+            failures.append(result)
+    return SvgBatchReport(converted, tuple(failures), _time.perf_counter() - start)
+
+
+def _iter_svg_files(sources: _Any) -> _Iterator[str]:
+    if isinstance(sources, (str, _os.PathLike)):
+        # Entries are read lazily, so there is no full listing in memory
+        with _os.scandir(_os.fspath(sources)) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith('.svg') and entry.is_file():
+                    yield entry.path
+        return
+    for source in sources:
+        yield _os.fspath(source)
+
+
+def _convert_svg(source: str, dest: str | None, properties: _ISvgConverterProperties) -> bytes | None:
+    with _disposing(_FileStream(source, _FileMode.Open, _FileAccess.Read)) as svg_stream:
+        if dest is None:
+            return _render_to_bytes(lambda pdf_stream: _SvgConverter.CreatePdf(svg_stream, pdf_stream, properties))
+        with _disposing(_FileStream(dest, _FileMode.Create)) as pdf_stream:
+            _SvgConverter.CreatePdf(svg_stream, pdf_stream, properties)
+        return None
+
+
+# (index, source, dest, data, elapsed, error)
+_ConversionData = tuple[int, str, str | None, bytes | None, float, str | None]
+
+
+def _convert_many(sources: _Any,
+                  dest_dir: str | None,
+                  properties_factory: _Callable[[], _ISvgConverterProperties],
+                  max_workers: int | None) -> _Iterator[_ConversionData]:
+    thread_properties = _per_thread(properties_factory)
+
+    def iter_jobs() -> _Iterator[tuple[int, str, str | None, str | None]]:
+        # Output name -> source, so that files with the same name from
+        # different directories don't overwrite each other
+        dests = {}
+        for index, source in enumerate(_iter_svg_files(sources)):
+            if dest_dir is None:
+                yield index, source, None, None
+                continue
+            name = _os.path.splitext(_os.path.basename(source))[0] + '.pdf'
+            other = dests.setdefault(_os.path.normcase(name), source)
+            if other != source:
+                yield index, source, None, f'FileExistsError: {name} is already converted from {other}'
+            else:
+                yield index, source, _os.path.join(dest_dir, name), None
+
+    def convert(job: tuple[int, str, str | None, str | None]) -> _ConversionData:
+        index, source, dest, error = job
+        if error is not None:
+            return index, source, None, None, 0.0, error
+        start = _time.perf_counter()
+        try:
+            data = _convert_svg(source, dest, thread_properties())
+            return index, source, dest, data, _time.perf_counter() - start, None
+        except Exception as e:
+            return index, source, None, None, _time.perf_counter() - start, f'{type(e).__name__}: {e}'
+
+    return _ordered_parallel_map(convert, iter_jobs(), max_workers, 'svg')
+
+
+def convert_svgs(sources: _Any,
+                 dest_dir: str | _os.PathLike,
+                 properties_factory: _Callable[[], _ISvgConverterProperties] = _SvgConverterProperties,
+                 max_workers: int | None = None) -> _Iterator[SvgConversionResult]:
+    """Convert SVG files to PDF files in parallel and yield results in order.
+
+    ``sources`` is either a directory, in which case all the ``.svg`` files
+    in it are converted in the order the directory lists them, or an
+    iterable of paths to SVG files. Each SVG becomes a PDF file with the same
+    name in ``dest_dir``. Errors are reported in the results instead of being
+    raised, including for files, which would overwrite the PDF file of
+    another file with the same name from a different directory.
+
+    ``properties_factory`` is called once per worker thread, as font
+    providers cache font selections and are not meant to be shared between
+    threads. To avoid loading fonts in every thread, create the ``FontSet``
+    once and make the factory create only new providers over it.
+
+    Conversion runs in .NET with the GIL released, so files are actually
+    processed concurrently. Directories are read lazily and only a limited
+    number of files is scheduled ahead of the consumer, so huge directories
+    are not listed in memory all at once.
+    """
+    dest_dir = _os.fspath(dest_dir)
+    for index, source, dest, _, elapsed, error in _convert_many(sources, dest_dir, properties_factory, max_workers):
+        yield SvgConversionResult(index, source, dest, None, elapsed, error)
+
+
+def convert_svgs_to_pdf(sources: _Any,
+                        dest: str | _os.PathLike,
+                        properties_factory: _Callable[[], _ISvgConverterProperties] = _SvgConverterProperties,
+                        max_workers: int | None = None) -> _Iterator[SvgConversionResult]:
+    """Convert SVG files in parallel into a single PDF document with a page per file.
+
+    This works as :func:`convert_svgs`, but every SVG is converted in memory
+    and its page is then appended to ``dest`` in the order of the sources.
+    Files, which fail to convert, are skipped. Identical resources, like
+    fonts used by many SVGs, are written only once. The document is complete
+    after all the results have been consumed, and it is not written at all,
+    if no file could be converted.
+    """
+    dest = _os.fspath(dest)
+    pdf_doc = None
+    try:
+        for index, source, _, data, elapsed, error in _convert_many(sources, None, properties_factory, max_workers):
+            page = None
+            if error is None:
+                start = _time.perf_counter()
+                try:
+                    if pdf_doc is None:
+                        pdf_doc = _PdfDocument(_PdfWriter(dest, _WriterProperties().UseSmartMode()))
+                    with _disposing(_PdfDocument(_open_bytes(data))) as svg_doc:
+                        svg_doc.CopyPagesTo(1, svg_doc.GetNumberOfPages(), pdf_doc)
+                    page = pdf_doc.GetNumberOfPages()
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                elapsed += _time.perf_counter() - start
+            yield SvgConversionResult(index, source, None, page, elapsed, error)
+    finally:
+        if pdf_doc is not None:
+            pdf_doc.Close()
@@ -1,12 +1,34 @@
 """
 This module contains some utility methods to make interacting with .NET easier.
 """
+import ctypes as _ctypes
+import os as _os
+import threading as _threading
+from collections import deque as _deque
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 from contextlib import contextmanager as _contextmanager
-from typing import Any as _Any, Iterator as _Iterator, TypeVar as _TypeVar
+from typing import Any as _Any, Callable as _Callable, Iterable as _Iterable, Iterator as _Iterator, \
+    TypeVar as _TypeVar
 
-from System import IDisposable as _IDisposable
+import clr as _clr
+
+try:
+    # Memory-mapped files live in a separate assembly in .NET Core, which is
+    # not loaded by default...
+    _clr.AddReference('System.IO.MemoryMappedFiles')
+except Exception:
+    # ...and in System.Core in .NET Framework
+    _clr.AddReference('System.Core')
+
+from System import Array as _Array, Byte as _Byte, IDisposable as _IDisposable, IntPtr as _IntPtr
+from System.IO import FileMode as _FileMode, MemoryStream as _MemoryStream, Stream as _Stream
+from System.IO.MemoryMappedFiles import MemoryMappedFile as _MemoryMappedFile, \
+    MemoryMappedFileAccess as _MemoryMappedFileAccess
+from System.Runtime.InteropServices import GCHandle as _GCHandle, GCHandleType as _GCHandleType, \
+    Marshal as _Marshal
 
 _T = _TypeVar('_T')
+_R = _TypeVar('_R')
 _DisposableT = _TypeVar('_DisposableT', bound=_IDisposable)
 
 
@@ -66,3 +88,186 @@ def disposing(obj: _DisposableT) -> _Iterator[_DisposableT]:
         yield obj
     finally:
         _IDisposable.Dispose(obj)
+
+
+class _PyBuffer(_ctypes.Structure):
+    """ctypes mirror of the C-level ``Py_buffer`` struct."""
+    _fields_ = (
+        ('buf', _ctypes.c_void_p),
+        ('obj', _ctypes.c_void_p),
+        ('len', _ctypes.c_ssize_t),
+        ('itemsize', _ctypes.c_ssize_t),
+        ('readonly', _ctypes.c_int),
+        ('ndim', _ctypes.c_int),
+        ('format', _ctypes.c_char_p),
+        ('shape', _ctypes.POINTER(_ctypes.c_ssize_t)),
+        ('strides', _ctypes.POINTER(_ctypes.c_ssize_t)),
+        ('suboffsets', _ctypes.POINTER(_ctypes.c_ssize_t)),
+        ('internal', _ctypes.c_void_p),
+    )
+
+
+_PyObject_GetBuffer = _ctypes.pythonapi.PyObject_GetBuffer
+_PyObject_GetBuffer.argtypes = (_ctypes.py_object, _ctypes.POINTER(_PyBuffer), _ctypes.c_int)
+_PyObject_GetBuffer.restype = _ctypes.c_int
+_PyBuffer_Release = _ctypes.pythonapi.PyBuffer_Release
+_PyBuffer_Release.argtypes = (_ctypes.POINTER(_PyBuffer),)
+_PyBuffer_Release.restype = None
+# Request for a plain contiguous buffer without format or shape data
+_PyBUF_SIMPLE = 0
+
+
+@_contextmanager
+def _exported_buffer(data: _Any) -> _Iterator[tuple[int, int]]:
+    """Context to get the address and the size of a buffer-protocol object.
+
+    The buffer is held for the duration of the block, so the memory at the
+    address stays valid and won't be resized or freed. Non-contiguous buffers
+    are copied into a temporary ``bytes`` object first.
+    """
+    buffer = _PyBuffer()
+    try:
+        _PyObject_GetBuffer(data, _ctypes.byref(buffer), _PyBUF_SIMPLE)
+    except BufferError:
+        # Happens with non-contiguous memory views, for example. There is no
+        # way to avoid a copy here
+        data = memoryview(data).tobytes()
+        _PyObject_GetBuffer(data, _ctypes.byref(buffer), _PyBUF_SIMPLE)
+    try:
+        yield buffer.buf or 0, buffer.len
+    finally:
+        _PyBuffer_Release(_ctypes.byref(buffer))
+
+
+def bytes_to_clr(data: _Any) -> _Array[_Byte]:
+    """Return a new .NET ``byte[]`` array with a copy of the buffer contents.
+
+    Python.NET converts ``bytes`` to ``byte[]`` element by element, which gets
+    really slow for payloads like fonts or embedded files. This function accepts
+    any object supporting the buffer protocol (``bytes``, ``bytearray``,
+    ``memoryview``, ``mmap``, etc.) and copies it in a single bulk operation.
+    """
+    with _exported_buffer(data) as (address, size):
+        array = _Array.CreateInstance(_Byte, size)
+        if size > 0:
+            _Marshal.Copy(_IntPtr(address), array, 0, size)
+        return array
+
+
+def clr_to_bytes(array: _Array[_Byte]) -> bytes:
+    """Return a ``bytes`` object with a copy of the .NET ``byte[]`` contents.
+
+    This is the reverse of :func:`bytes_to_clr`. Calling ``bytes()`` on a .NET
+    array goes through it element by element, while this function does a single
+    bulk copy.
+    """
+    with clr_bytes_view(array) as view:
+        return view.tobytes()
+
+
+@_contextmanager
+def clr_bytes_view(array: _Array[_Byte]) -> _Iterator[memoryview]:
+    """Context to access a .NET ``byte[]`` as a writable ``memoryview`` without copying.
+
+    The array is pinned for the duration of the block, so that the garbage
+    collector cannot move it. The view must not be used after the block ends.
+    """
+    size = array.Length
+    if size == 0:
+        yield memoryview(bytearray())
+        return
+    handle = _GCHandle.Alloc(array, _GCHandleType.Pinned)
+    try:
+        address = handle.AddrOfPinnedObject().ToInt64()
+        yield memoryview((_ctypes.c_ubyte * size).from_address(address)).cast('B')
+    finally:
+        handle.Free()
+
+
+def bytes_to_clr_stream(data: _Any) -> _MemoryStream:
+    """Return a read-only .NET ``MemoryStream`` over a copy of the buffer contents.
+
+    The data is copied once with :func:`bytes_to_clr` and the stream wraps the
+    resulting array directly.
+    """
+    return _MemoryStream(bytes_to_clr(data), False)
+
+
+@_contextmanager
+def mapped_file_stream(path: str | _os.PathLike) -> _Iterator[_Stream]:
+    """Context to read a file through a memory-mapped, read-only .NET ``Stream``.
+
+    Data is paged in by the OS on demand and never passes through Python, so
+    this is the cheapest way to hand a big file to .NET APIs, which accept a
+    ``Stream``. Both the stream and the mapping are disposed at the end of the
+    block.
+
+    Empty files cannot be mapped, so an empty ``MemoryStream`` is used for
+    them instead.
+    """
+    path = _os.fspath(path)
+    size = _os.path.getsize(path)
+    if size == 0:
+        with disposing(_MemoryStream(_Array[_Byte](0), False)) as stream:
+            yield stream
+        return
+    mapped_file = _MemoryMappedFile.CreateFromFile(path, _FileMode.Open, None, 0, _MemoryMappedFileAccess.Read)
+    with disposing(mapped_file):
+        # A view over the whole mapping can be rounded up to the page size on
+        # Windows, which would add zero bytes at the end of the data
+        with disposing(mapped_file.CreateViewStream(0, size, _MemoryMappedFileAccess.Read)) as stream:
+            yield stream
+
+
+def _per_thread(factory: _Callable[[], _T]) -> _Callable[[], _T]:
+    """Return a function, which returns the object created by ``factory`` for the calling thread.
+
+    ``factory`` is called on the first call in each thread only.
+    """
+    local = _threading.local()
+
+    def get() -> _T:
+        value = getattr(local, 'value', None)
+        if value is None:
+            value = factory()
+            local.value = value
+        return value
+
+    return get
+
+
+def _ordered_parallel_map(fn: _Callable[[_T], _R],
+                          iterable: _Iterable[_T],
+                          max_workers: int | None,
+                          name: str,
+                          executor: _ThreadPoolExecutor | None = None) -> _Iterator[_R]:
+    """Yield ``fn`` of each item in the order of the items, calling it in a thread pool.
+
+    Only ``2 * max_workers`` items are scheduled ahead of the consumer, which
+    keeps every worker busy with some slack for uneven items, while the
+    items can come from a stream of any length. Exceptions of ``fn`` are
+    raised, when its result is reached.
+
+    A new pool with ``itextpy-{name}`` threads is used, unless ``executor``
+    is given. The new pool is shut down at the end, while for the given one
+    only the items, which haven't started yet, are cancelled.
+    """
+    if max_workers is None:
+        max_workers = _os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = _ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'itextpy-{name}')
+    pending = _deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,234 @@
+"""
+This module contains helpers for validating signatures and certificates in bulk.
+"""
+import datetime as _datetime
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import threading as _threading
+import time as _time
+from collections import OrderedDict as _OrderedDict
+from typing import Any as _Any, Callable as _Callable, Iterable as _Iterable, Iterator as _Iterator, \
+    NamedTuple as _NamedTuple
+
+from System import DateTime as _DateTime, DateTimeKind as _DateTimeKind, Func as _Func
+from System.Collections.Generic import List as _List
+from iText.Commons.Bouncycastle.Cert import IX509Certificate as _IX509Certificate
+from iText.Commons.Utils import DateTimeUtil as _DateTimeUtil
+from iText.Kernel.Pdf import PdfDocument as _PdfDocument
+from iText.Signatures import IssuingCertificateRetriever as _IssuingCertificateRetriever, \
+    SignatureUtil as _SignatureUtil
+from iText.Signatures.Validation import ValidatorChainBuilder as _ValidatorChainBuilder
+from iText.Signatures.Validation.Context import CertificateSource as _CertificateSource, \
+    TimeBasedContext as _TimeBasedContext, ValidationContext as _ValidationContext, \
+    ValidatorContext as _ValidatorContext
+from iText.Signatures.Validation.Report import ValidationReport as _ValidationReport
+
+from .io import open_reader as _open_reader
+from .util import _ordered_parallel_map, _per_thread, clr_to_bytes as _clr_to_bytes, disposing as _disposing
+
+_EPOCH = _DateTime(1970, 1, 1, 0, 0, 0, _DateTimeKind.Utc)
+
+DEFAULT_TIME_BUCKET: float = 60.0
+"""Default width in seconds of validation time ranges, which share results."""
+
+DEFAULT_MAX_AGE: float = 300.0
+"""Default time in seconds, for which validation results are cached at most."""
+
+
+def certificate_fingerprint(cert: _IX509Certificate) -> bytes:
+    """Return the SHA-256 hash of the encoded certificate."""
+    return _hashlib.sha256(_clr_to_bytes(cert.GetEncoded())).digest()
+
+
+class CachingCertificateChainValidator:
+    """Certificate chain validator, which remembers its results.
+
+    The ``CertificateChainValidator`` is built only once. Validation reports
+    are cached per certificate, validation time range, validation context and
+    trust anchors, so validating the same signer again within a batch is a
+    dictionary lookup instead of full path building and revocation checks.
+
+    Validation times are grouped into ranges of ``time_bucket`` seconds, so
+    reports for times close to each other are shared. Entries also expire
+    ``max_age`` seconds after they were created, since revocation status can
+    change over time. Indeterminate results, e.g. because a revocation
+    server was unavailable, are never cached.
+
+    Cached reports are shared between callers, so they must not be modified.
+    Validations, which miss the cache, are done one at a time, as validators
+    and certificate retrievers are not meant to be used concurrently.
+    """
+
+    def __init__(self,
+                 validator_chain_builder: _ValidatorChainBuilder,
+                 trusted_certificates: _Iterable[_IX509Certificate] | None = None,
+                 time_bucket: float = DEFAULT_TIME_BUCKET,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 max_entries: int = 4096):
+        """Create a validator from the chain builder.
+
+        If ``trusted_certificates`` are provided, then the builder is set up
+        to use a single certificate retriever, which trusts them. Otherwise,
+        the builder is used as is.
+        """
+        self.trust_anchors: tuple[bytes, ...] = ()
+        if trusted_certificates is not None:
+            trusted_certificates = list(trusted_certificates)
+            self.trust_anchors = tuple(sorted(certificate_fingerprint(c) for c in trusted_certificates))
+            trusted_list = _List[_IX509Certificate]()
+            for cert in trusted_certificates:
+                trusted_list.Add(cert)
+            retriever = _IssuingCertificateRetriever()
+            retriever.SetTrustedCertificates(trusted_list)
+            validator_chain_builder.WithIssuingCertificateRetrieverFactory(
+                _Func[_IssuingCertificateRetriever](lambda: retriever))
+        self.validator = validator_chain_builder.BuildCertificateChainValidator()
+        self.time_bucket = time_bucket
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = _threading.Lock()
+        self._validation_lock = _threading.Lock()
+        self._entries: _OrderedDict[tuple, tuple[float, _ValidationReport]] = _OrderedDict()
+
+    def validate(self,
+                 cert: _IX509Certificate,
+                 validation_date: _DateTime | None = None,
+                 context: _ValidationContext | None = None) -> _ValidationReport:
+        """Return the validation report for the certificate.
+
+        By default, the certificate is validated as a signer certificate at
+        the present time, as ``CertificateChainValidator.ValidateCertificate``
+        would do in the same context.
+        """
+        if validation_date is None:
+            validation_date = _DateTimeUtil.GetCurrentTime()
+        if context is None:
+            context = _ValidationContext(_ValidatorContext.CERTIFICATE_CHAIN_VALIDATOR,
+                                         _CertificateSource.SIGNER_CERT,
+                                         _TimeBasedContext.PRESENT)
+        timestamp = (validation_date.ToUniversalTime() - _EPOCH).TotalSeconds
+        key = (
+            certificate_fingerprint(cert),
+            int(timestamp // self.time_bucket),
+            str(context.GetValidatorContext()),
+            str(context.GetCertificateSource()),
+            str(context.GetTimeBasedContext()),
+            self.trust_anchors,
+        )
+        report = self._get(key)
+        if report is not None:
+            return report
+
+        with self._validation_lock:
+            # Somebody could have validated the same certificate meanwhile
+            report = self._get(key)
+            if report is not None:
+                return report
+            report = self.validator.ValidateCertificate(context, cert, validation_date)
+            if report.GetValidationResult() != _ValidationReport.ValidationResult.INDETERMINATE:
+                with self._lock:
+                    self._entries[key] = (_time.monotonic() + self.max_age, report)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return report
+
+    def is_valid(self, cert: _IX509Certificate, validation_date: _DateTime | None = None) -> bool:
+        """Return whether the certificate is valid as a signer certificate."""
+        report = self.validate(cert, validation_date)
+        return report.GetValidationResult() == _ValidationReport.ValidationResult.VALID
+
+    def clear(self) -> None:
+        """Forget all the cached reports."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: tuple) -> _Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= _time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+
+class DocumentValidationResult(_NamedTuple):
+    """Result of validating all the signatures of a single document."""
+    index: int
+    """Position of the document in the validated sequence."""
+    source: str | None
+    """Path to the document or None, if it was validated from memory."""
+    result: str | None
+    """Overall validation result, like ``"VALID"``, or None, if validation failed with an error."""
+    signature_names: tuple[str, ...]
+    """Names of the signature fields, which were validated."""
+    failures: tuple[dict[str, str], ...]
+    """Failed checks with their ``check``, ``message`` and ``status``."""
+    started_at: str
+    """UTC time, when the validation of the document started, in ISO 8601 format."""
+    elapsed: float
+    """Time in seconds, which the validation of the document took."""
+    error: str | None
+    """Error, which prevented the validation, if any."""
+
+    def to_json(self) -> str:
+        """Return the result as a JSON object on a single line."""
+        return _json.dumps(self._asdict(), ensure_ascii=False)
+
+
+def validate_document(source: _Any, validator_chain_builder: _ValidatorChainBuilder,
+                      index: int = 0) -> DocumentValidationResult:
+    """Validate all the signatures of a document and return the result.
+
+    ``source`` is either a path to the PDF document or a buffer-protocol
+    object with its contents. Errors, like a broken document, are reported in
+    the result instead of being raised.
+    """
+    path = _os.fspath(source) if isinstance(source, (str, _os.PathLike)) else None
+    started_at = _datetime.datetime.now(_datetime.timezone.utc).isoformat()
+    start = _time.perf_counter()
+    result = None
+    signature_names = ()
+    failures = ()
+    error = None
+    try:
+        with _disposing(_PdfDocument(_open_reader(source))) as pdf_doc:
+            signature_names = tuple(_SignatureUtil(pdf_doc).GetSignatureNames())
+            report = validator_chain_builder.BuildSignatureValidator(pdf_doc).ValidateSignatures()
+        result = str(report.GetValidationResult())
+        failures = tuple(
+            {'check': item.GetCheckName(), 'message': item.GetMessage(), 'status': str(item.GetStatus())}
+            for item in report.GetFailures()
+        )
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    return DocumentValidationResult(index, path, result, signature_names, failures, started_at,
+                                    _time.perf_counter() - start, error)
+
+
+def validate_documents(sources: _Iterable[_Any],
+                       builder_factory: _Callable[[], _ValidatorChainBuilder],
+                       max_workers: int | None = None) -> _Iterator[DocumentValidationResult]:
+    """Validate signatures of many documents in parallel and yield results in order.
+
+    ``builder_factory`` is called once per worker thread, as validator chain
+    builders and validators are not meant to be shared between threads. To
+    avoid repeating the same work in every thread, make the builders share
+    caching revocation clients from :mod:`itextpy.revocation` and the same
+    trusted certificates.
+
+    Validation runs in .NET with the GIL released, so documents are actually
+    processed concurrently. Only a limited number of documents is scheduled
+    ahead of the consumer, so that huge batches don't end up in memory all at
+    once.
+    """
+    thread_builder = _per_thread(builder_factory)
+
+    def validate(job: tuple[int, _Any]) -> DocumentValidationResult:
+        index, source = job
+        return validate_document(source, thread_builder(), index)
+
+    return _ordered_parallel_map(validate, enumerate(sources), max_workers, 'validation')
@@ -0,0 +1,90 @@
+"""
+This module contains helpers for producing XMP metadata for many documents.
+"""
+import datetime as _datetime
+import os as _os
+import uuid as _uuid
+from typing import Any as _Any, Iterable as _Iterable
+
+from iText.Kernel.Pdf import PdfDocument as _PdfDocument, PdfString as _PdfString
+from iText.Kernel.XMP import XMPConst as _XMPConst, XMPMeta as _XMPMeta, XMPMetaFactory as _XMPMetaFactory
+from iText.Kernel.XMP.Options import PropertyOptions as _PropertyOptions
+
+from .util import bytes_to_clr as _bytes_to_clr, clr_cast as _clr_cast
+
+
+def _new_uuid() -> str:
+    return f'uuid:{_uuid.uuid4()}'
+
+
+class XmpTemplate:
+    """XMP metadata, which is parsed once and then filled in for each document.
+
+    The template holds the parsed metadata with everything, which is the same
+    for all the documents, like conformance declarations. Each document gets
+    a copy of it with only the variable fields set, so nothing is read or
+    parsed again.
+    """
+
+    def __init__(self, meta: _XMPMeta):
+        self.meta = meta
+
+    @classmethod
+    def from_bytes(cls, data: _Any) -> 'XmpTemplate':
+        """Return a template for XMP metadata stored in a buffer-protocol object."""
+        return cls(_XMPMetaFactory.ParseFromBuffer(_bytes_to_clr(data)))
+
+    @classmethod
+    def from_file(cls, path: str | _os.PathLike) -> 'XmpTemplate':
+        """Return a template for an XMP file."""
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+    def create(self,
+               title: str | None = None,
+               language: str | None = None,
+               created: _datetime.datetime | None = None,
+               modified: _datetime.datetime | None = None,
+               document_id: str | None = None,
+               instance_id: str | None = None,
+               properties: _Iterable[tuple[str, str, str]] = ()) -> _XMPMeta:
+        """Return a copy of the template metadata with the fields filled in.
+
+        Fields, which are None, are left as in the template, except for the
+        instance ID, which is always new, and the document ID, which is only
+        new, if the template doesn't have one. Dates without a time zone are
+        considered to be UTC. ``properties`` are additional simple properties
+        as ``(namespace, name, value)`` tuples.
+        """
+        meta = _clr_cast(self.meta.Clone(), _XMPMeta)
+        if title is not None:
+            meta.SetLocalizedText(_XMPConst.NS_DC, "title", _XMPConst.X_DEFAULT, _XMPConst.X_DEFAULT, title)
+        if language is not None:
+            meta.DeleteProperty(_XMPConst.NS_DC, "language")
+            meta.AppendArrayItem(_XMPConst.NS_DC, "language", _PropertyOptions(_PropertyOptions.ARRAY), language,
+                                 None)
+        for name, value in (("CreateDate", created), ("ModifyDate", modified)):
+            if value is not None:
+                if value.tzinfo is None:
+                    value = value.replace(tzinfo=_datetime.timezone.utc)
+                meta.SetProperty(_XMPConst.NS_XMP, name, value.isoformat())
+        if document_id is not None or not meta.DoesPropertyExist(_XMPConst.NS_XMP_MM, "DocumentID"):
+            meta.SetProperty(_XMPConst.NS_XMP_MM, "DocumentID", document_id or _new_uuid())
+        meta.SetProperty(_XMPConst.NS_XMP_MM, "InstanceID", instance_id or _new_uuid())
+        for namespace, name, value in properties:
+            meta.SetProperty(namespace, name, value)
+        return meta
+
+    def apply(self, pdf_doc: _PdfDocument, **fields: _Any) -> _XMPMeta:
+        """Set the filled in metadata to the document and return it.
+
+        Keyword arguments are the same, as for :meth:`create`. If a language
+        is provided, then it becomes the language of the document catalog as
+        well, as PDF/UA requires.
+        """
+        meta = self.create(**fields)
+        pdf_doc.SetXmpMetadata(meta)
+        language = fields.get('language')
+        if language is not None:
+            pdf_doc.GetCatalog().SetLang(_PdfString(language))
+        return meta
@@ -0,0 +1,48 @@
+import itextpy
+itextpy.load()
+
+from itextpy.forms import AppearanceCache
+from itextpy.util import disposing
+
+from pathlib import Path
+
+from iText.Forms.Form.Element import InputField, Radio
+from iText.Kernel.Pdf import PdfWriter, PdfDocument
+from iText.Layout import Document
+from iText.Layout.Borders import SolidBorder
+from iText.Layout.Element import Cell, Table
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+QUESTION_COUNT = 200
+ANSWERS = ("1", "2", "3", "4", "5")
+
+
+# This sample creates a long questionnaire with a radio group and a comment
+# field for every question. All the radio buttons look the same, as do all
+# the empty comment fields, so the appearance cache writes each distinct
+# appearance only once, instead of once per widget.
+def manipulate_pdf(dest):
+    pdf_doc = PdfDocument(PdfWriter(dest))
+    cache = AppearanceCache(pdf_doc)
+    with disposing(Document(pdf_doc)) as document:
+        table = Table(len(ANSWERS) + 2, False)
+        for question in range(1, QUESTION_COUNT + 1):
+            table.AddCell(f"Question {question}")
+            for answer in ANSWERS:
+                radio = Radio(f"q{question}_{answer}", f"q{question}")
+                radio.SetInteractive(True)
+                radio.SetBorder(SolidBorder(1))
+                table.AddCell(Cell().Add(radio))
+            comment = InputField(f"q{question}_comment")
+            comment.SetValue("")
+            comment.SetInteractive(True)
+            table.AddCell(Cell().Add(comment))
+        document.Add(table)
+
+        # Last pages are still in memory, so they are processed here
+        cache.close()
+        print(f'{cache.unique} distinct appearances, {cache.shared} shared')
+
+
+if __name__ == "__main__":
+    manipulate_pdf(str(SCRIPT_DIR / "cached_form_appearances.pdf"))
@@ -0,0 +1,71 @@
+import itextpy
+itextpy.load()
+
+from itextpy.forms import FormTemplate, fill_many
+from itextpy.io import render_to_bytes
+from itextpy.util import disposing
+
+import time
+from pathlib import Path
+
+from iText.Forms.Form.Element import InputField, Radio
+from iText.Kernel.Pdf import PdfWriter, PdfDocument
+from iText.Layout import Document
+from iText.Layout.Borders import SolidBorder
+from iText.Layout.Element import Cell, Paragraph, Table
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RECORD_COUNT = 1000
+
+
+# This function creates the form template in memory. Usually it would be
+# an existing PDF file instead, which could be loaded with
+# FormTemplate.from_file.
+def create_template():
+    def render(stream):
+        with disposing(Document(PdfDocument(PdfWriter(stream)))) as document:
+            table = Table(2, False)
+            for name in ("name", "city"):
+                field = InputField(name)
+                field.SetInteractive(True)
+                table.AddCell(f"{name.capitalize()}:")
+                table.AddCell(Cell().Add(field))
+            document.Add(table)
+            for value in ("male", "female"):
+                radio = Radio(value, "gender")
+                radio.SetInteractive(True)
+                radio.SetBorder(SolidBorder(1))
+                document.Add(Paragraph(f"{value.capitalize()}: ").Add(radio))
+
+    return render_to_bytes(render)
+
+
+# Records can be dictionaries, named tuples or rows of a data frame
+def create_records():
+    cities = ("Brussels", "Ghent", "Antwerp", "Leuven")
+    for i in range(RECORD_COUNT):
+        yield {
+            "name": f"Person {i}",
+            "city": cities[i % len(cities)],
+            "gender": "male" if i % 2 else "female",
+        }
+
+
+# The field tree of the template is parsed once. Each record is then filled
+# into its own copy of the template on a worker thread, and the fields are
+# flattened, so the outputs are regular documents.
+def manipulate_pdf(dest_dir):
+    dest_dir.mkdir(exist_ok=True)
+    template = FormTemplate(create_template())
+    start = time.perf_counter()
+    failures = 0
+    for result in fill_many(template, create_records(), str(dest_dir / "{index}.pdf"), flatten=True):
+        if result.error is not None:
+            print(f'Record {result.index} failed: {result.error}')
+            failures += 1
+    elapsed = time.perf_counter() - start
+    print(f'Filled {RECORD_COUNT - failures} forms in {elapsed:.2f} s')
+
+
+if __name__ == "__main__":
+    manipulate_pdf(SCRIPT_DIR / "fill_form_batch")
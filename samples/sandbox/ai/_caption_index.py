@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import accumulate
+from typing import Iterable
+
+
+class CaptionIndex:
+    """
+    Aho-Corasick automaton for finding captions in text.
+
+    All occurrences of all the captions are found in a single pass over the
+    text, so the time it takes is linear in the length of the text plus the
+    number of occurrences, no matter how many captions there are.
+    """
+
+    def __init__(self, captions: Iterable[str]):
+        # Identical captions share the same pattern
+        self.patterns = list(dict.fromkeys(c for c in captions if c))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail = [0]
+        # Patterns, which end in the state
+        self._out: list[list[int]] = [[]]
+        # Closest state via the fail links, which has any patterns ending in it
+        self._out_link = [0]
+        for pattern_idx, pattern in enumerate(self.patterns):
+            self._add(pattern_idx, pattern)
+        self._build_links()
+
+    def _add(self, pattern_idx: int, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._out_link.append(0)
+            state = next_state
+        self._out[state].append(pattern_idx)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = fail
+                self._out_link[next_state] = fail if self._out[fail] else self._out_link[fail]
+                queue.append(next_state)
+
+    def find_all(self, text: str) -> dict[str, list[int]]:
+        """
+        Returns start positions of all occurrences for each caption, which was
+        found in the text. Positions are sorted in ascending order.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        out_link = self._out_link
+        found = [[] for _ in self.patterns]
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            match_state = state if out[state] else out_link[state]
+            while match_state:
+                for pattern_idx in out[match_state]:
+                    found[pattern_idx].append(pos + 1 - len(self.patterns[pattern_idx]))
+                match_state = out_link[match_state]
+        return {self.patterns[i]: positions for i, positions in enumerate(found) if positions}
+
+
+class PageLocator:
+    """
+    Finds pages for a sequence of captions, which are expected to appear in
+    the document in the same order.
+
+    Text of all the pages is indexed at once. Each lookup then continues from
+    the end of the previous match, so an entry is never placed before the
+    entries preceding it. If a caption cannot be found, it is assumed to be on
+    the same page as the previous one.
+    """
+
+    # Pages are joined with a character, which cannot be a part of a caption,
+    # so matches never span multiple pages
+    _PAGE_SEPARATOR = "\0"
+
+    def __init__(self, pages: list[str], captions: list[str]):
+        self.captions = [c.casefold() for c in captions]
+        casefold_pages = [p.casefold() for p in pages]
+        text = self._PAGE_SEPARATOR.join(casefold_pages)
+        self._page_starts = list(accumulate((len(p) + 1 for p in casefold_pages[:-1]), initial=0))
+        self._occurrences = CaptionIndex(self.captions).find_all(text)
+        self._prev_page_idx = 0
+        self._prev_pos = 0
+
+    def next_page_idx(self, casefold_caption: str) -> int:
+        """
+        Returns the page index for the next caption in the sequence. The
+        caption must be casefolded already.
+        """
+        positions = self._occurrences.get(casefold_caption, ())
+        i = bisect_left(positions, self._prev_pos)
+        if i < len(positions):
+            pos = positions[i]
+            self._prev_page_idx = bisect_right(self._page_starts, pos) - 1
+            self._prev_pos = pos + len(casefold_caption)
+        return self._prev_page_idx
+
+    def locate_all(self) -> list[int]:
+        """
+        Returns page indices for all the captions, this locator was created
+        with, in the same order.
+        """
+        return [self.next_page_idx(c) for c in self.captions]
@@ -0,0 +1,181 @@
+import itextpy
+itextpy.load()
+
+from collections import Counter
+from typing import NamedTuple
+
+from itextpy.util import clr_cast
+
+from System.Collections.Generic import HashSet
+from iText.Kernel.Geom import Vector
+from iText.Kernel.Pdf import PdfDocument
+from iText.Kernel.Pdf.Canvas import PdfCanvasConstants
+from iText.Kernel.Pdf.Canvas.Parser import EventType, PdfCanvasProcessor
+from iText.Kernel.Pdf.Canvas.Parser.Data import IEventData, TextRenderInfo
+from iText.Kernel.Pdf.Canvas.Parser.Listener import IEventListener
+
+
+class TextLine(NamedTuple):
+    """A line of text together with the style of the most of its characters."""
+    page_idx: int
+    text: str
+    size: float
+    bold: bool
+
+
+class Heading(NamedTuple):
+    """A detected heading. Level 0 is the top level."""
+    level: int
+    caption: str
+    page_idx: int
+
+
+class FontMetricsListener(IEventListener):
+    """
+    Collects lines of text with their font size and weight.
+
+    Text chunks, which are rendered next to each other on the same baseline,
+    are joined into a single line. Font size is the height between the ascent
+    and descent lines, so it already accounts for all the text and
+    transformation matrices.
+    """
+
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "Sandbox.Ai"
+
+    _SUPPORTED_EVENTS = HashSet[EventType]()
+    _SUPPORTED_EVENTS.Add(EventType.RENDER_TEXT)
+
+    def __init__(self):
+        self.lines: list[TextLine] = []
+        self.page_idx = 0
+        self._font_bold: dict[str, bool] = {}
+        self._parts: list[str] = []
+        self._style_chars: Counter[tuple[float, bool]] = Counter()
+        self._baseline_y = 0.0
+        self._end_x = 0.0
+
+    def start_page(self, page_idx: int) -> None:
+        self.end_line()
+        self.page_idx = page_idx
+
+    def end_line(self) -> None:
+        text = "".join(self._parts).strip()
+        if text:
+            (size, bold), _ = self._style_chars.most_common(1)[0]
+            self.lines.append(TextLine(self.page_idx, text, size, bold))
+        self._parts.clear()
+        self._style_chars.clear()
+
+    def EventOccurred(self, data: IEventData, event_type: EventType) -> None:
+        info = clr_cast(data, TextRenderInfo)
+        text = info.GetText()
+        if not text:
+            return
+        baseline = info.GetBaseline()
+        start_x = baseline.GetStartPoint().Get(Vector.I1)
+        baseline_y = baseline.GetStartPoint().Get(Vector.I2)
+        size = round(2 * (info.GetAscentLine().GetStartPoint().Get(Vector.I2)
+                          - info.GetDescentLine().GetStartPoint().Get(Vector.I2))) / 2
+        if self._parts:
+            if abs(baseline_y - self._baseline_y) > size / 2 or start_x < self._end_x - size:
+                self.end_line()
+            elif start_x - self._end_x > size / 6 and not self._parts[-1].endswith(" ") \
+                    and not text.startswith(" "):
+                self._parts.append(" ")
+        self._parts.append(text)
+        self._style_chars[(size, self._is_bold(info))] += len(text.strip())
+        self._baseline_y = baseline_y
+        self._end_x = baseline.GetEndPoint().Get(Vector.I1)
+
+    def GetSupportedEvents(self):
+        return self._SUPPORTED_EVENTS
+
+    def _is_bold(self, info: TextRenderInfo) -> bool:
+        # Text, which is both filled and stroked, is a common way to fake bold
+        if info.GetTextRenderMode() == PdfCanvasConstants.TextRenderingMode.FILL_STROKE:
+            return True
+        font_names = info.GetFont().GetFontProgram().GetFontNames()
+        font_name = font_names.GetFontName() or ""
+        bold = self._font_bold.get(font_name)
+        if bold is None:
+            bold = (font_names.IsBold() or font_names.GetFontWeight() >= 600
+                    or "bold" in font_name.lower() or "black" in font_name.lower())
+            self._font_bold[font_name] = bold
+        return bold
+
+
+def collect_lines(doc: PdfDocument) -> list[TextLine]:
+    """
+    Returns all the lines of text in the document with their styles. This is
+    done in a single parsing pass over the page contents.
+    """
+    listener = FontMetricsListener()
+    processor = PdfCanvasProcessor(listener)
+    for page_idx in range(doc.GetNumberOfPages()):
+        listener.start_page(page_idx)
+        processor.ProcessPageContent(doc.GetPage(page_idx + 1))
+        processor.Reset()
+    listener.end_line()
+    return listener.lines
+
+
+def find_heading_candidates(lines: list[TextLine],
+                            max_length: int = 120,
+                            min_size_ratio: float = 1.1,
+                            max_repeat_ratio: float = 0.3) -> list[TextLine]:
+    """
+    Returns lines, which look like headings: short lines, which are either
+    bigger than the body text or are bold, while the body text is not.
+
+    The body text style is the style with the most characters in the
+    document. Lines, which repeat on many pages, like running headers and
+    footers, are skipped. Consecutive heading lines of the same style on the
+    same page are considered to be a single wrapped heading and are joined.
+    """
+    style_chars = Counter()
+    for line in lines:
+        style_chars[(line.size, line.bold)] += len(line.text)
+    if not style_chars:
+        return []
+    (body_size, body_bold), _ = style_chars.most_common(1)[0]
+
+    page_count = lines[-1].page_idx + 1
+    pages_per_text = Counter(text for _, text in {(line.page_idx, line.text) for line in lines})
+    max_repeats = max(2, int(page_count * max_repeat_ratio))
+
+    def is_heading(line: TextLine) -> bool:
+        if len(line.text) > max_length or not any(c.isalpha() for c in line.text):
+            return False
+        if pages_per_text[line.text] > max_repeats:
+            return False
+        if line.size >= body_size * min_size_ratio:
+            return True
+        return line.bold and not body_bold and line.size >= body_size
+
+    candidates = []
+    prev_is_heading = False
+    for line in lines:
+        if not is_heading(line):
+            prev_is_heading = False
+            continue
+        prev = candidates[-1] if prev_is_heading else None
+        if prev is not None and (prev.page_idx, prev.size, prev.bold) == (line.page_idx, line.size, line.bold):
+            candidates[-1] = prev._replace(text=f"{prev.text} {line.text}")
+        else:
+            candidates.append(line)
+        prev_is_heading = True
+    return candidates
+
+
+def assign_levels(candidates: list[TextLine], max_levels: int = 3) -> list[Heading]:
+    """
+    Clusters heading candidates by their style into heading levels. Bigger
+    fonts make higher levels, and for the same size bold comes first. Only
+    the first ``max_levels`` styles are kept, the rest are dropped.
+    """
+    styles = sorted({(line.size, line.bold) for line in candidates}, reverse=True)
+    levels = {style: level for level, style in enumerate(styles[:max_levels])}
+    return [Heading(levels[(line.size, line.bold)], line.text, line.page_idx)
+            for line in candidates if (line.size, line.bold) in levels]
@@ -4,32 +4,40 @@
 #
 # Before running the sample, make sure, that the `openai` package is installed
 # and that the model you are running has a big enough context window to fit the
-# whole input document.
+# whole input document. Alternatively, enable the chunked mode below, which
+# only sends a limited number of pages per request.
+#
+# For documents with clear heading styles, the table of contents can also be
+# generated from font metrics alone, without any LLM. See TOC_ENGINE below.
 #
 # Default settings are set to use a Qwen 2.5 model on a local Ollama instance.
 # The default Ollama context window is small, so make sure to change it using
 # the instructions below.
 #
+import asyncio
 import sys
 
 import itextpy
 itextpy.load()
 
+from itextpy.extraction import iter_pages_text
 from itextpy.util import disposing
 
 from pathlib import Path
-from sys import stderr
 
+from _caption_index import PageLocator
+from _font_headings import Heading, assign_levels, collect_lines, find_heading_candidates
+
+from System.IO import Stream
 from iText.Kernel.Geom import PageSize
-from iText.Kernel.Pdf.Canvas.Parser import PdfTextExtractor
 from iText.Kernel.Pdf.Canvas.Parser.Listener import LocationTextExtractionStrategy
-from iText.Kernel.Pdf import PdfOutline, PdfReader, PdfWriter, PdfDocument
+from iText.Kernel.Pdf import PdfOutline, PdfPage, PdfReader, PdfWriter, PdfDocument
 from iText.Kernel.Pdf.Action import PdfAction
 from iText.Kernel.Pdf.Canvas.Draw import DottedLine
 from iText.Kernel.Pdf.Navigation import PdfExplicitDestination
-from iText.Layout import Canvas
-from iText.Layout.Element import List, ListItem, Paragraph, Tab, TabStop
-from iText.Layout.Properties import ListNumberingType, TabAlignment
+from iText.Layout import Document
+from iText.Layout.Element import AreaBreak, List, ListItem, Paragraph, Tab, TabStop
+from iText.Layout.Properties import AreaBreakType, ListNumberingType, TabAlignment
 
 SCRIPT_DIR = Path(__file__).parent.absolute()
 RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
@@ -55,6 +63,34 @@ OPENAI_BASE_URL = "http://localhost:11434/v1"   # Default local Ollama URL
 OPENAI_API_KEY = "EMPTY"                        # No API key needed for Ollama
 OPENAI_MODEL = "qwen2.5"
 
+#
+# This block configures the chunked mode. Instead of sending the whole
+# document in one request, pages are split into windows, which fit into the
+# token budget, and each window is sent as a separate request. Requests run
+# concurrently, and the partial tables of contents are merged afterward.
+#
+# This keeps the context window usage bounded and reduces latency for long
+# documents, but the model sees less context, so the result might be a bit
+# less consistent.
+#
+USE_CHUNKED_MODE = False
+CHUNK_TOKEN_BUDGET = 8192       # Estimated tokens of page text per request
+MAX_CONCURRENT_REQUESTS = 4
+
+#
+# This block selects, how the table of contents is generated:
+#   "llm"    - the LLM reads the whole text of the document.
+#   "fonts"  - headings are detected from font size and weight, and then
+#              clustered into levels. No LLM is needed, and this is orders of
+#              magnitude faster, but it only works well for documents with
+#              consistent heading styles.
+#   "hybrid" - heading candidates are detected from fonts, and only they are
+#              sent to the LLM instead of the whole text. This makes the prompt
+#              much smaller, while the LLM still decides the final structure.
+#
+TOC_ENGINE = "llm"
+MAX_HEADING_LEVELS = 3
+
 
 # This is a tree-like structure for storing table of contents data. Root is a
 # node without a caption.
@@ -75,15 +111,14 @@ class TableEntry:
                 yield node
 
 
-# This function converts pages of the PDF document to text.
-def get_pages_as_text(doc: PdfDocument) -> list[str]:
-    text_extractor = PdfTextExtractor()
+# This function converts pages of the PDF document to text. Pages are
+# extracted in parallel, each worker thread with its own reader, since a
+# PdfDocument cannot be shared between threads.
+def get_pages_as_text(in_path: str) -> list[str]:
     # This is the default strategy, which works relatively fine. But you might
     # get a better result with a custom one, which tries to preserve spacial
-    # data with whitespace.
-    strategy = LocationTextExtractionStrategy()
-    pages = (doc.GetPage(i + 1) for i in range(doc.GetNumberOfPages()))
-    return [text_extractor.GetTextFromPage(page, strategy) for page in pages]
+    # data with whitespace. A new strategy instance is created for each page.
+    return list(iter_pages_text(in_path, LocationTextExtractionStrategy))
 
 
 # This function removes a <think>...</think> block at the start of the LLM
@@ -95,22 +130,30 @@ def strip_think(response_data: str) -> str:
 
 
 # This function parses the ToC LLM response into a tree-like structure.
+#
+# Each entry is attached to the entry with the longest numbering prefix,
+# which exists. Numbering can have gaps, and entries with missing parents
+# just stay on a higher level. Lines, which don't start with a number, are
+# skipped.
 def parse_response(response_lines: list[str]) -> TableEntry:
     result = TableEntry()
+    entries = {(): result}
     for line in response_lines:
         # We expect strings like "1.2.3 Chapter" here
-        stripped = line.strip()
-        if not stripped:
+        index_str, _, caption = line.strip().partition(" ")
+        caption = caption.strip()
+        try:
+            index_seq = tuple(int(i) for i in index_str.split(".") if i)
+        except ValueError:
+            continue
+        if not index_seq or not caption:
             continue
-        index_str, caption = stripped.split(" ", maxsplit=1)
-        index_seq = [int(i) for i in index_str.split(".") if i]
-        entry_list = result.children
-        for index in index_seq[:-1]:
-            entry_list = entry_list[index - 1].children
-        pos = index_seq[-1] - 1
-        if pos != len(entry_list):
-            print(f"Unexpected index value: {pos} != {len(entry_list)}", file=stderr)
-        entry_list.append(TableEntry(caption))
+        parent_seq = index_seq[:-1]
+        while parent_seq not in entries:
+            parent_seq = parent_seq[:-1]
+        entry = TableEntry(caption)
+        entries[parent_seq].children.append(entry)
+        entries[index_seq] = entry
     return result
 
 
@@ -120,112 +163,314 @@ def parse_response(response_lines: list[str]) -> TableEntry:
 # Since LLM is not that reliable with giving a precise location for entries,
 # we will assume, that we can find them in the original text and recover the
 # page data that way. This is not ideal, but work relatively well in practice.
+#
+# Entries are searched in order, each one after the previous match. All the
+# captions are located with a single pass over the document text, so this
+# stays fast even for very long documents with big tables of contents.
 def add_page_data(toc_data: TableEntry, pages: list[str]) -> None:
-    casefold_pages = [p.casefold() for p in pages]
-    prev_page_idx = 0
-    prev_str_idx = 0
-    for node in toc_data:
-        for page_offset, page in enumerate(casefold_pages[prev_page_idx:]):
-            casefold_caption = node.caption.casefold()
-            str_idx = page.find(casefold_caption, prev_str_idx if page_offset == 0 else 0)
-            if str_idx != -1:
-                prev_page_idx += page_offset
-                prev_str_idx = str_idx + len(casefold_caption)
-                break
-        node.page_idx = prev_page_idx
+    nodes = list(toc_data)
+    locator = PageLocator(pages, [node.caption for node in nodes])
+    for node, page_idx in zip(nodes, locator.locate_all()):
+        node.page_idx = page_idx
 
 
-# This function ask the LLM to generate the table of contents for the provided
-# pages of text. The result gets parsed into a tree-like structure.
-def generate_toc_data(pages: list[str]) -> TableEntry:
+# This function imports the OpenAI client module or exits, if it is not
+# available.
+def import_openai():
     try:
-        from openai import OpenAI
+        import openai
     except ImportError:
         print('ai/table_of_contents.py sample requires openai package, '
               'skipping...', file=sys.stderr)
         sys.exit()
+    return openai
 
-    openai_client = OpenAI(
-        base_url=OPENAI_BASE_URL,
-        api_key=OPENAI_API_KEY,
-    )
-    messages = [
+
+# This function creates the chat messages, which ask the LLM to generate the
+# table of contents for the provided pages of text.
+def create_toc_messages(pages: list[str], intro: str, request: str) -> list[dict]:
+    return [
         {"role": "system", "content": "You are a helpful assistant."},
-        {"role": "user", "content": "You are about to read text of a PDF document:"},
+        {"role": "user", "content": intro},
         {"role": "user", "content": "\n\n".join(pages)},
-        {"role": "user", "content": "Generate a numbered table of contents for the document. "
+        {"role": "user", "content": request + " "
                                     "Write only the table entries. "
                                     "Try to use strings from the document as entry names."},
     ]
+
+
+# This function ask the LLM to generate the table of contents for all the
+# pages at once. The result gets parsed into a tree-like structure.
+def generate_single_toc_data(pages: list[str]) -> TableEntry:
+    openai = import_openai()
+    openai_client = openai.OpenAI(
+        base_url=OPENAI_BASE_URL,
+        api_key=OPENAI_API_KEY,
+    )
+    messages = create_toc_messages(
+        pages,
+        "You are about to read text of a PDF document:",
+        "Generate a numbered table of contents for the document.",
+    )
     response = openai_client.chat.completions.create(
         model=OPENAI_MODEL,
         messages=messages,
         temperature=0.1,
     )
     response_content = response.choices[0].message.content
-    toc_data = parse_response(strip_think(response_content).splitlines())
+    return parse_response(strip_think(response_content).splitlines())
+
+
+# This function roughly estimates the number of tokens in the text. It is
+# about 4 characters per token for English text, which is good enough for
+# splitting the document, as the budget is not a hard limit anyway.
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+# This function splits the pages into windows of consecutive pages, which fit
+# into the token budget. A page, which doesn't fit into the budget by itself,
+# gets a window of its own.
+def split_into_chunks(pages: list[str], token_budget: int) -> list[range]:
+    chunks = []
+    start = 0
+    chunk_tokens = 0
+    for page_idx, page in enumerate(pages):
+        page_tokens = estimate_tokens(page)
+        if page_idx > start and chunk_tokens + page_tokens > token_budget:
+            chunks.append(range(start, page_idx))
+            start = page_idx
+            chunk_tokens = 0
+        chunk_tokens += page_tokens
+    chunks.append(range(start, len(pages)))
+    return chunks
+
+
+# This function parses the ToC LLM response for a window of pages into a
+# flat list of headings. We expect strings like "2 Section" here, where the
+# number is the level of the heading in the whole document, starting from 1.
+# Lines, which don't start with a level, are skipped.
+def parse_chunk_response(response_lines: list[str]) -> list[Heading]:
+    result = []
+    for line in response_lines:
+        level_str, _, caption = line.strip().partition(" ")
+        caption = caption.strip()
+        if not level_str.isdigit() or not caption:
+            continue
+        result.append(Heading(max(int(level_str), 1) - 1, caption, None))
+    return result
+
+
+# This function merges the headings of all the windows into a single list in
+# page order. Windows are processed independently, so a window, which starts
+# in the middle of a section, might repeat the headings of the sections,
+# which are still open. Such headings are dropped, so the section just
+# continues over the window boundary. Levels are the same in all the windows,
+# so subsections of a continued section stay inside of it.
+def merge_chunk_headings(chunk_headings: list[list[Heading]]) -> list[Heading]:
+    result = []
+    # Captions of the sections, which are still open, by level
+    open_sections = {}
+    for headings in chunk_headings:
+        start = 0
+        while start < len(headings):
+            heading = headings[start]
+            if open_sections.get(heading.level, "").casefold() != heading.caption.casefold():
+                break
+            start += 1
+        for heading in headings[start:]:
+            open_sections = {level: caption for level, caption in open_sections.items() if level < heading.level}
+            open_sections[heading.level] = heading.caption
+            result.append(heading)
+    return result
+
+
+# This function asks the LLM to generate the table of contents for a single
+# window of pages. Numbering would restart in every window, so the LLM is
+# asked for the heading levels in the whole document instead, which stay the
+# same over the window boundaries.
+async def generate_chunk_toc_data(openai_client, semaphore: asyncio.Semaphore,
+                                  pages: list[str], chunk: range) -> list[Heading]:
+    messages = create_toc_messages(
+        [pages[i] for i in chunk],
+        f"You are about to read text of pages {chunk.start + 1}-{chunk.stop} of a PDF document:",
+        "Generate a table of contents for these pages only. "
+        "Write each entry on its own line as the level of the heading in the whole document, "
+        "where 1 is the top level, followed by a space and the heading, like \"2 Heading\". "
+        "Keep the levels, which the headings have in the whole document, "
+        "even if the pages start in the middle of a section.",
+    )
+    async with semaphore:
+        response = await openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.1,
+        )
+    response_content = response.choices[0].message.content
+    return parse_chunk_response(strip_think(response_content).splitlines())
+
+
+# This function asks the LLM to generate the table of contents for windows of
+# pages concurrently, and then merges the results in page order.
+async def generate_chunked_toc_data(pages: list[str]) -> TableEntry:
+    openai = import_openai()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with openai.AsyncOpenAI(base_url=OPENAI_BASE_URL, api_key=OPENAI_API_KEY) as openai_client:
+        chunk_headings = await asyncio.gather(*(
+            generate_chunk_toc_data(openai_client, semaphore, pages, chunk)
+            for chunk in split_into_chunks(pages, CHUNK_TOKEN_BUDGET)
+        ))
+    return build_toc_data(merge_chunk_headings(chunk_headings))
+
+
+# This function ask the LLM to generate the table of contents for the provided
+# pages of text. The result gets parsed into a tree-like structure.
+#
+# If prompt pages are provided, then they are sent to the LLM instead of the
+# full text, but entries are still located in the full text.
+def generate_toc_data(pages: list[str], prompt_pages: list[str] | None = None) -> TableEntry:
+    if prompt_pages is None:
+        prompt_pages = pages
+    if USE_CHUNKED_MODE:
+        toc_data = asyncio.run(generate_chunked_toc_data(prompt_pages))
+    else:
+        toc_data = generate_single_toc_data(prompt_pages)
     add_page_data(toc_data, pages)
     return toc_data
 
 
+# This function builds the table of contents tree from the detected headings.
+# Each heading becomes a child of the closest preceding heading with a higher
+# level. Page data is copied from the headings, when it is known already, so
+# there is no need to search for it.
+def build_toc_data(headings: list[Heading]) -> TableEntry:
+    result = TableEntry()
+    # Stack of (level, entry) pairs for the current branch of the tree
+    stack = [(-1, result)]
+    for heading in headings:
+        while stack[-1][0] >= heading.level:
+            stack.pop()
+        entry = TableEntry(heading.caption)
+        entry.page_idx = heading.page_idx
+        stack[-1][1].children.append(entry)
+        stack.append((heading.level, entry))
+    return result
+
+
+# This function converts heading candidates to text pages for the LLM prompt.
+# Every page is kept, even if it has no candidates, so that the LLM still
+# sees the page boundaries.
+def get_heading_candidates_as_text(doc: PdfDocument) -> list[str]:
+    candidate_pages = [[] for _ in range(doc.GetNumberOfPages())]
+    for line in find_heading_candidates(collect_lines(doc)):
+        candidate_pages[line.page_idx].append(line.text)
+    return ["\n".join(lines) for lines in candidate_pages]
+
+
 # This function just recursively generates the Bookmarks tree for the
 # resulting PDF document.
-def fill_outline(doc: PdfDocument, outline_root: PdfOutline, toc_children: list[TableEntry]) -> None:
+def fill_outline(content_pages: list[PdfPage], outline_root: PdfOutline, toc_children: list[TableEntry]) -> None:
     for entry in toc_children:
-        page_num = entry.page_idx + 1
         outline = outline_root.AddOutline(entry.caption)
-        # +1 since we added the ToC page at the start
-        outline.AddDestination(PdfExplicitDestination.CreateFit(doc.GetPage(page_num + 1)))
+        outline.AddDestination(PdfExplicitDestination.CreateFit(content_pages[entry.page_idx]))
         if entry.children:
-            fill_outline(doc, outline, entry.children)
+            fill_outline(content_pages, outline, entry.children)
 
 
 # This function recursively generates a table of contents, using numbered list
 # from the iText layout engine.
-def generate_list(doc: PdfDocument, tab_stops: list[TabStop], toc_children: list[TableEntry]) -> List:
+#
+# Page numbers are shifted by the number of pages, which the table of contents
+# itself takes. Links are only added, if content pages are provided.
+def generate_list(content_pages: list[PdfPage] | None, tab_stops: list[TabStop],
+                  toc_children: list[TableEntry], page_offset: int) -> List:
     l = List(ListNumberingType.DECIMAL)
     for entry in toc_children:
-        page_num = entry.page_idx + 1
-        # +1 since we added the ToC page at the start
-        page_dest = PdfExplicitDestination.CreateFit(doc.GetPage(page_num + 1))
+        page_num = entry.page_idx + 1 + page_offset
         p = (Paragraph()
              .SetMargin(2)
              .SetFontSize(12)
              .AddTabStops(tab_stops)
              .Add(entry.caption)
              .Add(Tab())
-             .Add(str(page_num))
-             .SetAction(PdfAction.CreateGoTo(page_dest)))
+             .Add(str(page_num)))
+        if content_pages is not None:
+            page_dest = PdfExplicitDestination.CreateFit(content_pages[entry.page_idx])
+            p.SetAction(PdfAction.CreateGoTo(page_dest))
         item = ListItem()
         item.Add(p)
         if entry.children:
-            item.Add(generate_list(doc, tab_stops, entry.children))
+            item.Add(generate_list(content_pages, tab_stops, entry.children, page_offset))
         l.Add(item)
     return l
 
 
-# This function creates a page with the table of contents and prepends it to
+# This function adds the table of contents to the layout document. Content
+# flows onto as many pages, as needed.
+def layout_toc(document: Document, page_size: PageSize, toc_data: TableEntry,
+               content_pages: list[PdfPage] | None, page_offset: int) -> None:
+    header = (Paragraph("Table of Contents")
+              .SetFontSize(24))
+    document.Add(header)
+    content_width = page_size.GetWidth() - document.GetLeftMargin() - document.GetRightMargin()
+    page_num_tab_stop = TabStop(content_width, TabAlignment.RIGHT, DottedLine())
+    document.Add(generate_list(content_pages, [page_num_tab_stop], toc_data.children, page_offset))
+
+
+# This function lays out the table of contents in a throwaway document, which
+# is never written anywhere, and returns the number of pages it takes.
+def count_toc_pages(page_size: PageSize, toc_data: TableEntry, page_offset: int) -> int:
+    with disposing(PdfDocument(PdfWriter(Stream.Null))) as measure_doc:
+        document = Document(measure_doc, page_size)
+        layout_toc(document, page_size, toc_data, None, page_offset)
+        document.Flush()
+        return measure_doc.GetNumberOfPages()
+
+
+# This function creates pages with the table of contents and prepends them to
 # the PDF document. If there are no bookmarks present, then they will be added
 # too.
 #
-# This function at the moment assumes, that everything will fit into one page.
+# Page numbers in the table depend on how many pages the table itself takes,
+# so the table is laid out without the document first to count them. Usually
+# one extra pass is enough, as only the widths of page numbers can change.
+# The count only ever grows, so this always ends, even if the layout would
+# flip between two counts. If the table ends up shorter, than the count, it
+# is padded with empty pages, so that the page numbers stay correct. Then
+# the table is laid out after the last page of the document, and its pages
+# are moved to the start. Destinations point to page objects, so they
+# stay correct, when pages are shifted, and existing content is not touched.
 def add_toc_to_doc(doc: PdfDocument, toc_data: TableEntry) -> None:
     page_size = PageSize(doc.GetPage(1).GetPageSize())
-    toc_page = doc.AddNewPage(1, page_size)
-    content_box = (toc_page.GetCropBox()
-                   .ApplyMargins(36, 36, 36, 36, False))
-    with disposing(Canvas(toc_page, content_box)) as toc_canvas:
-        header = (Paragraph("Table of Contents")
-                  .SetFontSize(24))
-        toc_canvas.Add(header)
-        page_num_tab_stop = TabStop(content_box.GetWidth(), TabAlignment.RIGHT, DottedLine())
-        toc_canvas.Add(generate_list(doc, [page_num_tab_stop], toc_data.children))
+    content_pages = [doc.GetPage(page_num) for page_num in range(1, doc.GetNumberOfPages() + 1)]
+
+    toc_page_count = 1
+    while True:
+        needed_page_count = count_toc_pages(page_size, toc_data, toc_page_count)
+        if needed_page_count <= toc_page_count:
+            break
+        toc_page_count = needed_page_count
+
+    first_toc_page_num = doc.GetNumberOfPages() + 1
+    # Pages cannot be moved, once they are flushed, so immediate flush is off.
+    # The document is not closed either, since it would close the PDF document
+    document = Document(doc, page_size, False)
+    # Start on a new page after the existing content, instead of drawing over
+    # the first page
+    document.Add(AreaBreak(AreaBreakType.LAST_PAGE))
+    document.Add(AreaBreak(AreaBreakType.NEXT_PAGE))
+    layout_toc(document, page_size, toc_data, content_pages, toc_page_count)
+    document.Flush()
+    while doc.GetNumberOfPages() - first_toc_page_num + 1 < toc_page_count:
+        doc.AddNewPage(page_size)
+    for i in range(doc.GetNumberOfPages() - first_toc_page_num + 1):
+        doc.MovePage(first_toc_page_num + i, i + 1)
 
     # Now adding bookmarks as well
     outline_root = doc.GetOutlines(True)
     # Do not ruin existing bookmarks...
     if len(outline_root.GetAllChildren()) == 0:
-        fill_outline(doc, doc.GetOutlines(True), toc_data.children)
+        fill_outline(content_pages, outline_root, toc_data.children)
 
 
 # The algorithm is pretty straightforward:
@@ -233,12 +478,19 @@ def add_toc_to_doc(doc: PdfDocument, toc_data: TableEntry) -> None:
 #   2. Send pages to an LLM and ask it to generate the table of contents.
 #   3. Parse the LLM response.
 #   4. Generate and add the table of contents page, together with bookmarks.
+#
+# With the "fonts" engine steps 1-3 are replaced with heading detection.
 def main(in_path: str, out_path: str) -> None:
     with disposing(PdfDocument(PdfReader(in_path), PdfWriter(out_path))) as doc:
-        pages = get_pages_as_text(doc)
-        if not pages:
-            raise Exception("Document is empty!")
-        toc_data = generate_toc_data(pages)
+        if TOC_ENGINE == "fonts":
+            headings = find_heading_candidates(collect_lines(doc))
+            toc_data = build_toc_data(assign_levels(headings, MAX_HEADING_LEVELS))
+        else:
+            pages = get_pages_as_text(in_path)
+            if not pages:
+                raise Exception("Document is empty!")
+            prompt_pages = get_heading_candidates_as_text(doc) if TOC_ENGINE == "hybrid" else None
+            toc_data = generate_toc_data(pages, prompt_pages)
         if not toc_data.children:
             raise Exception("Table of Contents is empty!")
         add_toc_to_doc(doc, toc_data)
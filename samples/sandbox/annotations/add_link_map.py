@@ -0,0 +1,49 @@
+import itextpy
+itextpy.load()
+
+from itextpy.annotations import Link, add_links
+from itextpy.util import disposing
+
+from pathlib import Path
+
+from iText.Kernel.Pdf import PdfReader, PdfWriter, PdfDocument
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+SRC = str(RESOURCES_DIR / "pdfs" / "primes.pdf")
+
+# Size of a single cell of the navigation strip
+CELL_WIDTH = 24
+CELL_HEIGHT = 16
+
+
+# This function creates the link map. It adds a navigation strip to the
+# bottom of each page with a link to every page of the document, and a link
+# to the iText website at the top of each page. The strip is wrapped into
+# rows, which fit between the page margins, and grows upwards.
+def create_link_map(pdf_doc):
+    page_count = pdf_doc.GetNumberOfPages()
+    for page in range(1, page_count + 1):
+        page_size = pdf_doc.GetPage(page).GetPageSize()
+        columns = max(1, int((page_size.GetWidth() - 72) // CELL_WIDTH))
+        rows = (page_count + columns - 1) // columns
+        for target in range(1, page_count + 1):
+            row, column = divmod(target - 1, columns)
+            x = page_size.GetLeft() + 36 + column * CELL_WIDTH
+            y = page_size.GetBottom() + 18 + (rows - 1 - row) * CELL_HEIGHT
+            yield Link(page, (x, y, x + CELL_WIDTH, y + CELL_HEIGHT), target)
+        top = page_size.GetTop()
+        yield Link(page, (36, top - 36, 136, top - 18), "https://itextpdf.com/")
+
+
+# All the links are added in a single call. Links with the same target
+# share their action, so the output only grows by the annotation
+# dictionaries themselves.
+def manipulate_pdf(dest):
+    with disposing(PdfDocument(PdfReader(SRC), PdfWriter(dest))) as pdf_doc:
+        target_count = add_links(pdf_doc, create_link_map(pdf_doc))
+        print(f'Added links to {target_count} distinct targets')
+
+
+if __name__ == "__main__":
+    manipulate_pdf(str(SCRIPT_DIR / "add_link_map.pdf"))
@@ -0,0 +1,47 @@
+import itextpy
+itextpy.load()
+
+from itextpy.annotations import read_rects, write_rects
+from itextpy.util import disposing
+
+import sys
+from pathlib import Path
+
+from iText.Kernel.Pdf import PdfName, PdfReader, PdfWriter, PdfDocument
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+SRC = str(RESOURCES_DIR / "pdfs" / "hello_sticky_note.pdf")
+
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        print('annotations/move_annotations_bulk.py sample requires numpy package, '
+              'skipping...', file=sys.stderr)
+        sys.exit()
+    return numpy
+
+
+# This sample does the same, as move_popup.py, but for all the sticky notes
+# and pop-ups in the document at once. Rectangles are read into NumPy arrays
+# with a single call, moved with array operations and written back with
+# another single call, so the number of calls into .NET doesn't grow with
+# the number of annotations.
+def manipulate_pdf(dest):
+    np = import_numpy()
+    with disposing(PdfDocument(PdfReader(SRC), PdfWriter(dest))) as pdf_doc:
+        # Make sticky notes bigger, growing them left and down
+        sticky = read_rects(pdf_doc, subtypes=[PdfName.Text])
+        sticky.rects[:] += np.array([-120, -70, 0, -30])
+        write_rects(pdf_doc, sticky)
+
+        # Move pop-up windows to the left, making them shorter
+        popups = read_rects(pdf_doc, subtypes=[PdfName.Popup])
+        popups.rects[:] += np.array([-250, 0, 0, -250])
+        write_rects(pdf_doc, popups)
+
+
+if __name__ == "__main__":
+    manipulate_pdf(str(SCRIPT_DIR / "move_annotations_bulk.pdf"))
@@ -1,16 +1,16 @@
 import itextpy
 itextpy.load()
 
-from itextpy.util import disposing
+from itextpy.pdfa import create_output_intent
+from itextpy.util import bytes_to_clr, disposing
 
 import csv
 from pathlib import Path
 
-from System.IO import FileAccess, FileMode, FileStream
 from iText.IO.Font import PdfEncodings
 from iText.Kernel.Font import PdfFontFactory
 from iText.Kernel.Geom import PageSize
-from iText.Kernel.Pdf import PdfAConformance, PdfDate, PdfDictionary, PdfName, PdfOutputIntent, PdfWriter
+from iText.Kernel.Pdf import PdfAConformance, PdfDate, PdfDictionary, PdfName, PdfWriter
 from iText.Kernel.Pdf.Filespec import PdfFileSpec
 from iText.Layout import Document
 from iText.Layout.Element import Cell, Paragraph, Table
@@ -38,8 +38,9 @@ def manipulate_pdf(dest):
     font = PdfFontFactory.CreateFont(FONT_REGULAR, PdfEncodings.IDENTITY_H)
     bold = PdfFontFactory.CreateFont(FONT_BOLD, PdfEncodings.IDENTITY_H)
 
-    with disposing(FileStream(ICC_PATH, FileMode.Open, FileAccess.Read)) as icc_stream:
-        intent = PdfOutputIntent("Custom", "", None, "sRGB IEC61966-2.1", icc_stream)
+    # The ICC profile is read and parsed only once, even when many documents
+    # are created, only the intent itself is new for every document
+    intent = create_output_intent(ICC_PATH, "Custom", "", None, "sRGB IEC61966-2.1")
     with (disposing(PdfADocument(PdfWriter(dest), PdfAConformance.PDF_A_3B, intent)) as pdf_doc,
           disposing(Document(pdf_doc, PageSize.A4.Rotate())) as document):
         parameters = PdfDictionary()
@@ -48,7 +49,7 @@ def manipulate_pdf(dest):
         # Embeds file to the document
         file_spec = PdfFileSpec.CreateEmbeddedFileSpec(
             pdf_doc,
-            Path(DATA_CSV_PATH).read_bytes(),
+            bytes_to_clr(Path(DATA_CSV_PATH).read_bytes()),
             "united_states.csv",
             "united_states.csv",
             PdfName("text/csv"),
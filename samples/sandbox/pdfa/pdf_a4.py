@@ -1,15 +1,15 @@
 import itextpy
 itextpy.load()
 
+from itextpy.pdfa import create_output_intent
 from itextpy.util import disposing
 
 from pathlib import Path
 
-from System.IO import FileAccess, FileMode, FileStream
 from iText.IO.Font import PdfEncodings
 from iText.IO.Image import ImageDataFactory
 from iText.Kernel.Font import PdfFontFactory
-from iText.Kernel.Pdf import PdfAConformance, PdfOutputIntent, PdfWriter
+from iText.Kernel.Pdf import PdfAConformance, PdfWriter
 from iText.Layout import Document
 from iText.Layout.Element import Image, Paragraph
 from iText.Pdfa import PdfADocument
@@ -22,8 +22,7 @@ IMG_PATH = str(RESOURCES_DIR / "img" / "hero.jpg")
 
 
 def manipulate_pdf(dest):
-    with disposing(FileStream(ICC_PATH, FileMode.Open, FileAccess.Read)) as icc_stream:
-        intent = PdfOutputIntent("Custom", "", None, "sRGB IEC61966-2.1", icc_stream)
+    intent = create_output_intent(ICC_PATH, "Custom", "", None, "sRGB IEC61966-2.1")
     with (disposing(PdfADocument(PdfWriter(dest), PdfAConformance.PDF_A_4, intent)) as pdf_doc,
           disposing(Document(pdf_doc)) as document):
         logo_image = Image(ImageDataFactory.Create(IMG_PATH))
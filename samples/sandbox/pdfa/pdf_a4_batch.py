@@ -0,0 +1,73 @@
+import itextpy
+itextpy.load()
+
+from itextpy.io import render_to_bytes
+from itextpy.pdfa import PdfABatch, create_output_intent
+from itextpy.util import disposing
+
+import time
+from pathlib import Path
+
+from iText.IO.Font import PdfEncodings
+from iText.Kernel.Font import PdfFontFactory
+from iText.Kernel.Pdf import PdfAConformance, PdfWriter
+from iText.Layout import Document
+from iText.Layout.Element import Paragraph
+from iText.Pdfa import PdfADocument
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+ICC_PATH = str(RESOURCES_DIR / "data" / "sRGB_CS_profile.icm")
+FONT_PATH = str(RESOURCES_DIR / "font" / "OpenSans-Regular.ttf")
+DOCUMENT_COUNT = 20
+LINE_COUNT = 50
+
+
+def create_document(create_pdf_doc, stream, number):
+    with (disposing(create_pdf_doc(PdfWriter(stream))) as pdf_doc,
+          disposing(Document(pdf_doc)) as document):
+        font = PdfFontFactory.CreateFont(FONT_PATH, PdfEncodings.IDENTITY_H)
+        # The heading and the lines are the same in every document, so their
+        # checks are done only once, but the numbers differ and are checked
+        # every time
+        document.Add(Paragraph("Monthly statement").SetFont(font).SetFontSize(16))
+        document.Add(Paragraph(f"Statement number {number}").SetFont(font).SetFontSize(10))
+        for line in range(LINE_COUNT):
+            document.Add(Paragraph(f"Line {line + 1}: no changes this month").SetFont(font).SetFontSize(10))
+
+
+def create_plain_document(writer):
+    intent = create_output_intent(ICC_PATH, "Custom", "", None, "sRGB IEC61966-2.1")
+    return PdfADocument(writer, PdfAConformance.PDF_A_4, intent)
+
+
+def render_all(create_pdf_doc):
+    # The first document warms everything up, so it is not timed
+    render_to_bytes(lambda stream: create_document(create_pdf_doc, stream, 0))
+    start = time.perf_counter()
+    results = [render_to_bytes(lambda stream: create_document(create_pdf_doc, stream, i + 1))
+               for i in range(DOCUMENT_COUNT)]
+    return results, time.perf_counter() - start
+
+
+def manipulate_pdf(dest_dir: Path):
+    _, plain_seconds = render_all(create_plain_document)
+
+    # Every fifth document is checked fully, the rest only skips font checks,
+    # which already passed for the same text earlier in the batch
+    batch = PdfABatch(PdfAConformance.PDF_A_4, ICC_PATH, "Custom", "", None, "sRGB IEC61966-2.1",
+                      verify_every=5)
+    results, batch_seconds = render_all(batch.create_document)
+    for i, data in enumerate(results):
+        (dest_dir / f"pdf_a4_batch_{i + 1}.pdf").write_bytes(data)
+
+    print(f"{'Rule':<24}{'Checks':>8}{'Skipped':>9}{'Time, ms':>10}")
+    for timing in batch.profile.timings():
+        print(f"{timing.rule:<24}{timing.checks:>8}{timing.skipped:>9}{timing.seconds * 1000:>10.2f}")
+    print(f"PdfADocument: {plain_seconds * 1000:.2f} ms for {DOCUMENT_COUNT} documents")
+    print(f"PdfABatch: {batch_seconds * 1000:.2f} ms for {DOCUMENT_COUNT} documents, "
+          f"{plain_seconds / batch_seconds:.2f}x faster")
+
+
+if __name__ == "__main__":
+    manipulate_pdf(SCRIPT_DIR)
@@ -0,0 +1,69 @@
+import itextpy
+itextpy.load()
+
+from itextpy.pdfua import StructureTreeMonitor, create_streaming_ua_document
+from itextpy.util import disposing
+
+from pathlib import Path
+
+from iText.IO.Font import PdfEncodings
+from iText.Kernel.Font import PdfFontFactory
+from iText.Kernel.Pdf import PdfUAConformance
+from iText.Kernel.Pdf.Tagging import StandardRoles
+from iText.Layout import Document
+from iText.Layout.Element import Cell, Paragraph, Table
+from iText.Pdfua import PdfUAConfig
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+FONT_PATH = str(RESOURCES_DIR / "font" / "FreeSans.ttf")
+SECTION_COUNT = 100
+ROWS_PER_SECTION = 60
+
+
+def add_section(document: Document, number: int) -> None:
+    heading = Paragraph(f"Section {number}").SetFontSize(16)
+    heading.GetAccessibilityProperties().SetRole(StandardRoles.H1)
+    document.Add(heading)
+
+    table = Table(3).UseAllAvailableWidth()
+    for caption in ("Item", "Quantity", "Price"):
+        header_cell = Cell().Add(Paragraph(caption))
+        header_cell.GetAccessibilityProperties().SetRole(StandardRoles.TH)
+        table.AddHeaderCell(header_cell)
+    for row in range(ROWS_PER_SECTION):
+        table.AddCell(Cell().Add(Paragraph(f"Item {number}.{row + 1}")))
+        table.AddCell(Cell().Add(Paragraph(str(row % 7 + 1))))
+        table.AddCell(Cell().Add(Paragraph(f"{(row * 13) % 100 + 0.99:.2f}")))
+    document.Add(table)
+
+
+def manipulate_pdf(dest):
+    ua_config = PdfUAConfig(PdfUAConformance.PDF_UA_1, "Large report", "en-US")
+    # Unlike PdfUADocument, this document flushes finished pages together
+    # with their tags, so memory doesn't grow with the number of pages. It
+    # runs no PDF/UA checks, so it doesn't claim PDF/UA conformance either
+    with disposing(create_streaming_ua_document(dest, ua_config)) as pdf_doc:
+        monitor = StructureTreeMonitor(pdf_doc, every=25)
+        with disposing(Document(pdf_doc)) as document:
+            font = PdfFontFactory.CreateFont(
+                FONT_PATH,
+                PdfEncodings.WINANSI,
+                PdfFontFactory.EmbeddingStrategy.PREFER_EMBEDDED
+            )
+            document.SetFont(font)
+            for i in range(SECTION_COUNT):
+                add_section(document, i + 1)
+            final = monitor.sample()
+        monitor.close()
+
+    for stats in monitor.history:
+        print(f"Page {stats.page_count}: {stats.pages_in_memory} pages, "
+              f"{stats.elements_in_memory} structure elements and "
+              f"{stats.marked_contents_in_memory} marked contents in memory")
+    print(f"Peak at page {monitor.peak.page_count}: {monitor.peak.elements_in_memory} structure elements, "
+          f"before closing: {final.elements_in_memory}")
+
+
+if __name__ == "__main__":
+    manipulate_pdf(str(SCRIPT_DIR / "streaming_pdf_ua.pdf"))
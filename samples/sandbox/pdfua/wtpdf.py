@@ -1,18 +1,18 @@
 import itextpy
 itextpy.load()
 
+from itextpy.pdfa import create_output_intent
 from itextpy.util import clr_try_cast, disposing
+from itextpy.xmp import XmpTemplate
 
 from pathlib import Path
 
-from System.IO import FileAccess, FileMode, FileStream
+from System.IO import FileMode, FileStream
 from iText.Html2pdf import ConverterProperties, HtmlConverter
 from iText.Html2pdf.Attach import ITagWorker, ProcessorContext
 from iText.Html2pdf.Attach.Impl import DefaultTagWorkerFactory
 from iText.Html2pdf.Attach.Impl.Tags import HTagWorker
-from iText.Kernel.Pdf import PdfAConformance, PdfOutputIntent, PdfString, \
-    PdfVersion, PdfViewerPreferences, PdfWriter, WriterProperties
-from iText.Kernel.XMP import XMPMetaFactory
+from iText.Kernel.Pdf import PdfAConformance, PdfVersion, PdfViewerPreferences, PdfWriter, WriterProperties
 from iText.Layout import IPropertyContainer
 from iText.Layout.Element import Div, Paragraph
 from iText.Pdfa import PdfADocument
@@ -25,6 +25,10 @@ HTML_PATH = str(WTPDF_RESOURCES_DIR / "article.html")
 ICC_PATH = str(WTPDF_RESOURCES_DIR / "sRGB Color Space Profile.icm")
 XMP_PATH = str(WTPDF_RESOURCES_DIR / "simplePdfUA2.xmp")
 
+# Declarations and conformance parts are the same for every document, so
+# they are parsed once, only the title and language differ
+XMP_TEMPLATE = XmpTemplate.from_file(XMP_PATH)
+
 
 class CustomTagWorkerFactory(DefaultTagWorkerFactory):
     # This is the namespace for this object in .NET
@@ -62,19 +66,15 @@ class CustomHTagWorker(HTagWorker):
 
 
 def manipulate_pdf(dest):
-    with disposing(FileStream(ICC_PATH, FileMode.Open, FileAccess.Read)) as icc_stream:
-        intent = PdfOutputIntent("Custom", "", None, "sRGB IEC61966-2.1", icc_stream)
+    # The parsed ICC profile is cached, so this stays cheap for every document
+    intent = create_output_intent(ICC_PATH, "Custom", "", None, "sRGB IEC61966-2.1")
     writer_props = WriterProperties().SetPdfVersion(PdfVersion.PDF_2_0)
     with disposing(PdfADocument(PdfWriter(dest, writer_props), PdfAConformance.PDF_A_4, intent)) as pdf_doc:
-        # Setup the general requirements for a wtpdf document
-        with disposing(FileStream(XMP_PATH, FileMode.Open, FileAccess.Read)) as xmp_stream:
-            xmp_meta = XMPMetaFactory.Parse(xmp_stream)
-        pdf_doc.SetXmpMetadata(xmp_meta)
+        # Setup the general requirements for a wtpdf document. Metadata is
+        # filled in from the template, which was parsed only once.
+        XMP_TEMPLATE.apply(pdf_doc, title="Well tagged PDF document", language="en-US")
         pdf_doc.SetTagged()
         pdf_doc.GetCatalog().SetViewerPreferences(PdfViewerPreferences().SetDisplayDocTitle(True))
-        pdf_doc.GetCatalog().SetLang(PdfString("en-US"))
-        info = pdf_doc.GetDocumentInfo()
-        info.SetTitle("Well tagged PDF document")
 
         # Use custom font provider as we only want embedded fonts
         font_provider = BasicFontProvider(False, False, False)
@@ -13,7 +13,7 @@ from iText.Commons.Bouncycastle.Cert import IX509Certificate
 from iText.Commons.Bouncycastle.Cert.Ocsp import ICertID, IOcspRequest
 from iText.Commons.Bouncycastle.Crypto import IPrivateKey
 from iText.Kernel.Pdf import PdfEncryption
-from iText.Signatures import IOcspClient
+from iText.Signatures import IOcspClient, OcspClientBouncyCastle
 
 
 class TestOcspClient(IOcspClient):
@@ -23,20 +23,22 @@ class TestOcspClient(IOcspClient):
 
     _FACTORY = BouncyCastleFactoryCreator.GetFactory()
 
-    def __init__(self):
+    def __init__(self, use_nonce: bool = True):
         self.cert_dn_to_response_builder = {}
+        # Without nonces, every certificate gets the same pre-signed response
+        # each time, which is much faster for load tests
+        self.use_nonce = use_nonce
+        self._cert_ids = {}
 
     def GetEncoded(self, check_cert: IX509Certificate, issuer_cert: IX509Certificate, url: str) -> bytes | None:
-        cert_id = self._FACTORY.CreateCertificateID(
-            self._FACTORY.CreateCertificateID().GetHashSha1(),
-            issuer_cert,
-            check_cert.GetSerialNumber()
-        )
         check_dn = str(check_cert.GetSubjectDN())
         try:
             builder = self.cert_dn_to_response_builder[check_dn]
         except KeyError:
             return None
+        cert_id = self._get_cert_id(check_cert, issuer_cert)
+        if not self.use_nonce:
+            return builder.make_presigned_response(cert_id)
         return builder.make_ocsp_response(self._generate_ocsp_request_with_nonce(cert_id).GetEncoded())
 
     def init_builder_for_certificate(self, cert: IX509Certificate, private_key: IPrivateKey) -> Self:
@@ -47,6 +49,20 @@ class TestOcspClient(IOcspClient):
         self.cert_dn_to_response_builder[dn] = builder
         return self
 
+    def _get_cert_id(self, check_cert: IX509Certificate, issuer_cert: IX509Certificate) -> ICertID:
+        # Certificate IDs contain hashes of the issuer, so they are only
+        # computed once
+        key = (str(issuer_cert.GetSubjectDN()), str(check_cert.GetSerialNumber()))
+        cert_id = self._cert_ids.get(key)
+        if cert_id is None:
+            cert_id = self._FACTORY.CreateCertificateID(
+                self._FACTORY.CreateCertificateID().GetHashSha1(),
+                issuer_cert,
+                check_cert.GetSerialNumber()
+            )
+            self._cert_ids[key] = cert_id
+        return cert_id
+
     def _generate_ocsp_request_with_nonce(self, id: ICertID) -> IOcspRequest:
         gen = self._FACTORY.CreateOCSPReqBuilder()
         gen.AddRequest(id)
@@ -66,3 +82,18 @@ class TestOcspClient(IOcspClient):
 
         gen.SetRequestExtensions(self._FACTORY.CreateExtensions(extensions_dict))
         return gen.Build()
+
+
+class UrlOcspClient(IOcspClient):
+    # This is the namespace for this object in .NET
+    # Without this, it won't work with Python.NET
+    __namespace__ = "Sandbox.Signatures"
+
+    # Regular OCSP client, which always asks the same responder, instead of
+    # the one from the certificate. Useful with LocalOcspResponder.
+    def __init__(self, url: str):
+        self.url = url
+        self.client = OcspClientBouncyCastle()
+
+    def GetEncoded(self, check_cert: IX509Certificate, issuer_cert: IX509Certificate, url: str) -> bytes | None:
+        return self.client.GetEncoded(check_cert, issuer_cert, self.url)
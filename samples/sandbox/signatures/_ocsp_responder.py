@@ -0,0 +1,90 @@
+import itextpy
+itextpy.load()
+
+import base64
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Self
+from urllib.parse import unquote
+
+from itextpy.util import bytes_to_clr
+
+from _utils import TestOcspResponseBuilder
+
+
+class LocalOcspResponder:
+    # OCSP responder over HTTP on the local machine, which answers with
+    # responses from a TestOcspResponseBuilder. This way signing can be
+    # benchmarked with real OCSP requests, but without going online.
+    #
+    # Each request is handled in its own thread. Response building happens
+    # in .NET, so the threads actually run in parallel.
+    def __init__(self, builder: TestOcspResponseBuilder, host: str = "127.0.0.1", port: int = 0):
+        self.builder = builder
+        self.server = ThreadingHTTPServer((host, port), self._create_handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> Self:
+        if self._thread is None:
+            self._thread = Thread(target=self.server.serve_forever, name="ocsp-responder", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _create_handler_class(self) -> type[BaseHTTPRequestHandler]:
+        builder = self.builder
+
+        class OcspRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self._respond(self.rfile.read(length))
+
+            def do_GET(self):
+                # RFC 6960, A.1: base64 encoded request in the path
+                try:
+                    request = base64.b64decode(unquote(self.path.lstrip("/")), validate=True)
+                except ValueError:
+                    self._send(400, b"")
+                    return
+                self._respond(request)
+
+            def _respond(self, request: bytes):
+                try:
+                    response = builder.make_ocsp_http_response(bytes_to_clr(request))
+                except Exception:
+                    self._send(400, b"")
+                    return
+                self._send(200, response)
+
+            def _send(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/ocsp-response")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Load tests would flood the output otherwise
+                pass
+
+        return OcspRequestHandler
@@ -1,15 +1,17 @@
 import itextpy
 itextpy.load()
 
-from itextpy.util import clr_isinstance, clr_try_cast, disposing
+from itextpy.keystore import read_pem_chain, read_pem_key
+from itextpy.util import bytes_to_clr, clr_to_bytes
+
+from threading import Lock
 
 from System import DateTime, DateTimeKind
 from System.Collections.Generic import Dictionary
-from System.IO import File
 from iText.Commons.Bouncycastle.Asn1 import IDerObjectIdentifier
 from iText.Commons.Bouncycastle.Asn1.Ocsp import IBasicOcspResponse
 from iText.Commons.Bouncycastle.Asn1.X509 import IX509Extension
-from iText.Commons.Bouncycastle.Cert.Ocsp import ICertStatus, IReq
+from iText.Commons.Bouncycastle.Cert.Ocsp import ICertID, ICertStatus, IReq
 from iText.Bouncycastleconnector import BouncyCastleFactoryCreator
 from iText.Commons.Bouncycastle.Cert import IX509Certificate
 from iText.Commons.Bouncycastle.Crypto import IPrivateKey
@@ -18,27 +20,15 @@ _FACTORY = BouncyCastleFactoryCreator.GetFactory()
 
 
 class PemFileHelper:
+    # Files are parsed and keys are decrypted only once, parsed objects are
+    # cached until the file changes
     @staticmethod
     def read_first_chain(pem_file_path: str) -> list[IX509Certificate]:
-        with disposing(File.OpenText(pem_file_path)) as file:
-            parser = _FACTORY.CreatePEMParser(file, None)
-            obj = parser.ReadObject()
-            certificates = []
-            while obj is not None:
-                cert = clr_try_cast(obj, IX509Certificate)
-                if cert is not None:
-                    certificates.append(obj)
-                obj = parser.ReadObject()
-            return certificates
+        return list(read_pem_chain(pem_file_path))
 
     @staticmethod
     def read_first_key(pem_file_path: str, key_pass: str) -> IPrivateKey:
-        with disposing(File.OpenText(pem_file_path)) as file:
-            parser = _FACTORY.CreatePEMParser(file, key_pass)
-            obj = parser.ReadObject()
-            while (obj is not None) and (not clr_isinstance(obj, IPrivateKey)):
-                obj = parser.ReadObject()
-            return clr_try_cast(obj, IPrivateKey)
+        return read_pem_key(pem_file_path, key_pass)
 
     @staticmethod
     def init_store(pem_file_path: str) -> list[IX509Certificate]:
@@ -58,37 +48,108 @@ class TestOcspResponseBuilder:
         self.certificate_status = certificate_status
         if self.certificate_status is None:
             self.certificate_status = _FACTORY.CreateCertificateStatus().GetGood()
-        self.response_builder = _FACTORY.CreateBasicOCSPRespBuilder(
-            _FACTORY.CreateRespID(
-                self.issuer_cert.GetSubjectDN()
-            )
-        )
         self.this_update = self.TEST_DATE_TIME.AddDays(-1)
         self.next_update = self.TEST_DATE_TIME.AddDays(30)
+        # If set, nonces in requests are ignored, so that pre-signed responses
+        # can be returned for them as well, like lightweight responders do
+        self.ignore_nonce = False
+
+        # Everything, which doesn't depend on the request, is created once.
+        # Signers can be reused, so the key is not set up again for every
+        # response.
+        self._resp_id = _FACTORY.CreateRespID(self.issuer_cert.GetSubjectDN())
+        self._signer = _FACTORY.CreateContentSigner(self.SIGN_ALG, self.issuer_private_key)
+        self._chain = [self.issuer_cert]
+        self._nonce_oid = _FACTORY.CreateOCSPObjectIdentifiers().GetIdPkixOcspNonce()
+        self._no_extensions = _FACTORY.CreateExtensions()
+        self._presigned_lock = Lock()
+        # (hash algorithm, serial, status, this update, next update) -> response
+        self._presigned: dict[tuple, tuple[IBasicOcspResponse, bytes]] = {}
 
     def make_ocsp_response(self, request_bytes: bytes) -> bytes:
-        return self.make_ocsp_response_object(request_bytes).GetEncoded()
+        ocsp_request = _FACTORY.CreateOCSPReq(request_bytes)
+        presigned = self._get_presigned_for_request(ocsp_request)
+        if presigned is not None:
+            return bytes_to_clr(presigned[1])
+        return self._build(ocsp_request).GetEncoded()
 
     def make_ocsp_response_object(self, request_bytes: bytes) -> IBasicOcspResponse:
         ocsp_request = _FACTORY.CreateOCSPReq(request_bytes)
+        presigned = self._get_presigned_for_request(ocsp_request)
+        if presigned is not None:
+            return presigned[0]
+        return self._build(ocsp_request)
+
+    def make_ocsp_http_response(self, request_bytes: bytes) -> bytes:
+        """Return a complete OCSP response, as an HTTP responder would send it."""
+        basic_response = self.make_ocsp_response(request_bytes)
+        status = _FACTORY.CreateOCSPResponseStatus(_FACTORY.CreateOCSPResponseStatus().GetSuccessful())
+        response_bytes = _FACTORY.CreateResponseBytes(
+            _FACTORY.CreateOCSPObjectIdentifiers().GetIdPkixOcspBasic(),
+            _FACTORY.CreateDEROctetString(basic_response)
+        )
+        response = _FACTORY.CreateOCSPResponse(status, response_bytes)
+        return clr_to_bytes(response.ToASN1Primitive().GetEncoded())
+
+    def get_presigned_response(self, cert_id: ICertID) -> IBasicOcspResponse:
+        """Return a nonce-less response for the certificate, signed only once.
+
+        Responses are cached per certificate and per status and validity
+        window, which are current at the time of the call, so changing any
+        of them produces a new response.
+        """
+        return self._get_presigned(cert_id)[0]
+
+    def make_presigned_response(self, cert_id: ICertID) -> bytes:
+        # Same as above, but encoded, without parsing any request
+        return bytes_to_clr(self._get_presigned(cert_id)[1])
+
+    def _get_presigned_for_request(self, ocsp_request) -> tuple[IBasicOcspResponse, bytes] | None:
         request_list: list[IReq] = list(ocsp_request.GetRequestList())
+        if len(request_list) != 1:
+            return None
+        if not self.ignore_nonce and not _FACTORY.IsNullExtension(ocsp_request.GetExtension(self._nonce_oid)):
+            # Nonces must be echoed, so such responses are unique
+            return None
+        return self._get_presigned(request_list[0].GetCertID())
 
-        ext_nonce = ocsp_request.GetExtension(_FACTORY.CreateOCSPObjectIdentifiers().GetIdPkixOcspNonce())
+    def _get_presigned(self, cert_id: ICertID) -> tuple[IBasicOcspResponse, bytes]:
+        key = (
+            str(cert_id.GetHashAlgOID().GetId()),
+            str(cert_id.GetSerialNumber()),
+            self.certificate_status,
+            self.this_update.ToUniversalTime().Ticks,
+            self.next_update.ToUniversalTime().Ticks,
+        )
+        with self._presigned_lock:
+            entry = self._presigned.get(key)
+        if entry is None:
+            # Producing the same response twice in a race is harmless
+            response = self._build_for_cert_ids([cert_id], self._no_extensions)
+            entry = (response, clr_to_bytes(response.GetEncoded()))
+            with self._presigned_lock:
+                entry = self._presigned.setdefault(key, entry)
+        return entry
+
+    def _build(self, ocsp_request) -> IBasicOcspResponse:
+        response_extensions = None
+        ext_nonce = ocsp_request.GetExtension(self._nonce_oid)
         if not _FACTORY.IsNullExtension(ext_nonce):
-            # TODO ensure
             extensions_dict = Dictionary[IDerObjectIdentifier, IX509Extension]()
-            extensions_dict.Add(_FACTORY.CreateOCSPObjectIdentifiers().GetIdPkixOcspNonce(), ext_nonce)
+            extensions_dict.Add(self._nonce_oid, ext_nonce)
             response_extensions = _FACTORY.CreateExtensions(extensions_dict)
-            self.response_builder.SetResponseExtensions(response_extensions)
-
-        for req in request_list:
-            self.response_builder.AddResponse(
-                req.GetCertID(),
-                self.certificate_status,
-                self.this_update.ToUniversalTime(),
-                self.next_update.ToUniversalTime(),
-                _FACTORY.CreateExtensions()
-            )
-
-        signer = _FACTORY.CreateContentSigner(self.SIGN_ALG, self.issuer_private_key)
-        return self.response_builder.Build(signer, [self.issuer_cert], self.TEST_DATE_TIME)
+        cert_ids = [req.GetCertID() for req in ocsp_request.GetRequestList()]
+        return self._build_for_cert_ids(cert_ids, response_extensions)
+
+    def _build_for_cert_ids(self, cert_ids: list[ICertID], response_extensions) -> IBasicOcspResponse:
+        # A new builder per response, so that responses and extensions of
+        # earlier requests don't end up in this one
+        response_builder = _FACTORY.CreateBasicOCSPRespBuilder(self._resp_id)
+        if response_extensions is not None:
+            response_builder.SetResponseExtensions(response_extensions)
+        this_update = self.this_update.ToUniversalTime()
+        next_update = self.next_update.ToUniversalTime()
+        for cert_id in cert_ids:
+            response_builder.AddResponse(cert_id, self.certificate_status, this_update, next_update,
+                                         self._no_extensions)
+        return response_builder.Build(self._signer, self._chain, self.TEST_DATE_TIME)
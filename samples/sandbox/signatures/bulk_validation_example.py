@@ -0,0 +1,80 @@
+import itextpy
+itextpy.load()
+
+from itextpy.revocation import CachingOcspClient
+from itextpy.signing import BatchSigner
+from itextpy.validation import validate_documents
+
+from pathlib import Path
+
+from _utils import PemFileHelper, TestOcspResponseBuilder
+from _clients import TestOcspClient
+
+from System import Func
+from System.Collections.Generic import List
+from iText.Commons.Bouncycastle.Cert import IX509Certificate
+from iText.Commons.Utils import DateTimeUtil
+from iText.Kernel.Crypto import DigestAlgorithms
+from iText.Signatures import IOcspClient, IssuingCertificateRetriever, \
+    PrivateKeySignature, SignerProperties
+from iText.Signatures.Validation import SignatureValidationProperties, \
+    ValidatorChainBuilder
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+CERT_CHAIN_PATH = str(RESOURCES_DIR / "cert" / "chain.pem")
+ROOT_CERT_PATH = str(RESOURCES_DIR / "cert" / "root.pem")
+SIGN_CERT_PATH = str(RESOURCES_DIR / "cert" / "sign.pem")
+PASSWORD = "testpassphrase"
+DOCUMENT_COUNT = 16
+
+
+def get_ocsp_client(certificate_chain: list[IX509Certificate]) -> IOcspClient:
+    builder = TestOcspResponseBuilder(certificate_chain[1], PemFileHelper.read_first_key(ROOT_CERT_PATH, PASSWORD))
+    current_date = DateTimeUtil.GetCurrentUtcTime()
+    builder.this_update = DateTimeUtil.GetCalendar(current_date)
+    builder.next_update = DateTimeUtil.GetCalendar(current_date.AddDays(10))
+    # One caching client is shared by all the validation threads, so the
+    # response is only built once for the whole batch
+    return CachingOcspClient(TestOcspClient().add_builder_for_certificate(certificate_chain[0], builder))
+
+
+def sign_documents(src: str, certificate_chain: list[IX509Certificate]) -> list[bytes]:
+    signature = PrivateKeySignature(PemFileHelper.read_first_key(SIGN_CERT_PATH, PASSWORD), DigestAlgorithms.SHA256)
+    with BatchSigner(signature, certificate_chain,
+                     properties_factory=lambda: SignerProperties().SetFieldName("Signature1")) as signer:
+        return list(signer.sign_many((src, None) for _ in range(DOCUMENT_COUNT)))
+
+
+def manipulate_pdf(src, dest):
+    """Example of validating signatures of many documents in parallel."""
+    certificate_chain = PemFileHelper.read_first_chain(CERT_CHAIN_PATH)
+    signed_documents = sign_documents(src, certificate_chain)
+
+    ocsp_client = get_ocsp_client(certificate_chain)
+    trusted_certs = List[IX509Certificate]()
+    trusted_certs.Add(certificate_chain[1])
+
+    # Each worker thread gets its own validator chain builder, but they all
+    # share the same OCSP client and trusted certificates
+    def create_validator_chain_builder() -> ValidatorChainBuilder:
+        certificate_retriever = IssuingCertificateRetriever()
+        certificate_retriever.SetTrustedCertificates(trusted_certs)
+        properties = SignatureValidationProperties().AddOcspClient(ocsp_client)
+        return (ValidatorChainBuilder()
+                .WithIssuingCertificateRetrieverFactory(
+                    Func[IssuingCertificateRetriever](lambda: certificate_retriever))
+                .WithSignatureValidationProperties(properties))
+
+    # Write a JSON report per document, one per line, as they are ready
+    with open(dest, 'wt', encoding='utf-8') as out:
+        for result in validate_documents(signed_documents, create_validator_chain_builder):
+            out.write(result.to_json())
+            out.write('\n')
+
+
+if __name__ == "__main__":
+    manipulate_pdf(
+        str(RESOURCES_DIR / "pdfs" / "hello.pdf"),
+        str(SCRIPT_DIR / "bulk_validation_example.jsonl"),
+    )
@@ -0,0 +1,38 @@
+import itextpy
+itextpy.load()
+
+from itextpy.signing import DeferredSigner
+
+from pathlib import Path
+
+from iText.Signatures import SignerProperties
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+SRC_PATH = str(RESOURCES_DIR / "pdfs" / "signExample.pdf")
+CRT_PATH = str(RESOURCES_DIR / "cert" / "signCertRsa01.p12")
+DOCUMENT_COUNT = 3
+
+
+def create_signer_properties() -> SignerProperties:
+    return SignerProperties().SetFieldName("signature")
+
+
+def manipulate_pdf(dest_dir: Path) -> None:
+    # Here the PKCS#12 key stands in for an HSM. With a real HSM you would
+    # implement a batch signature object, which sends all the messages to it
+    # at once, and pass it to the DeferredSigner constructor instead.
+    with DeferredSigner.from_pkcs12(CRT_PATH, "testpass",
+                                    properties_factory=create_signer_properties) as signer:
+        # Phase one: documents get empty signature containers, and their
+        # digests are collected. Prepared documents are kept in memory here.
+        prepared = signer.prepare_many((SRC_PATH, None) for _ in range(DOCUMENT_COUNT))
+
+        # Phase two: all the digests are signed in a single batch, and the
+        # resulting signatures are injected into the prepared documents.
+        dests = [dest_dir / f"deferred_signing_example_{i + 1}.pdf" for i in range(DOCUMENT_COUNT)]
+        signer.finish(prepared, dests)
+
+
+if __name__ == "__main__":
+    manipulate_pdf(SCRIPT_DIR)
@@ -0,0 +1,60 @@
+import itextpy
+itextpy.load()
+
+from itextpy.signing import BatchSigner
+
+from pathlib import Path
+import time
+
+from _utils import PemFileHelper, TestOcspResponseBuilder
+from _clients import UrlOcspClient
+from _ocsp_responder import LocalOcspResponder
+
+from iText.Commons.Utils import DateTimeUtil
+from iText.Kernel.Crypto import DigestAlgorithms
+from iText.Signatures import PrivateKeySignature, SignerProperties
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+CERT_CHAIN_PATH = str(RESOURCES_DIR / "cert" / "chain.pem")
+ROOT_CERT_PATH = str(RESOURCES_DIR / "cert" / "root.pem")
+SIGN_CERT_PATH = str(RESOURCES_DIR / "cert" / "sign.pem")
+PASSWORD = "testpassphrase"
+DOCUMENT_COUNT = 64
+
+
+def create_ocsp_response_builder(certificate_chain) -> TestOcspResponseBuilder:
+    builder = TestOcspResponseBuilder(certificate_chain[1], PemFileHelper.read_first_key(ROOT_CERT_PATH, PASSWORD))
+    current_date = DateTimeUtil.GetCurrentUtcTime()
+    builder.this_update = DateTimeUtil.GetCalendar(current_date)
+    builder.next_update = DateTimeUtil.GetCalendar(current_date.AddDays(10))
+    # Answer every request with the same pre-signed response, like a
+    # lightweight responder behind a CDN would, so the responder is never
+    # the bottleneck of the benchmark
+    builder.ignore_nonce = True
+    return builder
+
+
+def manipulate_pdf(src, dest_dir: Path):
+    """Example of benchmarking signing with OCSP, but without going online."""
+    certificate_chain = PemFileHelper.read_first_chain(CERT_CHAIN_PATH)
+    signature = PrivateKeySignature(PemFileHelper.read_first_key(SIGN_CERT_PATH, PASSWORD), DigestAlgorithms.SHA256)
+
+    with LocalOcspResponder(create_ocsp_response_builder(certificate_chain)) as responder:
+        # Every signature makes a real OCSP request over HTTP to the local
+        # responder, instead of the one from the certificate
+        with BatchSigner(signature, certificate_chain, ocsp_client=UrlOcspClient(responder.url),
+                         properties_factory=lambda: SignerProperties().SetFieldName("Signature1")) as signer:
+            start = time.perf_counter()
+            for _ in signer.sign_many((src, None) for _ in range(DOCUMENT_COUNT)):
+                pass
+            elapsed = time.perf_counter() - start
+            # Keep one of the signed documents to check the embedded response
+            signer.sign(src, dest_dir / "local_ocsp_responder_example.pdf")
+
+    print(f"Signed {DOCUMENT_COUNT} documents in {elapsed:.2f}s "
+          f"({DOCUMENT_COUNT / elapsed:.1f} documents per second)")
+
+
+if __name__ == "__main__":
+    manipulate_pdf(str(RESOURCES_DIR / "pdfs" / "hello.pdf"), SCRIPT_DIR)
@@ -1,23 +1,23 @@
 import itextpy
 itextpy.load()
 
+from itextpy.io import render_to_bytes
+from itextpy.revocation import CachingOcspClient
 from itextpy.util import disposing
+from itextpy.validation import CachingCertificateChainValidator
 
 from pathlib import Path
 
 from _utils import PemFileHelper, TestOcspResponseBuilder
 from _clients import TestOcspClient
 
-from System import Func
-from System.Collections.Generic import List
-from System.IO import MemoryStream
+from System.IO import Stream
 from iText.Commons.Bouncycastle.Cert import IX509Certificate
 from iText.Commons.Utils import DateTimeUtil
 from iText.Forms.Form.Element import SignatureFieldAppearance
 from iText.Kernel.Geom import Rectangle
 from iText.Kernel.Pdf import PdfReader
-from iText.Signatures import IOcspClient, IssuingCertificateRetriever, \
-    PdfPadesSigner, SignerProperties
+from iText.Signatures import IOcspClient, PdfPadesSigner, SignerProperties
 from iText.Signatures.Validation import SignatureValidationProperties, \
     ValidatorChainBuilder
 from iText.Signatures.Validation.Context import CertificateSource, \
@@ -38,7 +38,9 @@ def get_ocsp_client(certificate_chain: list[IX509Certificate]) -> IOcspClient:
     current_date = DateTimeUtil.GetCurrentUtcTime()
     builder.this_update = DateTimeUtil.GetCalendar(current_date)
     builder.next_update = DateTimeUtil.GetCalendar(current_date.AddDays(10))
-    return TestOcspClient().add_builder_for_certificate(certificate_chain[0], builder)
+    # Responses are reused until their next update, instead of building and
+    # signing a new one for every validation
+    return CachingOcspClient(TestOcspClient().add_builder_for_certificate(certificate_chain[0], builder))
 
 
 def create_signer_properties() -> SignerProperties:
@@ -53,15 +55,18 @@ def create_signer_properties() -> SignerProperties:
             .SetLocation("Location"))
 
 
-def sign_document(src: str, certificate_chain: list[IX509Certificate]) -> None:
-    with (disposing(PdfReader(src)) as pdf_reader,
-          disposing(MemoryStream()) as out_stream):
-        pades_signer = PdfPadesSigner(pdf_reader, out_stream)
-        pades_signer.SignWithBaselineBProfile(
-            create_signer_properties(),
-            certificate_chain,
-            PemFileHelper.read_first_key(SIGN_CERT_PATH, PASSWORD)
-        )
+def sign_document(src: str, certificate_chain: list[IX509Certificate]) -> bytes:
+    def sign(out_stream: Stream) -> None:
+        with disposing(PdfReader(src)) as pdf_reader:
+            pades_signer = PdfPadesSigner(pdf_reader, out_stream)
+            pades_signer.SignWithBaselineBProfile(
+                create_signer_properties(),
+                certificate_chain,
+                PemFileHelper.read_first_key(SIGN_CERT_PATH, PASSWORD)
+            )
+
+    # Signed document is written directly into a Python buffer
+    return render_to_bytes(sign)
 
 
 def manipulate_pdf(src, dest):
@@ -70,24 +75,18 @@ def manipulate_pdf(src, dest):
     signing_cert = certificate_chain[0]
     root_cert = certificate_chain[1]
 
-    # Set up the validator.
+    # Set up the validator. It is built only once, and its results are
+    # cached, so it could be reused for signing any number of documents.
     properties = SignatureValidationProperties().AddOcspClient(get_ocsp_client(certificate_chain))
-    trusted_certs = List[IX509Certificate]()
-    trusted_certs.Add(root_cert)
-    certificate_retriever = IssuingCertificateRetriever()
-    certificate_retriever.SetTrustedCertificates(trusted_certs)
-    certificate_retriever_factory = Func[IssuingCertificateRetriever](lambda: certificate_retriever)
-    validator_chain_builder = (ValidatorChainBuilder()
-                               .WithIssuingCertificateRetrieverFactory(certificate_retriever_factory)
-                               .WithSignatureValidationProperties(properties))
-    validator = validator_chain_builder.BuildCertificateChainValidator()
+    validator_chain_builder = ValidatorChainBuilder().WithSignatureValidationProperties(properties)
+    validator = CachingCertificateChainValidator(validator_chain_builder, [root_cert])
     base_context = ValidationContext(
         ValidatorContext.CERTIFICATE_CHAIN_VALIDATOR,
         CertificateSource.SIGNER_CERT,
         TimeBasedContext.PRESENT
     )
     # Validate the chain. ValidationReport will contain all the validation report messages.
-    report = validator.ValidateCertificate(base_context, signing_cert, DateTimeUtil.GetCurrentTime())
+    report = validator.validate(signing_cert, DateTimeUtil.GetCurrentTime(), base_context)
     if ValidationReport.ValidationResult.VALID == report.GetValidationResult():
         sign_document(src, certificate_chain)
 
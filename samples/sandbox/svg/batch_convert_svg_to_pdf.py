@@ -0,0 +1,46 @@
+import itextpy
+itextpy.load()
+
+from itextpy.svg import collect_report, convert_svgs, convert_svgs_to_pdf
+
+from pathlib import Path
+
+from iText.StyledXmlParser.Resolver.Font import BasicFontProvider
+from iText.Svg.Processors.Impl import SvgConverterProperties
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+SVG_RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources" / "svg"
+
+# Fonts are looked up and registered only once, every worker thread then
+# gets its own provider over the same set of fonts
+_FONT_PROVIDER = BasicFontProvider()
+FONT_SET = _FONT_PROVIDER.GetFontSet()
+DEFAULT_FONT_FAMILY = _FONT_PROVIDER.GetDefaultFontFamily()
+
+
+def create_converter_properties() -> SvgConverterProperties:
+    return SvgConverterProperties().SetFontProvider(BasicFontProvider(FONT_SET, DEFAULT_FONT_FAMILY))
+
+
+def print_report(name, results):
+    report = collect_report(results)
+    print(f"{name}: {report.converted} converted, {len(report.failures)} failed "
+          f"in {report.elapsed:.2f}s ({report.throughput:.1f} files per second)")
+    for failure in report.failures:
+        print(f"  {failure.source}: {failure.error}")
+
+
+def manipulate_pdf(svg_dir, dest_dir: Path, combined_dest):
+    dest_dir.mkdir(exist_ok=True)
+    # Every SVG from the directory gets its own PDF file
+    print_report("Separate files", convert_svgs(svg_dir, dest_dir, create_converter_properties))
+    # All the SVGs end up as pages of a single PDF file
+    print_report("Single file", convert_svgs_to_pdf(svg_dir, combined_dest, create_converter_properties))
+
+
+if __name__ == "__main__":
+    manipulate_pdf(
+        svg_dir=str(SVG_RESOURCES_DIR),
+        dest_dir=SCRIPT_DIR / "batch_convert_svg_to_pdf",
+        combined_dest=str(SCRIPT_DIR / "batch_convert_svg_to_pdf.pdf"),
+    )
@@ -0,0 +1,52 @@
+import itextpy
+itextpy.load()
+
+from itextpy.svg import SvgTemplateCache
+from itextpy.util import disposing
+
+from pathlib import Path
+
+from iText.Kernel.Geom import Rectangle
+from iText.Kernel.Pdf import PdfDocument, PdfReader, PdfWriter
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+RESOURCES_DIR = SCRIPT_DIR / ".." / ".." / "resources"
+SVG_RESOURCES_DIR = RESOURCES_DIR / "svg"
+LOGO_SIZE = 48
+MARGIN = 12
+
+
+def stamp_pdf(templates: SvgTemplateCache, svg_source, src, dest):
+    with disposing(PdfDocument(PdfReader(src), PdfWriter(dest))) as pdf_doc:
+        # All the pages of the document refer to the same XObject, which is
+        # created from the processed template on the first use
+        svgs = templates.for_document(pdf_doc)
+        logo = templates.get(svg_source)
+        for i in range(1, pdf_doc.GetNumberOfPages() + 1):
+            page = pdf_doc.GetPage(i)
+            page_size = page.GetPageSize()
+            svgs.draw_in_rectangle(logo, page, Rectangle(
+                page_size.GetRight() - LOGO_SIZE - MARGIN,
+                page_size.GetTop() - LOGO_SIZE - MARGIN,
+                LOGO_SIZE,
+                LOGO_SIZE
+            ))
+
+
+def manipulate_pdf(svg_source, sources, dest_dir: Path):
+    # The SVG is parsed and processed only once for all the documents
+    templates = SvgTemplateCache()
+    for src in sources:
+        stamp_pdf(templates, svg_source, src, str(dest_dir / f"stamp_svg_template_{Path(src).stem}.pdf"))
+
+
+if __name__ == "__main__":
+    manipulate_pdf(
+        svg_source=str(SVG_RESOURCES_DIR / "cauldron.svg"),
+        sources=[
+            str(RESOURCES_DIR / "pdfs" / "hello.pdf"),
+            str(RESOURCES_DIR / "pdfs" / "pages.pdf"),
+            str(RESOURCES_DIR / "pdfs" / "primes.pdf"),
+        ],
+        dest_dir=SCRIPT_DIR,
+    )